@@ -0,0 +1,85 @@
+"""
+Benchmark the columnar board geometry against the per-item object model.
+
+Run from the repository root (requires numpy):
+    python -m benchmarks.bench_board_geometry
+"""
+import random
+import time
+
+from src.backend.models.miro_board import MiroBoard
+
+SIZES = [1_000, 10_000, 100_000]
+ITEMS_PER_FRAME = 100
+
+
+def make_raw_items(count: int, seed: int = 42) -> list[dict]:
+    """A synthetic board: root frames laid out in a row, each holding ITEMS_PER_FRAME stickies."""
+    rng = random.Random(seed)
+    raw_items = []
+    frame_id = None
+    for i in range(count):
+        if i % ITEMS_PER_FRAME == 0:
+            frame_id = f"frame{i}"
+            raw_items.append({
+                'id': frame_id,
+                'type': 'frame',
+                'position': {'x': i * 20.0, 'y': 1000.0, 'relativeTo': 'canvas_center'},
+                'geometry': {'width': 1000, 'height': 2000},
+            })
+        else:
+            raw_items.append({
+                'id': f"sticky{i}",
+                'type': 'sticky_note',
+                'parent': {'id': frame_id},
+                'position': {'x': rng.uniform(0, 1000), 'y': rng.uniform(0, 2000), 'relativeTo': 'parent_top_left'},
+                'geometry': {'width': 200, 'height': 230},
+            })
+    return raw_items
+
+
+def object_frame_bounds(board: MiroBoard) -> dict:
+    """Reference implementation: walk the parent chain of every item one object at a time."""
+    def absolute(item):
+        x, y = item.position.x, item.position.y
+        while item.parent_id:
+            parent = board.get(item.parent_id)
+            if not parent:
+                break
+            x += parent.position.x - parent.geometry.width / 2
+            y += parent.position.y - parent.geometry.height / 2
+            item = parent
+        return x, y
+
+    bounds = {}
+    for item in board.items.values():
+        if not item.parent_id:
+            continue
+        x, y = absolute(item)
+        half_w, half_h = item.geometry.width / 2, item.geometry.height / 2
+        left, top, right, bottom = bounds.get(item.parent_id, (float('inf'), float('inf'), float('-inf'), float('-inf')))
+        bounds[item.parent_id] = (min(left, x - half_w), min(top, y - half_h),
+                                  max(right, x + half_w), max(bottom, y + half_h))
+    return bounds
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main():
+    print(f"{'items':>8} {'objects ms':>12} {'build ms':>10} {'columnar ms':>12} {'speedup':>8}")
+    for size in SIZES:
+        board = MiroBoard.create(make_raw_items(size))
+        expected, object_ms = timed(lambda: object_frame_bounds(board))
+        geometry, build_ms = timed(board.to_geometry)
+        actual, columnar_ms = timed(geometry.frame_bounds)
+
+        assert expected.keys() == actual.keys()
+        print(f"{size:>8} {object_ms:>12.1f} {build_ms:>10.1f} {columnar_ms:>12.1f} {object_ms / columnar_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Measure how much memory the per-board interner saves when parsing a large board.
+
+Run from the repository root:
+    python -m benchmarks.bench_board_memory
+"""
+import gc
+import json
+import tracemalloc
+
+from src.backend.models.item_interner import ItemInterner
+from src.backend.models.miro_board import MiroBoard
+from src.backend.models.miro_item import MiroItem
+
+ITEM_COUNT = 50_000
+ITEMS_PER_FRAME = 100
+BOARD_URL = "https://api.miro.com/v2/boards/uXjVJ6rCeVk="
+USERS = ["3458764512345678901", "3458764512345678902", "3458764512345678903"]
+
+
+def make_raw_items(count: int) -> list[dict]:
+    """
+    A synthetic board shaped like a Miro items response. It is round-tripped through JSON
+    so that, like a real response, every repeated string is its own object.
+    """
+    raw_items = []
+    frame_id = None
+    for i in range(count):
+        item_id = str(3458764600000000000 + i)
+        actor = {"id": USERS[i % len(USERS)], "type": "user"}
+        item = {
+            "id": item_id,
+            "type": "sticky_note",
+            "data": {"content": f"<p>Note {i}</p>", "shape": "square"},
+            "style": {"fillColor": "light_yellow", "textAlign": "center", "textAlignVertical": "top"},
+            "geometry": {"width": 199.0, "height": 228.0},
+            "position": {"x": float(i % 1000), "y": float(i % 2000), "origin": "center",
+                         "relativeTo": "parent_top_left"},
+            "links": {"self": f"{BOARD_URL}/sticky_notes/{item_id}"},
+            "createdAt": "2025-01-01T00:00:00Z",
+            "createdBy": actor,
+            "modifiedAt": "2025-01-02T00:00:00Z",
+            "modifiedBy": actor,
+        }
+        if i % ITEMS_PER_FRAME == 0:
+            frame_id = item_id
+            item["type"] = "frame"
+            item["data"] = {"title": f"Frame {i}", "format": "custom", "type": "freeform"}
+            item["links"] = {"self": f"{BOARD_URL}/frames/{item_id}"}
+        else:
+            item["parent"] = {"id": frame_id, "links": {"self": f"{BOARD_URL}/frames/{frame_id}"}}
+        raw_items.append(item)
+
+    return json.loads(json.dumps(raw_items))
+
+
+def measure(build) -> int:
+    """Bytes still allocated by the parsed items once the raw response is gone."""
+    raw_items = make_raw_items(ITEM_COUNT)
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build(raw_items)
+    # Drop the raw response so only memory held by the parsed items is counted
+    raw_items.clear()
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return after - before
+
+
+def parse_without_interning(raw_items: list[dict]) -> dict:
+    board = MiroBoard()
+    return {item["id"]: MiroItem(item, board) for item in raw_items}
+
+
+def parse_with_interning(raw_items: list[dict]) -> dict:
+    board = MiroBoard()
+    interner = ItemInterner()
+    return {item["id"]: MiroItem(item, board, interner) for item in raw_items}
+
+
+def main():
+    baseline = measure(parse_without_interning)
+    interned = measure(parse_with_interning)
+    print(f"{ITEM_COUNT} items")
+    print(f"  without interning: {baseline / 1024 / 1024:8.1f} MiB")
+    print(f"  with interning:    {interned / 1024 / 1024:8.1f} MiB")
+    print(f"  saved:             {(baseline - interned) / 1024 / 1024:8.1f} MiB "
+          f"({(baseline - interned) / baseline:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,38 +1,44 @@
+import asyncio
 import json
-import os
-from pathlib import Path
-from dotenv import load_dotenv
-from langchain_openai import ChatOpenAI
+from concurrent.futures import ThreadPoolExecutor
+
 from langchain_core.messages import SystemMessage, HumanMessage
 
 from src.backend.agents.agent_node import AgentNode
+from src.backend.agents.fast_path_classifier import FastPathClassifier
+from src.backend.agents.llm_cache import LlmCache
+from src.backend.agents.model_router import ModelRouter
+from src.backend.agents.prompt_encoder import PromptEncoder, PromptSection
 from src.backend.agents.agent_state import AgentState
+from src.backend.agents.prompt_registry import PromptRegistry
+from src.backend.async_miro_api import AsyncMiroApiClient
 from src.backend.models.miro_board import MiroBoard
+from src.backend.models.miro_item import MiroItem
+from src.backend.utils.deadline import submit_in_context
+from src.backend.utils.text_normalizer import count_tokens
 from src.backend.enums.next_action import NextAction
 from dataclasses import replace
 
 
-def _load_prompt_template(filename: str) -> str:
-    """Load a prompt template from the prompts directory."""
-    prompts_dir = Path(__file__).parent / "prompts"
-    prompt_file = prompts_dir / filename
-    with open(prompt_file, 'r', encoding='utf-8') as f:
-        return f.read()
-
-
-
 class ActionChooser(AgentNode):
     def __init__(self):
         super().__init__(NextAction.CHOOSE_NEXT_ACTION.name)
+        self.prompts = PromptRegistry()
+        self.cache = LlmCache()
+        self.fast_path = FastPathClassifier()
+        self.router = ModelRouter()
+        self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="action-chooser")
 
     def choose_next_action(self, state: AgentState):
         """
-        This is an agent node that chooses the next action to take.
+        This is an agent node that chooses the next actions to take, one per answered chat frame.
         To do that, it:
         1. Checks to see if the board has changed.
            If not, it returns NO_ACTION
            elif the board is empty, it returns ADD_INITIAL_CHAT_FRAME
-           elif asks the llm to compare the current and new board and determine the next action
+           else classifies every chat frame with a reply, concurrently: a plain yes/no to the
+           frame's fixed question is mapped with the fast-path rules, anything else goes to the llm
+        Only the replies that were classified are cleared, so a failed one is retried next cycle.
         :param state:
         :return:
         """
@@ -41,58 +47,156 @@ class ActionChooser(AgentNode):
 
         # Nothing on the board yet
         if new.is_empty():
-            next_action = NextAction.ADD_INITIAL_CHAT_FRAME
-            return {"current_board": replace(new),
-                    "next_action": next_action}
+            return self._result(new, [NextAction.ADD_INITIAL_CHAT_FRAME])
 
         # Board has not changed
         elif current == new:
-            return {"current_board": replace(new),
-                    "next_action": NextAction.NO_ACTION}
-
-        # Need to do LLM analysis here
-        else:
-            next_action = self.ask_llm_for_next_action(current, new)
-            new.clear_user_responses()
-            return {"current_board": replace(new),
-                    "next_action": next_action}
-
+            return self._result(new, [])
+
+        answered = new.get_answered_chat_frames()
+        if not answered:
+            # No reply waiting; only chat frames that changed since the last board are worth a look
+            changed = new.get_changed_chat_frames(current)
+            if not changed:
+                return self._result(new, [])
+            return self._result(new, [self.ask_llm_for_next_action(new, changed)])
+
+        futures = [submit_in_context(self._executor, self._classify_chat, new, chat) for chat in answered]
+        outcomes = []
+        for future in futures:
+            try:
+                outcomes.append(future.result())
+            except Exception as e:  # noqa: BLE001 - the reply stays on the board for the next cycle
+                outcomes.append(e)
+
+        actions, handled = self._collect(answered, outcomes)
+        new.clear_user_responses(handled)
+        return self._result(new, actions)
+
+    async def achoose_next_action(self, state: AgentState, api: AsyncMiroApiClient):
+        """Async version of choose_next_action, clearing the handled replies through api."""
+        current = state.get("current_board")
+        new: MiroBoard = state.get("new_board")
 
-    def ask_llm_for_next_action(self, current: MiroBoard, new: MiroBoard) -> NextAction:
+        if new.is_empty():
+            return self._result(new, [NextAction.ADD_INITIAL_CHAT_FRAME])
+        elif current == new:
+            return self._result(new, [])
+
+        answered = new.get_answered_chat_frames()
+        if not answered:
+            changed = new.get_changed_chat_frames(current)
+            if not changed:
+                return self._result(new, [])
+            return self._result(new, [await self.aask_llm_for_next_action(new, changed)])
+
+        outcomes = await asyncio.gather(*(self._aclassify_chat(new, chat) for chat in answered),
+                                        return_exceptions=True)
+        actions, handled = self._collect(answered, outcomes)
+        await new.aclear_user_responses(api, handled)
+        return self._result(new, actions)
+
+    @staticmethod
+    def _collect(answered: list[MiroItem], outcomes: list) -> tuple[list[NextAction], list[MiroItem]]:
+        """Distinct actions to run, and the chats whose replies were classified (outcomes may hold errors)."""
+        actions, handled = [], []
+        for chat, outcome in zip(answered, outcomes):
+            if isinstance(outcome, Exception):
+                print(f"[action_chooser] Could not classify chat {chat.id}: {outcome}")
+                continue
+            handled.append(chat)
+            if outcome != NextAction.NO_ACTION and outcome not in actions:
+                actions.append(outcome)
+        return actions, handled
+
+    @staticmethod
+    def _result(board: MiroBoard, actions: list[NextAction]) -> dict:
+        actions = [action for action in actions if action != NextAction.NO_ACTION]
+        return {"current_board": replace(board),
+                "next_actions": actions,
+                "next_action": actions[0] if actions else NextAction.NO_ACTION}
+
+    def _classify_chat(self, board: MiroBoard, chat: MiroItem) -> NextAction:
+        """Try the rules first and only do LLM analysis when they are not confident."""
+        next_action = self.fast_path.classify_chat(board, chat)
+        if next_action is not None:
+            print(f"[action_chooser] Fast-path decision {next_action.name} ({self.fast_path.stats_to_str()})")
+            return next_action
+        return self.ask_llm_for_next_action(board, [chat])
+
+    async def _aclassify_chat(self, board: MiroBoard, chat: MiroItem) -> NextAction:
+        next_action = self.fast_path.classify_chat(board, chat)
+        if next_action is not None:
+            print(f"[action_chooser] Fast-path decision {next_action.name} ({self.fast_path.stats_to_str()})")
+            return next_action
+        return await self.aask_llm_for_next_action(board, [chat])
+
+    def ask_llm_for_next_action(self, board: MiroBoard, chats: list[MiroItem]) -> NextAction:
         """
-        Uses GPT-4 to analyze the current and new board states and determine the next action.
-        Currently checks if the user answered affirmatively to "Would you like me to set up your marketing board?"
+        Uses this node's routed LLM to determine the next action from the given chat frames.
+        Only those chats are sent, with the board's frame tags for context, so the prompt
+        does not grow with the number of chat frames on the board.
 
         Args:
-            current: The previous board state
-            new: The new board state
+            board: The new board state
+            chats: The chat frames that changed or hold a reply
 
         Returns:
             NextAction enum indicating what action should be taken
-            :type current: object
         """
-        load_dotenv()
-
-        # Initialize the LLM
-        model_name = os.getenv("OPENAI_MODEL", "gpt-5")
-        llm = ChatOpenAI(model=model_name, temperature=0)
-
-        board_json = new.to_json_for_llm()
-
-        # Load prompts from files
-        system_prompt_text = _load_prompt_template("choose_next_action_system.txt")
-        user_prompt_template = _load_prompt_template("choose_next_action_user.txt")
-
-        # Format the user prompt with board states
-        user_prompt_text = user_prompt_template.format(board_state=board_json)
-
-        # Create the messages
-        system_prompt = SystemMessage(content=system_prompt_text)
-        human_prompt = HumanMessage(content=user_prompt_text)
-
-        # Get LLM response
-        response = llm.invoke([system_prompt, human_prompt])
+        user_prompt_text = self._user_prompt(board, chats)
+        cache_key = self._cache_key(user_prompt_text)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            print(f"[action_chooser] Cached decision {cached} ({self.cache.stats_to_str()})")
+            return NextAction[cached]
+
+        # Get LLM response through this node's model
+        model, response = self.router.invoke(self.name, self._messages(user_prompt_text), return_model=True)
+        return self._decision(cache_key, model, response)
+
+    async def aask_llm_for_next_action(self, board: MiroBoard, chats: list[MiroItem]) -> NextAction:
+        """Async version of ask_llm_for_next_action."""
+        user_prompt_text = self._user_prompt(board, chats)
+        cache_key = self._cache_key(user_prompt_text)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            print(f"[action_chooser] Cached decision {cached} ({self.cache.stats_to_str()})")
+            return NextAction[cached]
+
+        model, response = await self.router.ainvoke(self.name, self._messages(user_prompt_text), return_model=True)
+        return self._decision(cache_key, model, response)
+
+    def _user_prompt(self, board: MiroBoard, chats: list[MiroItem]) -> str:
+        encoded = PromptEncoder.for_node(self.name).encode([PromptSection("chats", board.get_chat_entries(chats))])
+        user_prompt_text = self.prompts.render("choose_next_action_user",
+                                               board_tags=", ".join(board.get_frame_tags()),
+                                               board_state=encoded["chats"])
+
+        # Before: the cached token counts of every chat on the board, which used to be sent in full
+        all_chat_tokens = sum(child.get_token_count() for chat in board.get_chat_frames()
+                              for child in chat.get_children() if child)
+        print(f"[action_chooser] Prompt tokens: {all_chat_tokens} in every chat frame, "
+              f"{count_tokens(user_prompt_text)} sent for {len(chats)} chat frame(s)")
+        return user_prompt_text
+
+    def _cache_key(self, user_prompt_text: str) -> str:
+        # Identical chat states get the same answer, so reuse earlier decisions
+        model_name = self.router.config_for(self.name).model
+        return self.cache.make_key(model_name, self.prompts.get("choose_next_action_system").version,
+                                   user_prompt_text)
+
+    def _messages(self, user_prompt_text: str) -> list:
+        # Render the preloaded system prompt
+        system_prompt_text = self.prompts.render("choose_next_action_system")
+        return [SystemMessage(content=system_prompt_text), HumanMessage(content=user_prompt_text)]
+
+    def _decision(self, cache_key: str, model: str, response) -> NextAction:
         response_text = response.content.strip().upper()
 
         next_action = NextAction[response_text]
+        # The key names the primary model, so a fallback model's answer must not be stored under it
+        if model == self.router.config_for(self.name).model:
+            self.cache.put(cache_key, next_action.name)
+        print(f"[action_chooser] LLM decision {next_action.name} from {model} ({self.cache.stats_to_str()})")
         return next_action
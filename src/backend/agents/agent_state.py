@@ -1,18 +1,29 @@
+import operator
 from dataclasses import dataclass
-from typing import TypedDict
+from typing import Annotated, TypedDict
 
 from src.backend.models.miro_board import MiroBoard
+from src.backend.models.plan.channel import Channel
+from src.backend.models.plan.plan import Plan
+from src.backend.models.plan.segment import Segment
 from src.backend.enums.next_action import NextAction
 
 
 @dataclass
 class AgentState(TypedDict, total=False):
     next_action: NextAction
+    # Every action chosen this cycle, one per answered chat frame; next_action is the first
+    next_actions: list[NextAction]
     current_board: MiroBoard
     new_board: MiroBoard
+    # Written by parallel branches, so their updates are concatenated rather than overwritten
+    segments: Annotated[list[Segment], operator.add]
+    channels: Annotated[list[Channel], operator.add]
+    plan: Plan
 
     def __init__(self):
         self.next_action = NextAction.NO_ACTION
+        self.next_actions = []
         self.current_board = None
         self.new_board = None
 
@@ -0,0 +1,78 @@
+from langchain_core.messages import SystemMessage, HumanMessage
+
+from src.backend.agents.agent_node import AgentNode
+from src.backend.agents.agent_state import AgentState
+from src.backend.agents.model_router import ModelRouter
+from src.backend.agents.prompt_encoder import PromptEncoder, PromptSection
+from src.backend.agents.prompt_registry import PromptRegistry
+from src.backend.async_miro_api import AsyncMiroApiClient
+from src.backend.enums.next_action import NextAction
+from src.backend.models.miro_board import MiroBoard
+from src.backend.models.plan.channel_list import ChannelList
+from src.backend.models.plan.segment import Segment
+
+
+class ChannelPredictor(AgentNode):
+    def __init__(self):
+        super().__init__(NextAction.PREDICT_CHANNELS.name)
+        self.prompts = PromptRegistry()
+        self.router = ModelRouter()
+
+    @staticmethod
+    def _format_channel(channel_name: str, channel_description: str) -> str:
+        return f"<p><strong>{channel_name}</strong></p><p>{channel_description}</p>"
+
+    def _messages(self, board: MiroBoard, new_segments: list[Segment]) -> list:
+        """
+        The board snapshot predates this cycle, so segments predicted earlier in the same run
+        (see PlanBuilderAgent.route_after_segments) come from the state instead.
+        """
+        segment_frame = board.get_segment_frame()
+        segments = segment_frame.get_sticky_note_texts() if segment_frame else []
+        segments += [f"{segment.name}\n{segment.description}" for segment in new_segments]
+        dump = PromptEncoder.for_node(self.name).encode([
+            PromptSection("product", board.get_product_frame().get_sticky_note_texts(), priority=0),
+            PromptSection("segments", segments, priority=1),
+        ])
+        system_message = SystemMessage(content=self.prompts.render("channel_predictor_system"))
+        user_message = HumanMessage(content=self.prompts.render(
+            "channel_predictor_user",
+            product_info=dump["product"],
+            segments=dump["segments"]
+        ))
+        return [system_message, user_message]
+
+    def predict_channels(self, state: AgentState):
+        """
+        Suggest channels from the product and the segments on the board, with one structured
+        call, and add them to the Channels frame in one pass.
+        """
+        board: MiroBoard = state.get("new_board")
+        channels_frame = board.get_channels_frame()
+        if not channels_frame:
+            print("[channel_predictor] Warning: Channels frame not found")
+            return {}
+
+        messages = self._messages(board, state.get("segments") or [])
+        result: ChannelList = self.router.invoke(self.name, messages, schema=ChannelList)
+        print(f"[channel_predictor] LLM returned {len(result.channels)} channels")
+
+        board.add_sticky_notes(channels_frame,
+                               [self._format_channel(channel.name, channel.description) for channel in result.channels])
+        return {"channels": result.channels}
+
+    async def apredict_channels(self, state: AgentState, api: AsyncMiroApiClient):
+        """Async version of predict_channels, creating the stickies through api."""
+        board: MiroBoard = state.get("new_board")
+        channels_frame = board.get_channels_frame()
+        if not channels_frame:
+            print("[channel_predictor] Warning: Channels frame not found")
+            return {}
+
+        messages = self._messages(board, state.get("segments") or [])
+        result: ChannelList = await self.router.ainvoke(self.name, messages, schema=ChannelList)
+        print(f"[channel_predictor] LLM returned {len(result.channels)} channels")
+
+        contents = [self._format_channel(channel.name, channel.description) for channel in result.channels]
+        await board.aadd_sticky_notes(api, channels_frame, contents)
+        return {"channels": result.channels}
@@ -0,0 +1,89 @@
+import re
+import threading
+
+from src.backend.enums.next_action import NextAction
+from src.backend.models.miro_board import MiroBoard
+from src.backend.models.miro_item import MiroItem
+
+# The action each chat frame's fixed agent prompt offers (see set_up_board / add_initial_chat_frame)
+CHAT_ACTIONS = {
+    'Initial Chat': NextAction.SET_UP_BOARD,
+    'Segments Chat': NextAction.PREDICT_SEGMENTS,
+    'Channels Chat': NextAction.PREDICT_CHANNELS,
+    'Summary Chat': NextAction.REFRESH_PLAN,
+}
+
+AFFIRMATIVE_REPLIES = {
+    "yes", "y", "yeah", "yea", "yep", "yup", "sure", "ok", "okay", "k", "please", "absolutely",
+    "definitely", "of course", "go ahead", "go for it", "do it", "please do", "yes please",
+    "sure thing", "sounds good", "lets do it", "let s do it", "why not", "ready", "affirmative",
+}
+AFFIRMATIVE_WORDS = {"yes", "yeah", "yep", "yup", "sure", "ok", "okay", "please", "absolutely", "definitely"}
+
+NEGATIVE_REPLIES = {
+    "no", "n", "nope", "nah", "no thanks", "no thank you", "not now", "not yet", "later", "skip",
+    "don t", "dont", "do not", "cancel", "stop", "never mind", "nevermind",
+}
+NEGATIVE_WORDS = {"no", "nope", "nah"}
+
+_NON_WORD = re.compile(r"[^\w]+")
+
+
+def normalize_reply(text: str) -> str:
+    """Lowercase the reply and reduce punctuation and whitespace to single spaces."""
+    return _NON_WORD.sub(" ", text.lower()).strip()
+
+
+class FastPathClassifier:
+    """
+    Rule- and lexicon-based pre-classifier for ActionChooser.
+
+    Most replies are a short yes or no to the fixed question in one chat frame, so the
+    action follows from the frame's tag and the reply alone. When that is unambiguous the
+    action is returned without calling the LLM; anything else returns None so the caller
+    falls back to the model. Hit and miss counts are kept for the process.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def classify_chat(self, board: MiroBoard, chat: MiroItem) -> NextAction | None:
+        """Action for one chat frame's reply, or None when the rules are not confident."""
+        action = self._classify_reply(board, chat)
+        self._record(action is not None)
+        return action
+
+    def _classify_reply(self, board: MiroBoard, chat: MiroItem) -> NextAction | None:
+        offered = next((CHAT_ACTIONS[tag] for tag in chat.tags if tag in CHAT_ACTIONS), None)
+        if offered is None:
+            return None
+
+        reply = normalize_reply(board.get_chat_reply(chat))
+        if self._matches(reply, AFFIRMATIVE_REPLIES, AFFIRMATIVE_WORDS):
+            return offered
+        if self._matches(reply, NEGATIVE_REPLIES, NEGATIVE_WORDS):
+            return NextAction.NO_ACTION
+        return None
+
+    @staticmethod
+    def _matches(reply: str, phrases: set[str], words: set[str]) -> bool:
+        if reply in phrases:
+            return True
+        tokens = reply.split()
+        return bool(tokens) and all(token in words for token in tokens)
+
+    def _record(self, hit: bool):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats_to_str(self) -> str:
+        return f"hits={self.hits} misses={self.misses} hit_rate={self.hit_rate():.0%}"
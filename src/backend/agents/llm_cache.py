@@ -0,0 +1,118 @@
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+_WHITESPACE = re.compile(r"\s+")
+
+_SELECT = "SELECT value, expires_at FROM llm_cache WHERE key = ?"
+_TOUCH = "UPDATE llm_cache SET last_used = ? WHERE key = ?"
+_UPSERT = """
+    INSERT INTO llm_cache (key, value, expires_at, last_used) VALUES (?, ?, ?, ?)
+    ON CONFLICT(key) DO UPDATE SET value = excluded.value, expires_at = excluded.expires_at,
+                                   last_used = excluded.last_used
+"""
+_DELETE = "DELETE FROM llm_cache WHERE key = ?"
+_EVICT = """
+    DELETE FROM llm_cache WHERE key IN (
+        SELECT key FROM llm_cache ORDER BY last_used LIMIT max(0, (SELECT count(*) FROM llm_cache) - ?)
+    )
+"""
+
+
+class LlmCache:
+    """
+    This is a singleton class that persists LLM results on disk (SQLite).
+
+    Entries are keyed by model name, prompt template version and a hash of the
+    normalized inputs, expire after LLM_CACHE_TTL_SECONDS, and the least recently used
+    ones are evicted once there are more than LLM_CACHE_MAX_ENTRIES.
+    Set LLM_CACHE_ENABLED=0 to bypass it.
+    """
+    _instance = None
+    _db_path = Path(os.getenv("LLM_CACHE_PATH", str(Path(__file__).parent.parent.parent.parent / "llm_cache.db")))
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(LlmCache, cls).__new__(cls)
+            cls._instance._local = threading.local()
+            cls._instance._stats_lock = threading.Lock()
+            cls._instance.enabled = os.getenv("LLM_CACHE_ENABLED", "1").lower() not in ("0", "false", "no")
+            cls._instance.ttl_seconds = float(os.getenv("LLM_CACHE_TTL_SECONDS", str(24 * 60 * 60)))
+            cls._instance.max_entries = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "10000"))
+            cls._instance.hits = 0
+            cls._instance.misses = 0
+            cls._instance._init_db()
+        return cls._instance
+
+    def _init_db(self):
+        conn = self._get_connection()
+        with conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS llm_cache (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    expires_at REAL NOT NULL,
+                    last_used REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_last_used ON llm_cache (last_used)")
+
+    def _get_connection(self):
+        """Get this thread's connection to the cache database, opening it on first use."""
+        conn = getattr(self._local, "connection", None)
+        if conn is None:
+            conn = sqlite3.connect(self._db_path, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = conn
+        return conn
+
+    @staticmethod
+    def make_key(model: str, template_version: str, inputs: str) -> str:
+        """Cache key for a call; inputs are compared after collapsing whitespace."""
+        normalized = _WHITESPACE.sub(" ", inputs).strip()
+        digest = hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+        return f"{model}:{template_version}:{digest}"
+
+    def get(self, key: str) -> str | None:
+        if not self.enabled:
+            return None
+
+        now = time.time()
+        conn = self._get_connection()
+        row = conn.execute(_SELECT, (key,)).fetchone()
+        if row is not None and row[1] <= now:
+            with conn:
+                conn.execute(_DELETE, (key,))
+            row = None
+
+        with self._stats_lock:
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+
+        with conn:
+            conn.execute(_TOUCH, (now, key))
+        return row[0]
+
+    def put(self, key: str, value: str):
+        if not self.enabled:
+            return
+
+        now = time.time()
+        conn = self._get_connection()
+        with conn:
+            conn.execute(_UPSERT, (key, value, now + self.ttl_seconds, now))
+            conn.execute(_EVICT, (self.max_entries,))
+
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats_to_str(self) -> str:
+        return f"hits={self.hits} misses={self.misses} hit_rate={self.hit_rate():.0%}"
@@ -0,0 +1,72 @@
+import os
+import threading
+
+from dotenv import load_dotenv
+from langchain_openai import ChatOpenAI
+
+_lock = threading.Lock()
+_env_loaded = False
+_clients: dict[tuple, ChatOpenAI] = {}
+_structured_clients: dict[tuple, object] = {}
+
+
+def _load_env_once():
+    global _env_loaded
+    if not _env_loaded:
+        load_dotenv()
+        _env_loaded = True
+
+
+def _key(model: str, temperature: float, options: dict) -> tuple:
+    return model, temperature, tuple(sorted(options.items()))
+
+
+def get_model_name(default: str) -> str:
+    """Model configured in OPENAI_MODEL, loading .env the first time it is needed."""
+    _load_env_once()
+    return os.getenv("OPENAI_MODEL", default)
+
+
+def get_llm(model: str, temperature: float = 0, **options) -> ChatOpenAI:
+    """
+    Process-wide ChatOpenAI client for a model and parameter set.
+
+    Clients are created once and shared by every agent, so their HTTP connection pools
+    stay warm between decisions. Extra options (timeout, max_tokens, ...) are passed to
+    ChatOpenAI and are part of the cache key.
+    """
+    key = _key(model, temperature, options)
+    client = _clients.get(key)
+    if client is None:
+        with _lock:
+            client = _clients.get(key)
+            if client is None:
+                _load_env_once()
+                client = ChatOpenAI(model=model, temperature=temperature, **options)
+                _clients[key] = client
+    return client
+
+
+def get_structured_llm(schema, model: str, temperature: float = 0, include_raw: bool = False, **options):
+    """
+    Shared with_structured_output wrapper around the shared client for the same parameters.
+    With include_raw the wrapper returns {"raw", "parsed", "parsing_error"} instead.
+    """
+    key = (schema, include_raw) + _key(model, temperature, options)
+    client = _structured_clients.get(key)
+    if client is None:
+        llm = get_llm(model, temperature, **options)
+        with _lock:
+            client = _structured_clients.get(key)
+            if client is None:
+                client = llm.with_structured_output(schema, include_raw=include_raw)
+                _structured_clients[key] = client
+    return client
+
+
+def with_request_timeout(llm: ChatOpenAI, timeout: float) -> ChatOpenAI:
+    """
+    Copy of a shared client whose requests time out after `timeout` seconds. The timeout is
+    sent with each request, so the copy still uses the shared client's connection pool.
+    """
+    return llm.model_copy(update={"model_kwargs": {**llm.model_kwargs, "timeout": timeout}})
@@ -0,0 +1,287 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+
+from src.backend.agents.llm_registry import get_llm, get_model_name, get_structured_llm, with_request_timeout
+from src.backend.enums.next_action import NextAction
+from src.backend.utils.deadline import astaggered_race, remaining_time, staggered_race
+from src.backend.utils.latency import LatencyTracker
+
+DEFAULT_MODEL = "gpt-5"
+DEFAULT_FALLBACK_MODEL = "gpt-4o-mini"
+
+
+@dataclass(frozen=True)
+class NodeModelConfig:
+    model: str
+    temperature: float = 0
+    timeout: float | None = None
+    max_tokens: int | None = None
+    # Seconds to wait for the primary model before also asking the fallback model
+    latency_budget: float | None = None
+    fallback_model: str | None = DEFAULT_FALLBACK_MODEL
+    # Send a duplicate request to the primary model once it is slower than its p95
+    hedge: bool = False
+    # Tokens of board content the node's prompt may carry (see PromptEncoder); None is unlimited
+    prompt_budget: int | None = None
+
+    def with_env_overrides(self, node: str) -> "NodeModelConfig":
+        """
+        Per-node settings from the environment, e.g. for node PREDICT_SEGMENTS:
+        OPENAI_MODEL_PREDICT_SEGMENTS, OPENAI_FALLBACK_MODEL_PREDICT_SEGMENTS,
+        LLM_TIMEOUT_PREDICT_SEGMENTS, LLM_MAX_TOKENS_PREDICT_SEGMENTS,
+        LLM_LATENCY_BUDGET_PREDICT_SEGMENTS, LLM_HEDGE_PREDICT_SEGMENTS and
+        LLM_PROMPT_BUDGET_PREDICT_SEGMENTS.
+        Unset values keep the node's defaults.
+        """
+        def env(name, convert):
+            value = os.getenv(f"{name}_{node}")
+            return convert(value) if value else None
+
+        overrides = {
+            "model": env("OPENAI_MODEL", str),
+            "fallback_model": env("OPENAI_FALLBACK_MODEL", str),
+            "timeout": env("LLM_TIMEOUT", float),
+            "max_tokens": env("LLM_MAX_TOKENS", int),
+            "latency_budget": env("LLM_LATENCY_BUDGET", float),
+            "hedge": env("LLM_HEDGE", lambda value: value.lower() in ("1", "true", "yes")),
+            "prompt_budget": env("LLM_PROMPT_BUDGET", int),
+        }
+        return replace(self, **{key: value for key, value in overrides.items() if value is not None})
+
+
+@dataclass
+class NodeStats:
+    latency: LatencyTracker = field(default_factory=LatencyTracker)
+    calls: int = 0
+    fallbacks: int = 0
+    errors: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+
+    def to_str(self) -> str:
+        p95 = self.latency.percentile(95)
+        p95_text = f"{p95:.2f}s" if p95 is not None else "-"
+        return (f"calls={self.calls} fallbacks={self.fallbacks} errors={self.errors} p95={p95_text} "
+                f"tokens_in={self.input_tokens} tokens_out={self.output_tokens}")
+
+
+class ModelRouter:
+    """
+    This is a singleton class that routes each graph node's LLM calls to its own model.
+
+    Every node has a model, temperature, timeout and max tokens. If the primary model has
+    not answered within the node's latency budget, the same request is also sent to the
+    faster fallback model and whichever answers first wins. Nodes with hedging enabled also
+    send a duplicate to the primary model once it is slower than the node's p95 latency.
+    Waiting is bounded by the current deadline (see utils.deadline). Latency and token usage
+    are recorded per node.
+    """
+    _instance = None
+
+    # The enum classification is cheap; the generation nodes get more room
+    NODE_DEFAULTS = {
+        NextAction.CHOOSE_NEXT_ACTION.name: NodeModelConfig(model=DEFAULT_MODEL, temperature=0,
+                                                            timeout=30, latency_budget=8,
+                                                            prompt_budget=2000),
+        NextAction.PREDICT_SEGMENTS.name: NodeModelConfig(model=DEFAULT_MODEL, temperature=0.7,
+                                                          timeout=120, latency_budget=45,
+                                                          prompt_budget=4000),
+        NextAction.PREDICT_CHANNELS.name: NodeModelConfig(model=DEFAULT_MODEL, temperature=0.7,
+                                                          timeout=120, latency_budget=45,
+                                                          prompt_budget=6000),
+        NextAction.REFRESH_PLAN.name: NodeModelConfig(model=DEFAULT_MODEL, temperature=0,
+                                                      timeout=180, latency_budget=90,
+                                                      prompt_budget=12000),
+    }
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(ModelRouter, cls).__new__(cls)
+            cls._instance._lock = threading.Lock()
+            cls._instance._configs = {}
+            cls._instance.stats = {}
+            cls._instance._executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="model-router")
+        return cls._instance
+
+    def config_for(self, node: str) -> NodeModelConfig:
+        config = self._configs.get(node)
+        if config is None:
+            default = self.NODE_DEFAULTS.get(node) or NodeModelConfig(model=DEFAULT_MODEL)
+            # OPENAI_MODEL still applies to every node that has no model of its own
+            default = replace(default, model=get_model_name(default.model))
+            config = default.with_env_overrides(node)
+            self._configs[node] = config
+        return config
+
+    def stats_for(self, node: str) -> NodeStats:
+        with self._lock:
+            return self.stats.setdefault(node, NodeStats())
+
+    def get_runnable(self, node: str, model: str | None = None, tools=None, schema=None):
+        """
+        The shared client for a node, optionally bound to tools or a structured output schema.
+        Inside a deadline_scope the request timeout is also capped by the time left.
+        """
+        config = self.config_for(node)
+        options = {}
+        if config.timeout is not None:
+            options["timeout"] = config.timeout
+        if config.max_tokens is not None:
+            options["max_tokens"] = config.max_tokens
+
+        model = model or config.model
+        timeout = remaining_time(config.timeout)
+        if timeout is not None and timeout != config.timeout:
+            # The deadline is closer than the node's own timeout; bound the request by it
+            llm = with_request_timeout(get_llm(model, config.temperature, **options), timeout)
+            if schema is not None:
+                return llm.with_structured_output(schema, include_raw=True)
+        elif schema is not None:
+            return get_structured_llm(schema, model, config.temperature, include_raw=True, **options)
+        else:
+            llm = get_llm(model, config.temperature, **options)
+        return llm.bind_tools(tools) if tools else llm
+
+    def invoke(self, node: str, messages, tools=None, schema=None, return_model=False):
+        """
+        Run the node's LLM call. With a schema the parsed object is returned, otherwise the
+        AI message. With return_model, a (model, result) tuple is returned, where model is
+        the one that actually answered (the primary or the fallback).
+        """
+        config = self.config_for(node)
+        stats = self.stats_for(node)
+        started = time.perf_counter()
+
+        try:
+            attempts = self._attempts(node, config, stats,
+                                      lambda model: self._call(node, model, messages, tools, schema))
+            model, raw, result = staggered_race(attempts, self._executor)
+        except Exception:
+            with self._lock:
+                stats.errors += 1
+            raise
+
+        self._record(node, config, stats, model, started, getattr(raw, "usage_metadata", None) or {})
+        return (model, result) if return_model else result
+
+    async def ainvoke(self, node: str, messages, tools=None, schema=None, return_model=False):
+        """Async version of invoke; hedges and the fallback race on the event loop."""
+        config = self.config_for(node)
+        stats = self.stats_for(node)
+        started = time.perf_counter()
+
+        try:
+            attempts = self._attempts(node, config, stats,
+                                      lambda model: self._acall(node, model, messages, tools, schema))
+            model, raw, result = await astaggered_race(attempts)
+        except Exception:
+            with self._lock:
+                stats.errors += 1
+            raise
+
+        self._record(node, config, stats, model, started, getattr(raw, "usage_metadata", None) or {})
+        return (model, result) if return_model else result
+
+    def stream(self, node: str, messages, tools=None):
+        """
+        Stream the node's primary model, yielding AI message chunks as they arrive.
+
+        There is no hedging or fallback: the caller may already have acted on part of the
+        output. The deadline is checked between chunks and stats are recorded at the end.
+        """
+        config = self.config_for(node)
+        stats = self.stats_for(node)
+        started = time.perf_counter()
+        remaining_time()
+
+        usage = {}
+        try:
+            for chunk in self.get_runnable(node, config.model, tools).stream(messages, stream_usage=True):
+                if chunk.usage_metadata:
+                    usage = chunk.usage_metadata
+                yield chunk
+                remaining_time()
+        except Exception:
+            with self._lock:
+                stats.errors += 1
+            raise
+
+        self._record(node, config, stats, config.model, started, usage)
+
+    async def astream(self, node: str, messages, tools=None):
+        """Async version of stream."""
+        config = self.config_for(node)
+        stats = self.stats_for(node)
+        started = time.perf_counter()
+        remaining_time()
+
+        usage = {}
+        try:
+            async for chunk in self.get_runnable(node, config.model, tools).astream(messages, stream_usage=True):
+                if chunk.usage_metadata:
+                    usage = chunk.usage_metadata
+                yield chunk
+                remaining_time()
+        except Exception:
+            with self._lock:
+                stats.errors += 1
+            raise
+
+        self._record(node, config, stats, config.model, started, usage)
+
+    def _record(self, node, config, stats, model, started, usage):
+        elapsed = time.perf_counter() - started
+        stats.latency.record(elapsed)
+        with self._lock:
+            stats.calls += 1
+            if model != config.model:
+                stats.fallbacks += 1
+            stats.input_tokens += usage.get("input_tokens", 0)
+            stats.output_tokens += usage.get("output_tokens", 0)
+        print(f"[model_router] {node.lower()} model={model} {elapsed:.2f}s "
+              f"tokens_in={usage.get('input_tokens', '?')} tokens_out={usage.get('output_tokens', '?')}")
+
+    def _attempts(self, node, config, stats, call):
+        """
+        The primary call, plus a hedge and the fallback with the delays they are due after.
+        call(model) starts one request; a failed primary hands over to the next attempt
+        straight away.
+        """
+        attempts = [(0, lambda: call(config.model))]
+
+        hedge_delay = stats.latency.hedge_delay() if config.hedge else None
+        if hedge_delay is not None:
+            attempts.append((hedge_delay, lambda: call(config.model)))
+
+        if config.latency_budget and config.fallback_model and config.fallback_model != config.model:
+            def fallback():
+                print(f"[model_router] {node.lower()} over its {config.latency_budget}s budget or failed, "
+                      f"asking {config.fallback_model}")
+                return call(config.fallback_model)
+            attempts.append((config.latency_budget, fallback))
+
+        return attempts
+
+    def _call(self, node: str, model: str, messages, tools, schema):
+        """Returns (model, raw AI message, result)."""
+        remaining_time()  # do not start a call once the deadline has passed
+        response = self.get_runnable(node, model, tools, schema).invoke(messages)
+        return self._unpack(model, response, schema)
+
+    @staticmethod
+    def _unpack(model: str, response, schema):
+        if schema is None:
+            return model, response, response
+
+        if response.get("parsing_error"):
+            raise response["parsing_error"]
+        return model, response.get("raw"), response.get("parsed")
+
+    async def _acall(self, node: str, model: str, messages, tools, schema):
+        """Async version of _call."""
+        remaining_time()
+        response = await self.get_runnable(node, model, tools, schema).ainvoke(messages)
+        return self._unpack(model, response, schema)
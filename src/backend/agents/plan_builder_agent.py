@@ -1,18 +1,34 @@
+import asyncio
+
+from langchain_core.runnables import RunnableLambda
 from langgraph.graph import StateGraph, START, END
 
 from src.backend.agents.agent_state import AgentState
 from src.backend.agents.action_chooser import ActionChooser
+from src.backend.agents.channel_predictor import ChannelPredictor
 from src.backend.agents.plan_refresher import PlanRefresher
 from src.backend.agents.segment_predictor import SegmentPredictor
+from src.backend.agents.speculator import Speculator
+from src.backend.async_miro_api import AsyncMiroApiClient
 from src.backend.boarditems.chat_frame import ChatFrame
 from src.backend.boarditems.frame_definitions import FrameDefinitions
 from src.backend.enums.next_action import NextAction
 from src.backend.miro_api import MiroApiClient
 from src.backend.models.miro_board import MiroBoard
+from src.backend.utils.tag_map import TagMap
 
 
 class PlanBuilderAgent:
     def __init__(self):
+        # Node agents live as long as the graph, so nothing is rebuilt per step
+        self.action_chooser = ActionChooser()
+        self.segment_predictor = SegmentPredictor()
+        self.channel_predictor = ChannelPredictor()
+        self.plan_refresher = PlanRefresher()
+        # Opt-in background precomputation of segments and the plan (SPECULATIVE_PRECOMPUTE)
+        self.speculator = Speculator(self.segment_predictor, self.plan_refresher)
+        # Used by the async path; one connection pool per event loop
+        self.async_api = AsyncMiroApiClient()
         self.agent = self._build_agent()
 
     def invoke(self, current_board: MiroBoard, new_board: MiroBoard) -> AgentState:
@@ -20,6 +36,18 @@ class PlanBuilderAgent:
             AgentState(current_board=current_board, new_board=new_board))
         return final_state
 
+    async def ainvoke(self, current_board: MiroBoard, new_board: MiroBoard) -> AgentState:
+        """
+        Run the graph with the async nodes, so many boards' runs can share one event loop.
+        LLM and Miro calls on the hot paths are awaited.
+
+        Limitation: add_initial_chat_frame and set_up_board have no async implementation.
+        They create frames and shapes, which AsyncMiroApiClient does not support, so they run
+        the sync nodes on the blocking MiroApiClient in a worker thread (asyncio.to_thread).
+        This happens once per board.
+        """
+        return await self.agent.ainvoke(AgentState(current_board=current_board, new_board=new_board))
+
     def add_initial_chat_frame(self, state: AgentState):
         """
         This is an agent node that adds the initial chat frame to the board.
@@ -40,19 +68,43 @@ class PlanBuilderAgent:
 
     def choose_next_action(self, state: AgentState):
         print(f"[choose_next_action] next: {state.get('next_action')}")
-        return ActionChooser().choose_next_action(state)
+        return self.action_chooser.choose_next_action(state)
+
+    async def aadd_initial_chat_frame(self, state: AgentState):
+        # Sync node in a thread: frame creation is not on AsyncMiroApiClient (see ainvoke)
+        return await asyncio.to_thread(self.add_initial_chat_frame, state)
+
+    async def achoose_next_action(self, state: AgentState):
+        print(f"[choose_next_action] next: {state.get('next_action')}")
+        return await self.action_chooser.achoose_next_action(state, self.async_api)
+
+    async def apredict_segments(self, state: AgentState):
+        print(f"[predict_segments] next: {state.get('next_action')}")
+        return await self.segment_predictor.apredict_segments(state, self.async_api)
+
+    async def apredict_channels(self, state: AgentState):
+        print(f"[predict_channels] next: {state.get('next_action')}")
+        return await self.channel_predictor.apredict_channels(state, self.async_api)
+
+    async def arefresh_plan(self, state: AgentState):
+        print("[refresh_plan] Refreshing plan")
+        return await self.plan_refresher.arefresh_plan(state, self.async_api)
+
+    async def aset_up_board(self, state: AgentState):
+        # Sync node in a thread: frame creation is not on AsyncMiroApiClient (see ainvoke)
+        return await asyncio.to_thread(self.set_up_board, state)
 
     def predict_segments(self, state: AgentState):
         print(f"[predict_segments] next: {state.get('next_action')}")
-        return SegmentPredictor().predict_segments(state)
+        return self.segment_predictor.predict_segments(state)
 
     def predict_channels(self, state: AgentState):
-        print("[predict_channels] Predicting channels")
-        return {}
+        print(f"[predict_channels] next: {state.get('next_action')}")
+        return self.channel_predictor.predict_channels(state)
 
     def refresh_plan(self, state: AgentState):
         print("[refresh_plan] Refreshing plan")
-        return PlanRefresher().refresh_plan(state)
+        return self.plan_refresher.refresh_plan(state)
 
     def set_up_board(self, state: AgentState):
         """
@@ -67,10 +119,12 @@ class PlanBuilderAgent:
 
         print("[set_up_board] Setting up")
         frame_defs = FrameDefinitions()
-        frame_defs.product.push_to_miro()
-        frame_defs.segments.push_to_miro()
-        frame_defs.channels.push_to_miro()
-        frame_defs.summary.push_to_miro()
+        # Tag all the new frames in one transaction
+        with TagMap().batch():
+            frame_defs.product.push_to_miro()
+            frame_defs.segments.push_to_miro()
+            frame_defs.channels.push_to_miro()
+            frame_defs.summary.push_to_miro()
 
         api = MiroApiClient()
         fresh_board: MiroBoard = api.load_board()
@@ -86,33 +140,56 @@ class PlanBuilderAgent:
         return {}
 
     def route_after_choose(self, state: AgentState):
-        next_action = state.get("next_action")
-        print(f"[route_after_choose] Next action: {next_action}")
-
-        # If next_action is None or NO_ACTION, go to END
-        if next_action is None or next_action == NextAction.NO_ACTION:
-            return END
-
-        # Convert enum name to lowercase node name (e.g., ADD_INITIAL_CHAT_FRAME -> add_initial_chat_frame)
-        return next_action.name.lower()
+        next_actions = state.get("next_actions")
+        if next_actions is None:
+            next_action = state.get("next_action")
+            next_actions = [next_action] if next_action is not None else []
+        print(f"[route_after_choose] Next actions: {[action.name for action in next_actions]}")
+
+        # Each action gets its own node and they all run concurrently
+        nodes = []
+        for next_action in next_actions:
+            if next_action == NextAction.NO_ACTION:
+                continue
+            if next_action == NextAction.REFRESH_ALL:
+                # Channels follow the segments (see route_after_segments); refresh_plan is deferred until both finish
+                targets = ["predict_segments", "refresh_plan"]
+            else:
+                # Convert enum name to lowercase node name (e.g., ADD_INITIAL_CHAT_FRAME -> add_initial_chat_frame)
+                targets = [next_action.name.lower()]
+            nodes.extend(target for target in targets if target not in nodes)
+
+        if NextAction.REFRESH_ALL in next_actions and "predict_channels" in nodes:
+            # Another chat asked for channels too; run them once, after the segments
+            nodes.remove("predict_channels")
+
+        # If there is nothing to do, go to END
+        return nodes or END
+
+    def route_after_segments(self, state: AgentState):
+        """When refreshing everything, predict the channels next so they see the new segments."""
+        if NextAction.REFRESH_ALL in (state.get("next_actions") or [state.get("next_action")]):
+            return "predict_channels"
+        return END
 
     def _build_agent(self):
         g = StateGraph(AgentState)
 
-        # Nodes
-        g.add_node("choose_next_action", self.choose_next_action)
-        g.add_node("add_initial_chat_frame", self.add_initial_chat_frame)
-        g.add_node("set_up_board", self.set_up_board)
-        g.add_node("predict_segments", self.predict_segments)
-        g.add_node("predict_channels", self.predict_channels)
-        g.add_node("refresh_plan", self.refresh_plan)
+        # Nodes; each has a sync version for invoke and an async one for ainvoke
+        g.add_node("choose_next_action", RunnableLambda(self.choose_next_action, self.achoose_next_action))
+        g.add_node("add_initial_chat_frame", RunnableLambda(self.add_initial_chat_frame, self.aadd_initial_chat_frame))
+        g.add_node("set_up_board", RunnableLambda(self.set_up_board, self.aset_up_board))
+        g.add_node("predict_segments", RunnableLambda(self.predict_segments, self.apredict_segments))
+        g.add_node("predict_channels", RunnableLambda(self.predict_channels, self.apredict_channels))
+        # Deferred: runs after every other branch of the run, so it sees their predictions
+        g.add_node("refresh_plan", RunnableLambda(self.refresh_plan, self.arefresh_plan), defer=True)
 
         # Edges
         g.add_edge(START, "choose_next_action")
         g.add_conditional_edges("choose_next_action", self.route_after_choose)
         g.add_edge("add_initial_chat_frame", END)
         g.add_edge("set_up_board", END)
-        g.add_edge("predict_segments", END)
+        g.add_conditional_edges("predict_segments", self.route_after_segments, ["predict_channels", END])
         g.add_edge("predict_channels", END)
         g.add_edge("refresh_plan", END)
 
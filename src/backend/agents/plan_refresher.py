@@ -1,111 +1,247 @@
-import os
-from pathlib import Path
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 
-from dotenv import load_dotenv
-from langchain_openai import ChatOpenAI
 from langchain_core.tools import tool
 from langchain_core.messages import SystemMessage, HumanMessage, ToolMessage
 
 from src.backend.agents.agent_node import AgentNode
+from src.backend.agents.model_router import ModelRouter
 from src.backend.agents.agent_state import AgentState
+from src.backend.agents.llm_cache import LlmCache
+from src.backend.agents.prompt_encoder import PromptEncoder, PromptSection
+from src.backend.agents.prompt_registry import PromptRegistry
+from src.backend.enums.item_type import ItemType
 from src.backend.enums.next_action import NextAction
 from src.backend.miro_api import MiroApiClient
 from src.backend.models.miro_board import MiroBoard
 from src.backend.models.miro_item import MiroItem
+from src.backend.models.plan.channel_list import ChannelList
 from src.backend.models.plan.plan import Plan
+from src.backend.models.plan.product import Product
+from src.backend.models.plan.segment_list import SegmentList
+from src.backend.models.plan.suggestion_list import SuggestionList
+from src.backend.async_miro_api import AsyncMiroApiClient
+from src.backend.utils.deadline import submit_in_context
+from src.backend.utils.text_normalizer import content_hash
 
+# Placement and style of the shape the plan is rendered into
+SUMMARY_SHAPE = dict(x=100, y=450, width=800, height=1000, fill_color="#FFFFFF", text_align="left",
+                     font_size=12, border_color="#E0E0E0", border_width=1)
 
-def _load_prompt_template(filename: str) -> str:
-    """Load a prompt template from the prompts directory."""
-    prompts_dir = Path(__file__).parent / "prompts"
-    prompt_file = prompts_dir / filename
-    with open(prompt_file, 'r', encoding='utf-8') as f:
-        return f.read()
+# Plan field -> (prompt name prefix, structured output schema, field of the schema holding the section).
+# Product, segments and channels are each extracted from their own frame; suggestions look at all three.
+PLAN_SECTIONS = {
+    "product": ("plan_product", Product, None),
+    "segments": ("plan_segments", SegmentList, "segments"),
+    "channels": ("plan_channels", ChannelList, "channels"),
+    "suggestions": ("plan_suggestions", SuggestionList, "suggestions"),
+}
 
 
 class PlanRefresher(AgentNode):
     def __init__(self):
         super().__init__(NextAction.REFRESH_PLAN.name)
+        self.prompts = PromptRegistry()
+        self.router = ModelRouter()
+        self.cache = LlmCache()
+        self._executor = ThreadPoolExecutor(max_workers=len(PLAN_SECTIONS), thread_name_prefix="plan-refresher")
+        # The shape the plan was last rendered into and the hash of that HTML
+        self._summary_shape_id = None
+        self._summary_hash = None
 
     def refresh_plan(self, state: AgentState):
         board = state.get("new_board")
-        dump = {
-            'product': board.get_product_frame().dump_sticky_notes(),
-            'segments': board.get_segment_frame().dump_sticky_notes(),
-            'channels': board.get_channels_frame().dump_sticky_notes(),
-            'suggestions': ''  # Suggestions are generated by the LLM, not from sticky notes
-        }
-
-        # Initialize the LLM with structured output
-        load_dotenv()
-        model_name = os.getenv("OPENAI_MODEL", "gpt-4")
-        llm = ChatOpenAI(model=model_name, temperature=0)
-
-        # Use with_structured_output to get a Plan object directly
-        llm_with_structure = llm.with_structured_output(Plan)
-
-        # Load the system prompt
-        system_prompt_text = _load_prompt_template("plan_refresher_system.txt")
-        system_message = SystemMessage(content=system_prompt_text)
-
-        # Load and format the user prompt with the dump data
-        user_prompt_template = _load_prompt_template("plan_refresher_user.txt")
-        user_content = user_prompt_template.format(
-            product=dump['product'],
-            segments=dump['segments'],
-            channels=dump['channels'],
-            suggestions=dump['suggestions']
-        )
-        user_message = HumanMessage(content=user_content)
-
-        # Invoke the LLM to get structured output
-        messages = [system_message, user_message]
-        plan: Plan = llm_with_structure.invoke(messages)
+
+        plan = self._build_plan(state)
 
         print(f"[plan_refresher] Plan extracted: {plan.model_dump()}")
 
-        # Clear the Summary frame and add the plan as a formatted shape
+        # Render the plan into the Summary frame's shape
         self._display_plan_in_summary_frame(board, plan)
 
         return {'plan': plan}
 
-    def _display_plan_in_summary_frame(self, board: MiroBoard, plan: Plan):
-        """Clear the Summary frame and display the plan in a nicely formatted shape."""
-        api = MiroApiClient()
-        summary_frame = board.get_summary_frame()
+    def precompute(self, state: AgentState) -> Plan:
+        """
+        Generate the plan's stale sections ahead of time, without rendering it. They land in
+        the section cache, so a later refresh_plan on the same inputs only merges them.
+        """
+        return self._build_plan(state)
+
+    def _build_plan(self, state: AgentState) -> Plan:
+        # Only the sections whose source frames changed since they were last generated are regenerated
+        requests = self._section_requests(state)
+        stale = [name for name, (_, _, cached) in requests.items() if cached is None]
+        futures = {name: submit_in_context(self._executor, self._generate_section, name, requests[name][0])
+                   for name in stale}
+        return self._merge(requests, {name: future.result() for name, future in futures.items()})
 
+    async def arefresh_plan(self, state: AgentState, api: AsyncMiroApiClient):
+        """Async version of refresh_plan, updating the Summary frame through api."""
+        board = state.get("new_board")
+        requests = self._section_requests(state)
+        stale = [name for name, (_, _, cached) in requests.items() if cached is None]
+        results = await asyncio.gather(*(self._agenerate_section(name, requests[name][0]) for name in stale))
+        plan = self._merge(requests, dict(zip(stale, results)))
+        print(f"[plan_refresher] Plan extracted: {plan.model_dump()}")
+
+        summary_frame = board.get_summary_frame()
         if not summary_frame:
             print("[plan_refresher] Warning: Summary frame not found")
-            return
+            return {'plan': plan}
 
-        # Delete all children of the summary frame
-        for child_id in summary_frame.children:
+        async def delete(child_id):
             try:
-                api.delete_item(child_id)
+                await api.delete_item(child_id)
                 print(f"[plan_refresher] Deleted item {child_id} from Summary frame")
             except Exception as e:
                 print(f"[plan_refresher] Error deleting item {child_id}: {e}")
 
-        # Format the plan as HTML
         html_content = self._format_plan_as_html(plan)
+        shape_id, strays, up_to_date = self._summary_target(summary_frame, html_content)
+        deletes = asyncio.gather(*(delete(child_id) for child_id in strays))
+        if up_to_date:
+            print("[plan_refresher] Summary unchanged, nothing to write")
+        elif shape_id:
+            await api.update_shape_content(shape_id, html_content)
+        else:
+            shape_id = (await api.create_parented_shape(parent_id=summary_frame.id, content=html_content,
+                                                        **SUMMARY_SHAPE)).get('id')
+        await deletes
+
+        self._remember_summary(shape_id, html_content)
+        print("[plan_refresher] Plan displayed in Summary frame")
+        return {'plan': plan}
+
+    def _section_requests(self, state: AgentState) -> dict[str, tuple[list, str, object]]:
+        """
+        For every plan section: its messages, its cache key and its cached value (None when
+        stale). The key hashes the rendered prompts, which contain the section's source
+        frames, so a section stays cached for as long as its frames are unchanged.
+        """
+        board = state.get("new_board")
+        # Segments and channels predicted earlier in this run are not in the board snapshot yet
+        dump = PromptEncoder.for_node(self.name).encode([
+            PromptSection("product", board.get_product_frame().get_sticky_note_texts(), priority=0),
+            PromptSection("segments", self._with_predictions(board.get_segment_frame(), state.get("segments")),
+                          priority=1),
+            PromptSection("channels", self._with_predictions(board.get_channels_frame(), state.get("channels")),
+                          priority=2),
+        ])
+
+        model_name = self.router.config_for(self.name).model
+        requests = {}
+        for name, (prompt, schema, _) in PLAN_SECTIONS.items():
+            system_prompt_text = self.prompts.render(f"{prompt}_system")
+            if name == "suggestions":
+                user_prompt_text = self.prompts.render("plan_suggestions_user", **dump)
+            else:
+                user_prompt_text = self.prompts.render("plan_section_user", section=name, notes=dump[name])
+
+            messages = [SystemMessage(content=system_prompt_text), HumanMessage(content=user_prompt_text)]
+            cache_key = self.cache.make_key(model_name, self.prompts.get(f"{prompt}_system").version,
+                                            f"{name}\n{user_prompt_text}")
+            cached = self.cache.get(cache_key)
+            requests[name] = (messages, cache_key, schema.model_validate_json(cached) if cached else None)
+
+        return requests
+
+    def _generate_section(self, name: str, messages: list):
+        """Returns (model that answered, section)."""
+        return self.router.invoke(self.name, messages, schema=PLAN_SECTIONS[name][1], return_model=True)
 
-        # Create a shape with the formatted plan
-        api.create_parented_shape(
-            parent_id=summary_frame.id,
-            content=html_content,
-            x=100,
-            y=450,
-            width=800,
-            height=1000,
-            fill_color="#FFFFFF",
-            text_align="left",
-            font_size=12,
-            border_color="#E0E0E0",
-            border_width=1,
-        )
+    async def _agenerate_section(self, name: str, messages: list):
+        return await self.router.ainvoke(self.name, messages, schema=PLAN_SECTIONS[name][1], return_model=True)
 
+    def _merge(self, requests: dict, generated: dict) -> Plan:
+        """
+        Cache the freshly generated sections and combine them with the cached ones into a Plan.
+        generated maps a section to (model, result); the cache keys name the primary model,
+        so sections from the fallback model are used but not cached.
+        """
+        primary = self.router.config_for(self.name).model
+        for name, (model, result) in generated.items():
+            if model == primary:
+                self.cache.put(requests[name][1], result.model_dump_json())
+        generated = {name: result for name, (_, result) in generated.items()}
+        print(f"[plan_refresher] Regenerated sections: {', '.join(generated) or 'none'}; "
+              f"reused {len(requests) - len(generated)} cached ({self.cache.stats_to_str()})")
+
+        fields = {}
+        for name, (_, _, field_name) in PLAN_SECTIONS.items():
+            result = generated[name] if name in generated else requests[name][2]
+            fields[name] = getattr(result, field_name) if field_name else result
+        return Plan(**fields)
+
+    @staticmethod
+    def _with_predictions(frame: MiroItem | None, predictions) -> list[str]:
+        """
+        A frame's sticky note texts plus the segments or channels freshly predicted for it, sorted.
+        Predictions use the same text as the sticky they become, and Miro's listing order is not
+        guaranteed, so sorting keeps the section cache key the same once the stickies exist.
+        """
+        entries = frame.get_sticky_note_texts() if frame else []
+        return sorted(entries + [f"{prediction.name}\n{prediction.description}" for prediction in predictions or []])
+
+    def _display_plan_in_summary_frame(self, board: MiroBoard, plan: Plan):
+        """
+        Render the plan into the Summary frame's shape in place: unchanged output is not
+        written at all, changed output is a single content update, and any other children
+        of the frame are deleted concurrently. A shape is only created when there is none.
+        """
+        api = MiroApiClient()
+        summary_frame = board.get_summary_frame()
+
+        if not summary_frame:
+            print("[plan_refresher] Warning: Summary frame not found")
+            return
+
+        html_content = self._format_plan_as_html(plan)
+        shape_id, strays, up_to_date = self._summary_target(summary_frame, html_content)
+        deletes = [submit_in_context(self._executor, self._delete_summary_item, api, child_id) for child_id in strays]
+
+        if up_to_date:
+            print("[plan_refresher] Summary unchanged, nothing to write")
+        elif shape_id:
+            api.update_shape_content(shape_id, html_content)
+        else:
+            shape_id = api.create_parented_shape(parent_id=summary_frame.id, content=html_content,
+                                                 **SUMMARY_SHAPE).get('id')
+        for future in deletes:
+            future.result()
+
+        self._remember_summary(shape_id, html_content)
         print("[plan_refresher] Plan displayed in Summary frame")
 
+    def _summary_target(self, summary_frame: MiroItem, html_content: str) -> tuple[str | None, list[str], bool]:
+        """
+        The shape to render into (None when one has to be created), the ids of the other
+        children to delete, and whether the shape already shows html_content.
+        The shape rendered last time is preferred; after a restart any shape in the frame is adopted.
+        """
+        children = [child for child in summary_frame.get_children() if child]
+        shape = (next((child for child in children if child.id == self._summary_shape_id), None)
+                 or next((child for child in children if child.type == ItemType.SHAPE), None))
+        if shape is None:
+            return None, list(summary_frame.children), False
+
+        html_hash = content_hash(html_content)
+        up_to_date = ((shape.id == self._summary_shape_id and html_hash == self._summary_hash)
+                      or content_hash(shape.get_content() or "") == html_hash)
+        return shape.id, [child_id for child_id in summary_frame.children if child_id != shape.id], up_to_date
+
+    def _remember_summary(self, shape_id: str | None, html_content: str):
+        self._summary_shape_id = shape_id
+        self._summary_hash = content_hash(html_content)
+
+    @staticmethod
+    def _delete_summary_item(api: MiroApiClient, child_id: str):
+        try:
+            api.delete_item(child_id)
+            print(f"[plan_refresher] Deleted item {child_id} from Summary frame")
+        except Exception as e:
+            print(f"[plan_refresher] Error deleting item {child_id}: {e}")
+
     def _get_priority_icon(self, priority: str) -> str:
         """Return an icon based on the priority level."""
         priority_lower = priority.lower()
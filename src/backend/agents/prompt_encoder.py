@@ -0,0 +1,68 @@
+from dataclasses import dataclass, field
+
+from src.backend.agents.model_router import ModelRouter
+from src.backend.utils.text_normalizer import count_tokens, truncate_to_tokens
+
+# No single sticky or chat may take more than this many tokens of a prompt
+ENTRY_TOKEN_LIMIT = 300
+EMPTY_SECTION = "(none)"
+
+
+@dataclass(frozen=True)
+class PromptSection:
+    """
+    One block of board content for a prompt, e.g. the stickies of a frame.
+    Lower priority numbers are more important and are filled first.
+    """
+    name: str
+    entries: list[str] = field(default_factory=list)
+    priority: int = 0
+
+
+class PromptEncoder:
+    """
+    Turns board content into compact, markup-free prompt text within a token budget.
+
+    Every entry becomes one "- " line, with its line breaks folded into " / " and its
+    length capped at ENTRY_TOKEN_LIMIT. Sections are then filled in priority order (ties
+    keep the given order), each with its entries in order, until the next line no longer
+    fits the budget; the rest of that section is dropped and replaced by an "omitted"
+    line. The same content and budget always give the same prompt.
+    """
+
+    def __init__(self, budget: int | None, entry_limit: int = ENTRY_TOKEN_LIMIT):
+        self.budget = budget
+        self.entry_limit = entry_limit
+
+    @classmethod
+    def for_node(cls, node: str) -> "PromptEncoder":
+        """An encoder with the node's prompt budget (see NodeModelConfig.prompt_budget)."""
+        return cls(ModelRouter().config_for(node).prompt_budget)
+
+    def encode_line(self, entry: str) -> str:
+        text = " / ".join(line.strip() for line in entry.splitlines() if line.strip())
+        return "- " + truncate_to_tokens(text, self.entry_limit)
+
+    def encode(self, sections: list[PromptSection]) -> dict[str, str]:
+        """Encode every section, keyed by its name."""
+        remaining = self.budget
+        encoded = {}
+        for section in sorted(sections, key=lambda section: section.priority):
+            lines = []
+            for entry in section.entries:
+                line = self.encode_line(entry)
+                cost = count_tokens(line)
+                if remaining is not None and cost > remaining:
+                    break
+                lines.append(line)
+                if remaining is not None:
+                    remaining -= cost
+
+            dropped = len(section.entries) - len(lines)
+            if dropped:
+                lines.append(f"- ({dropped} more omitted)")
+                print(f"[prompt_encoder] Budget of {self.budget} tokens reached, "
+                      f"omitted {dropped} of {len(section.entries)} entries from {section.name}")
+            encoded[section.name] = "\n".join(lines) or EMPTY_SECTION
+
+        return encoded
@@ -0,0 +1,84 @@
+import hashlib
+import os
+import string
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+
+PROMPTS_DIR = Path(__file__).parent / "prompts"
+
+
+@dataclass(frozen=True)
+class PromptTemplate:
+    name: str
+    text: str
+    fields: frozenset[str]
+    version: str
+    mtime: float
+
+    @classmethod
+    def load(cls, path: Path) -> "PromptTemplate":
+        text = path.read_text(encoding="utf-8")
+        try:
+            fields = frozenset(
+                field_name.split(".")[0].split("[")[0]
+                for _, field_name, _, _ in string.Formatter().parse(text)
+                if field_name is not None
+            )
+        except ValueError as e:
+            raise ValueError(f"Invalid prompt template {path.name}: {e}") from e
+
+        if "" in fields or any(field.isdigit() for field in fields):
+            raise ValueError(f"Invalid prompt template {path.name}: only named fields are supported")
+
+        version = hashlib.sha256(text.encode("utf-8")).hexdigest()[:12]
+        return cls(name=path.stem, text=text, fields=fields, version=version, mtime=path.stat().st_mtime)
+
+    def render(self, **values) -> str:
+        missing = self.fields - values.keys()
+        if missing:
+            raise KeyError(f"Prompt {self.name} is missing values for: {', '.join(sorted(missing))}")
+        return self.text.format(**values)
+
+
+class PromptRegistry:
+    """
+    This is a singleton class that holds every prompt template in agents/prompts.
+
+    All templates are read and validated once, when the registry is first created, and
+    rendered from memory after that. Set PROMPTS_HOT_RELOAD=1 during development to have
+    edited files picked up on their next use.
+    """
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(PromptRegistry, cls).__new__(cls)
+            cls._instance._lock = threading.Lock()
+            cls._instance.hot_reload = os.getenv("PROMPTS_HOT_RELOAD", "").lower() in ("1", "true", "yes")
+            cls._instance._templates = {}
+            cls._instance.load_all()
+        return cls._instance
+
+    def load_all(self, directory: Path = PROMPTS_DIR):
+        """Load and validate every template; raises on the first invalid one."""
+        templates = {path.stem: PromptTemplate.load(path) for path in sorted(directory.glob("*.txt"))}
+        with self._lock:
+            self._templates = templates
+
+    def get(self, name: str) -> PromptTemplate:
+        """Look up a template by file name, without the .txt extension."""
+        template = self._templates.get(name)
+        if template is None:
+            raise KeyError(f"Unknown prompt template: {name}")
+
+        if self.hot_reload:
+            path = PROMPTS_DIR / f"{name}.txt"
+            if path.stat().st_mtime != template.mtime:
+                template = PromptTemplate.load(path)
+                with self._lock:
+                    self._templates[name] = template
+        return template
+
+    def render(self, name: str, **values) -> str:
+        return self.get(name).render(**values)
@@ -1,46 +1,156 @@
+
 import os
-from pathlib import Path
+import threading
 
-from dotenv import load_dotenv
-from langchain_openai import ChatOpenAI
-from langchain_core.tools import tool
-from langchain_core.messages import SystemMessage, HumanMessage, ToolMessage
+from langchain_core.tools import StructuredTool
+from langchain_core.messages import SystemMessage, HumanMessage
 
 from src.backend.agents.agent_node import AgentNode
+from src.backend.agents.model_router import ModelRouter
 from src.backend.agents.agent_state import AgentState
+from src.backend.agents.prompt_encoder import PromptEncoder, PromptSection
+from src.backend.agents.prompt_registry import PromptRegistry
+from src.backend.agents.tool_executor import ToolExecutor
+from src.backend.async_miro_api import AsyncMiroApiClient
 from src.backend.enums.next_action import NextAction
 from src.backend.miro_api import MiroApiClient
 from src.backend.models.miro_board import MiroBoard
 from src.backend.models.miro_item import MiroItem
+from src.backend.models.plan.segment import Segment
+from src.backend.models.plan.segment_list import SegmentList
+from src.backend.utils.text_normalizer import content_hash
 
-
-def _load_prompt_template(filename: str) -> str:
-    """Load a prompt template from the prompts directory."""
-    prompts_dir = Path(__file__).parent / "prompts"
-    prompt_file = prompts_dir / filename
-    with open(prompt_file, 'r', encoding='utf-8') as f:
-        return f.read()
+# "tools": the LLM adds segments through tool calls, one LLM round-trip per turn.
+# "structured": one structured call returns every segment, then the stickies are created in bulk.
+SEGMENT_PREDICTOR_MODES = ("tools", "structured")
 
 
 class SegmentPredictor(AgentNode):
     def __init__(self):
         super().__init__(NextAction.PREDICT_SEGMENTS.name)
-        self.segment_frame: MiroItem = None
-
-    def _add_segment_sticky_internal(self, content: str):
+        self.prompts = PromptRegistry()
+        self.router = ModelRouter()
+        self.tool_executor = ToolExecutor(self.name)
+        self.mode = os.getenv("SEGMENT_PREDICTOR_MODE", "tools").lower()
+        if self.mode not in SEGMENT_PREDICTOR_MODES:
+            raise ValueError(f"Invalid SEGMENT_PREDICTOR_MODE '{self.mode}'. "
+                             f"Allowed: {', '.join(SEGMENT_PREDICTOR_MODES)}")
+        # Segments predicted ahead of time (see Speculator), keyed by input_key
+        self._precomputed: dict[bytes, list[Segment]] = {}
+        self._precomputed_lock = threading.Lock()
+
+    @staticmethod
+    def _format_segment(segment_name: str, segment_description: str) -> str:
+        return f"<p><strong>{segment_name}</strong></p><p>{segment_description}</p>"
+
+    def _add_segment_sticky_internal(self, segment_frame: MiroItem, content: str):
         """Internal method to add a sticky note to the segment frame."""
         api = MiroApiClient()
-        point = self.segment_frame.get_next_available_sticky_position()
-        api.create_parented_sticky_note(self.segment_frame.id, content, point.x, point.y)
+        point = segment_frame.get_next_available_sticky_position()
+        api.create_parented_sticky_note(segment_frame.id, content, point.x, point.y)
+
+    def _user_message(self, board: MiroBoard) -> HumanMessage:
+        product = PromptSection("product", board.get_product_frame().get_sticky_note_texts())
+        product_info = PromptEncoder.for_node(self.name).encode([product])["product"]
+        return HumanMessage(content=self.prompts.render("segment_predictor_user", product_info=product_info))
+
+    def input_key(self, board: MiroBoard) -> bytes:
+        """Hash of everything the prediction depends on, i.e. the rendered product prompt."""
+        return content_hash(self._user_message(board).content)
+
+    def precompute(self, board: MiroBoard) -> list[Segment]:
+        """
+        Predict the segments for the board without touching it, and keep them for the next
+        predict_segments on the same product. Only the latest precomputation is kept.
+        """
+        user_message = self._user_message(board)
+        system_message = SystemMessage(content=self.prompts.render("segment_predictor_structured_system"))
+        result: SegmentList = self.router.invoke(self.name, [system_message, user_message], schema=SegmentList)
+        with self._precomputed_lock:
+            self._precomputed = {content_hash(user_message.content): result.segments}
+        print(f"[segment_predictor] Precomputed {len(result.segments)} segments")
+        return result.segments
+
+    def _take_precomputed(self, user_message: HumanMessage) -> list[Segment] | None:
+        """Precomputed segments for exactly this prompt, if any; they are only used once."""
+        with self._precomputed_lock:
+            segments = self._precomputed.pop(content_hash(user_message.content), None)
+            # Anything else was computed from a product that has changed since
+            self._precomputed = {}
+        if segments is not None:
+            print(f"[segment_predictor] Using {len(segments)} precomputed segments")
+        return segments
 
     def predict_segments(self, state: AgentState):
         board_state: MiroBoard = state.get("new_board")
-        self.segment_frame = board_state.get_segment_frame()
-        self.product_frame = board_state.get_product_frame()
-        product_info = self.product_frame.dump_sticky_notes()
+        segment_frame = board_state.get_segment_frame()
+        user_message = self._user_message(board_state)
+
+        segments = self._take_precomputed(user_message)
+        if segments is not None:
+            board_state.add_sticky_notes(segment_frame,
+                                         [self._format_segment(segment.name, segment.description)
+                                          for segment in segments])
+        elif self.mode == "structured":
+            segments = self._predict_segments_structured(board_state, segment_frame, user_message)
+        else:
+            segments = self._predict_segments_with_tools(segment_frame, user_message)
+
+        print(f"[segment_predictor] Segment prediction complete")
+        return {"segments": segments}
+
+    async def apredict_segments(self, state: AgentState, api: AsyncMiroApiClient):
+        """Async version of predict_segments, creating the stickies through api."""
+        board_state: MiroBoard = state.get("new_board")
+        segment_frame = board_state.get_segment_frame()
+        user_message = self._user_message(board_state)
+
+        segments = self._take_precomputed(user_message)
+        if segments is not None:
+            contents = [self._format_segment(segment.name, segment.description) for segment in segments]
+            await board_state.aadd_sticky_notes(api, segment_frame, contents)
+        elif self.mode == "structured":
+            system_message = SystemMessage(content=self.prompts.render("segment_predictor_structured_system"))
+            result: SegmentList = await self.router.ainvoke(self.name, [system_message, user_message],
+                                                            schema=SegmentList)
+            segments = result.segments
+            print(f"[segment_predictor] LLM returned {len(segments)} segments")
+            contents = [self._format_segment(segment.name, segment.description) for segment in segments]
+            await board_state.aadd_sticky_notes(api, segment_frame, contents)
+        else:
+            segments = []
+            tools = [self._segment_tool(segment_frame, segments, api)]
+            messages = [SystemMessage(content=self.prompts.render("segment_predictor_system")), user_message]
+            response, tool_messages = await self.tool_executor.arun_stream(
+                self.router.astream(self.name, messages, tools), tools)
+            while response.tool_calls:
+                messages.append(response)
+                messages.extend(tool_messages)
+                response, tool_messages = await self.tool_executor.arun_stream(
+                    self.router.astream(self.name, messages, tools), tools)
 
-        # Define the tool that the LLM can call (as a closure to capture 'self')
-        @tool
+        print(f"[segment_predictor] Segment prediction complete")
+        return {"segments": segments}
+
+    def _predict_segments_structured(self, board: MiroBoard, segment_frame: MiroItem,
+                                     user_message: HumanMessage) -> list[Segment]:
+        """Get every segment from one structured call and create all the stickies in one pass."""
+        system_message = SystemMessage(content=self.prompts.render("segment_predictor_structured_system"))
+        result: SegmentList = self.router.invoke(self.name, [system_message, user_message], schema=SegmentList)
+        segments: list[Segment] = result.segments
+        print(f"[segment_predictor] LLM returned {len(segments)} segments")
+
+        # Reserve all positions up front, then create the stickies concurrently
+        board.add_sticky_notes(segment_frame,
+                               [self._format_segment(segment.name, segment.description) for segment in segments])
+        return segments
+
+    def _segment_tool(self, segment_frame: MiroItem, segments: list[Segment],
+                      api: AsyncMiroApiClient | None = None) -> StructuredTool:
+        """
+        The tool that the LLM can call. Every added segment is appended to segments; with an
+        AsyncMiroApiClient the tool also runs as a coroutine.
+        """
         def add_segment_sticky(segment_name: str, segment_description: str) -> str:
             """Add a customer segment sticky note to the Segments frame.
 
@@ -52,61 +162,41 @@ class SegmentPredictor(AgentNode):
                 Confirmation message
             """
             # Format the content for the sticky note
-            content = f"<p><strong>{segment_name}</strong></p><p>{segment_description}</p>"
+            content = self._format_segment(segment_name, segment_description)
+            self._add_segment_sticky_internal(segment_frame, content)
+            segments.append(Segment(name=segment_name, description=segment_description))
+
+            return f"Added segment: {segment_name}"
 
-            # Call the instance method to add the sticky (self is captured from outer scope)
-            self._add_segment_sticky_internal(content)
+        async def aadd_segment_sticky(segment_name: str, segment_description: str) -> str:
+            content = self._format_segment(segment_name, segment_description)
+            point = segment_frame.get_next_available_sticky_position()
+            await api.create_parented_sticky_note(segment_frame.id, content, point.x, point.y)
+            segments.append(Segment(name=segment_name, description=segment_description))
 
             return f"Added segment: {segment_name}"
 
-        # Initialize the LLM
-        load_dotenv()
-        model_name = os.getenv("OPENAI_MODEL", "gpt-5")
-        llm = ChatOpenAI(model=model_name, temperature=0.7)
+        return StructuredTool.from_function(func=add_segment_sticky,
+                                            coroutine=aadd_segment_sticky if api is not None else None)
 
-        # Bind the tool to the LLM
-        llm_with_tools = llm.bind_tools([add_segment_sticky])
+    def _predict_segments_with_tools(self, segment_frame: MiroItem, user_message: HumanMessage) -> list[Segment]:
+        segments: list[Segment] = []
+        tools = [self._segment_tool(segment_frame, segments)]
 
-        # Load the system prompt
-        system_prompt_text = _load_prompt_template("segment_predictor_system.txt")
+        # Render the preloaded prompts
+        system_prompt_text = self.prompts.render("segment_predictor_system")
         system_message = SystemMessage(content=system_prompt_text)
 
-        # Create the user prompt with product info
-        user_message = HumanMessage(content=f"Product Information:\n{product_info}\n\nIdentify customer segments for this product.")
-
-        # Invoke the LLM
+        # Stream this node's LLM with the tool bound; each sticky is created as soon as its
+        # tool call is complete, while the rest of the response is still being generated
         messages = [system_message, user_message]
-        response = llm_with_tools.invoke(messages)
+        response, tool_messages = self.tool_executor.run_stream(self.router.stream(self.name, messages, tools), tools)
 
-        # Process tool calls in a loop until the LLM is done
+        # Loop until the LLM makes no more tool calls
         while response.tool_calls:
-            # Add the AI response to messages
             messages.append(response)
+            messages.extend(tool_messages)
+            response, tool_messages = self.tool_executor.run_stream(self.router.stream(self.name, messages, tools),
+                                                                    tools)
 
-            # Execute each tool call
-            for tool_call in response.tool_calls:
-                tool_name = tool_call["name"]
-                tool_args = tool_call["args"]
-
-                print(f"[segment_predictor] LLM calling tool: {tool_name} with args: {tool_args}")
-
-                # Execute the tool
-                if tool_name == "add_segment_sticky":
-                    result = add_segment_sticky.invoke(tool_args)
-                    print(f"[segment_predictor] Tool result: {result}")
-
-                    # Add the tool result to messages
-                    tool_message = ToolMessage(
-                        content=result,
-                        tool_call_id=tool_call["id"]
-                    )
-                    messages.append(tool_message)
-
-            # Get the next response from the LLM
-            response = llm_with_tools.invoke(messages)
-
-        print(f"[segment_predictor] Segment prediction complete")
-        return {}
-
-
-
+        return segments
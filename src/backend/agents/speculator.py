@@ -0,0 +1,69 @@
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from src.backend.agents.plan_refresher import PlanRefresher
+from src.backend.agents.segment_predictor import SegmentPredictor
+from src.backend.models.miro_board import MiroBoard
+
+
+class Speculator:
+    """
+    Precomputes segments and the plan in the background while the user is still editing.
+
+    Once the product frame has changed and then stayed the same for SPECULATIVE_STABLE_SECONDS,
+    the segments are predicted (without touching the board) and the plan sections for the
+    product plus those segments are generated into the section cache. When the user confirms,
+    the nodes pick these up instead of waiting for the LLM. Both are keyed by a hash of their
+    inputs, so results for a product that has changed since are never used.
+
+    Opt in with SPECULATIVE_PRECOMPUTE=1; it spends LLM calls on results that may be discarded.
+    """
+
+    def __init__(self, segment_predictor: SegmentPredictor, plan_refresher: PlanRefresher):
+        self.segment_predictor = segment_predictor
+        self.plan_refresher = plan_refresher
+        self.enabled = os.getenv("SPECULATIVE_PRECOMPUTE", "0").lower() in ("1", "true", "yes")
+        self.stable_seconds = float(os.getenv("SPECULATIVE_STABLE_SECONDS", "20"))
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="speculator")
+        self._product_key: bytes | None = None
+        self._stable_since: float | None = None
+        self._speculated_key: bytes | None = None
+
+    def observe(self, board: MiroBoard, now: float | None = None) -> Future | None:
+        """
+        Look at the latest board snapshot, once per poll cycle. Starts a background
+        precomputation when the product frame has settled; returns its future, if any.
+        """
+        if not self.enabled or not board.get_product_frame() or not board.get_segment_frame():
+            return None
+
+        now = time.monotonic() if now is None else now
+        key = self.segment_predictor.input_key(board)
+        with self._lock:
+            if key != self._product_key:
+                # The first snapshot is not an edit; only wait for stability after a change
+                self._stable_since = now if self._product_key is not None else None
+                self._product_key = key
+                return None
+
+            if (self._stable_since is None or now - self._stable_since < self.stable_seconds
+                    or key == self._speculated_key):
+                return None
+            self._speculated_key = key
+
+        print(f"[speculator] Product stable for {self.stable_seconds:.0f}s, precomputing segments and plan")
+        return self._executor.submit(self._precompute, board, key)
+
+    def _precompute(self, board: MiroBoard, key: bytes):
+        try:
+            segments = self.segment_predictor.precompute(board)
+            self.plan_refresher.precompute({"new_board": board, "segments": segments})
+        except Exception as e:  # noqa: BLE001 - speculation must never break polling
+            print(f"[speculator] Precomputation failed: {e}")
+            # Let the next stable observation of the same product try again
+            with self._lock:
+                if self._speculated_key == key:
+                    self._speculated_key = None
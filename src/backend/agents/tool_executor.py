@@ -0,0 +1,212 @@
+import asyncio
+import json
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import AsyncIterable, Iterable
+
+from langchain_core.messages import AIMessage, AIMessageChunk, ToolMessage, message_chunk_to_message
+
+from src.backend.utils.deadline import submit_in_context
+
+DEFAULT_MAX_CONCURRENCY = 4
+
+
+class ToolExecutor:
+    """
+    Runs the tool calls of one LLM turn concurrently.
+
+    At most max_workers calls run at once (TOOL_MAX_CONCURRENCY, default 4), so a turn
+    with many calls does not flood the Miro API. The ToolMessages come back in the order
+    of the tool calls, whatever order they finish in. A failing or unknown tool becomes an
+    error ToolMessage, because the LLM expects an answer to every call it made.
+    """
+
+    def __init__(self, name: str, max_workers: int | None = None):
+        self.name = name
+        self.max_workers = max_workers or int(os.getenv("TOOL_MAX_CONCURRENCY", DEFAULT_MAX_CONCURRENCY))
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=f"{name}-tools")
+
+    def run(self, tool_calls: list[dict], tools: list,
+            started: dict[str, Future] | None = None) -> list[ToolMessage]:
+        """
+        Run the tool calls and return their ToolMessages in call order. `started` maps the ids
+        of calls that are already running (see run_stream) to their futures; they are not run again.
+        """
+        tools_by_name = {tool.name: tool for tool in tools}
+        started = started or {}
+        if len(tool_calls) <= 1 and not started:
+            return [self._run_one(tool_call, tools_by_name) for tool_call in tool_calls]
+
+        futures = [started.get(tool_call["id"])
+                   or submit_in_context(self._executor, self._run_one, tool_call, tools_by_name)
+                   for tool_call in tool_calls]
+        return [future.result() for future in futures]
+
+    def run_stream(self, chunks: Iterable[AIMessageChunk], tools: list) -> tuple[AIMessage, list[ToolMessage]]:
+        """
+        Consume a streamed LLM response and start each tool call as soon as its arguments
+        are complete, while the model is still generating the rest.
+
+        A call is complete once its argument string parses as JSON, or once the stream moves
+        on to the next call index. Returns the full AI message and its ToolMessages in call order;
+        a call whose arguments could not be parsed is answered with an error ToolMessage.
+        """
+        tools_by_name = {tool.name: tool for tool in tools}
+        stream = _ToolCallStream()
+        futures: dict[str, Future] = {}  # call id -> running tool call
+
+        for chunk in chunks:
+            for tool_call in stream.add(chunk):
+                futures[tool_call["id"]] = submit_in_context(self._executor, self._run_one, tool_call, tools_by_name)
+
+        # Anything the stream did not let us start early runs now
+        response = stream.message()
+        messages = self.run(response.tool_calls, tools, futures) + self._invalid_call_messages(response)
+        return response, stream.in_call_order(messages)
+
+    async def arun(self, tool_calls: list[dict], tools: list, started: dict[str, asyncio.Task] | None = None,
+                   semaphore: asyncio.Semaphore | None = None) -> list[ToolMessage]:
+        """
+        Async version of run; at most max_workers tool calls run at once. Calls in `started`
+        must hold the same `semaphore` for the limit to cover them too.
+        """
+        tools_by_name = {tool.name: tool for tool in tools}
+        semaphore = semaphore or asyncio.Semaphore(self.max_workers)
+        started = started or {}
+        return list(await asyncio.gather(*(started.get(tool_call["id"])
+                                           or self._arun_one(tool_call, tools_by_name, semaphore)
+                                           for tool_call in tool_calls)))
+
+    async def arun_stream(self, chunks: AsyncIterable[AIMessageChunk],
+                          tools: list) -> tuple[AIMessage, list[ToolMessage]]:
+        """Async version of run_stream."""
+        tools_by_name = {tool.name: tool for tool in tools}
+        semaphore = asyncio.Semaphore(self.max_workers)
+        stream = _ToolCallStream()
+        tasks: dict[str, asyncio.Task] = {}
+
+        async for chunk in chunks:
+            for tool_call in stream.add(chunk):
+                tasks[tool_call["id"]] = asyncio.create_task(self._arun_one(tool_call, tools_by_name, semaphore))
+
+        response = stream.message()
+        messages = await self.arun(response.tool_calls, tools, tasks, semaphore)
+        return response, stream.in_call_order(messages + self._invalid_call_messages(response))
+
+    def _invalid_call_messages(self, response: AIMessage) -> list[ToolMessage]:
+        """
+        Error answers for the calls whose arguments did not parse. They are still part of the
+        AI message sent back to the LLM, which rejects a turn with unanswered calls.
+        """
+        messages = []
+        for invalid_call in response.invalid_tool_calls:
+            if not invalid_call.get("id"):
+                continue
+            print(f"[{self.name.lower()}] Invalid tool call {invalid_call.get('name')}: {invalid_call.get('error')}")
+            messages.append(ToolMessage(content=f"Error: invalid arguments for {invalid_call.get('name')}: "
+                                                f"{invalid_call.get('args')}",
+                                        tool_call_id=invalid_call["id"], status="error"))
+        return messages
+
+    async def _arun_one(self, tool_call: dict, tools_by_name: dict, semaphore: asyncio.Semaphore) -> ToolMessage:
+        async with semaphore:
+            tool_name = tool_call["name"]
+            print(f"[{self.name.lower()}] LLM calling tool: {tool_name} with args: {tool_call['args']}")
+
+            tool = tools_by_name.get(tool_name)
+            if tool is None:
+                return ToolMessage(content=f"Error: unknown tool {tool_name}", tool_call_id=tool_call["id"],
+                                   status="error")
+
+            try:
+                result = await tool.ainvoke(tool_call["args"])
+            except Exception as e:  # noqa: BLE001 - reported back to the LLM instead
+                print(f"[{self.name.lower()}] Tool {tool_name} failed: {e}")
+                return ToolMessage(content=f"Error: {e}", tool_call_id=tool_call["id"], status="error")
+
+            print(f"[{self.name.lower()}] Tool result: {result}")
+            return ToolMessage(content=str(result), tool_call_id=tool_call["id"])
+
+    def _run_one(self, tool_call: dict, tools_by_name: dict) -> ToolMessage:
+        tool_name = tool_call["name"]
+        print(f"[{self.name.lower()}] LLM calling tool: {tool_name} with args: {tool_call['args']}")
+
+        tool = tools_by_name.get(tool_name)
+        if tool is None:
+            return ToolMessage(content=f"Error: unknown tool {tool_name}", tool_call_id=tool_call["id"],
+                               status="error")
+
+        try:
+            result = tool.invoke(tool_call["args"])
+        except Exception as e:  # noqa: BLE001 - reported back to the LLM instead
+            print(f"[{self.name.lower()}] Tool {tool_name} failed: {e}")
+            return ToolMessage(content=f"Error: {e}", tool_call_id=tool_call["id"], status="error")
+
+        print(f"[{self.name.lower()}] Tool result: {result}")
+        return ToolMessage(content=str(result), tool_call_id=tool_call["id"])
+
+
+class _ToolCallStream:
+    """Accumulates a streamed AI message and reports each tool call once its arguments are complete."""
+
+    def __init__(self):
+        self._message: AIMessageChunk | None = None
+        self._pending: dict[int, dict] = {}  # call index -> {"name", "id", "args"} accumulated so far
+        self._done: set[int] = set()  # call indexes already completed; late chunks for them are ignored
+        self._indexes: dict[str, int] = {}  # call id -> call index, for answering in call order
+
+    def add(self, chunk: AIMessageChunk) -> list[dict]:
+        """Add a chunk and return the tool calls it completed."""
+        self._message = chunk if self._message is None else self._message + chunk
+
+        completed = []
+        for tool_call_chunk in chunk.tool_call_chunks:
+            index = tool_call_chunk.get("index") or 0
+            if index in self._done:
+                continue
+            call = self._pending.setdefault(index, {"name": None, "id": None, "args": ""})
+            call["name"] = call["name"] or tool_call_chunk.get("name")
+            call["id"] = call["id"] or tool_call_chunk.get("id")
+            if call["id"]:
+                self._indexes.setdefault(call["id"], index)
+            call["args"] += tool_call_chunk.get("args") or ""
+
+            # A new index means every earlier call has all its arguments
+            for earlier in [i for i in self._pending if i < index]:
+                completed.extend(self._complete(earlier))
+
+        for index, call in list(self._pending.items()):
+            if call["name"] and call["id"] and self._is_complete(call["args"]):
+                completed.extend(self._complete(index))
+        return completed
+
+    def message(self) -> AIMessage:
+        """The whole response; its tool_calls hold every call, including ones not reported by add."""
+        if self._message is None:
+            return AIMessage(content="")
+        return message_chunk_to_message(self._message)
+
+    def in_call_order(self, messages: list[ToolMessage]) -> list[ToolMessage]:
+        """Sort ToolMessages into the order the model made the calls, valid or not."""
+        return sorted(messages, key=lambda message: self._indexes.get(message.tool_call_id, len(self._indexes)))
+
+    def _complete(self, index: int) -> list[dict]:
+        call = self._pending.pop(index)
+        self._done.add(index)
+        if not call["name"] or not call["id"]:
+            return []  # left for the final message
+        try:
+            args = json.loads(call["args"] or "{}")
+        except json.JSONDecodeError:
+            return []  # left for the final message, which reports it as an invalid call
+        return [{"name": call["name"], "args": args, "id": call["id"], "type": "tool_call"}]
+
+    @staticmethod
+    def _is_complete(args: str) -> bool:
+        if not args.rstrip().endswith("}"):
+            return False
+        try:
+            json.loads(args)
+        except json.JSONDecodeError:
+            return False
+        return True
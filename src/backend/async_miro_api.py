@@ -0,0 +1,156 @@
+import asyncio
+import os
+import time
+import weakref
+from typing import Any, Dict, List, Optional
+
+import httpx
+from dotenv import load_dotenv
+
+from src.backend.miro_api import DEFAULT_TIMEOUT_SECONDS, MiroApiClient, MiroApiError
+from src.backend.utils.deadline import astaggered_race, remaining_time
+from src.backend.utils.tag_map import TagMap
+
+
+class AsyncMiroApiClient:
+    """Async client for the Miro REST API v2 calls on the agents' hot paths.
+
+    Mirrors the matching MiroApiClient methods, including the deadline-bounded timeouts and
+    the opt-in hedging of reads (MIRO_HEDGE_READS), which shares MiroApiClient's GET
+    latencies. Provisioning calls that only run once per board stay on MiroApiClient.
+
+    One httpx connection pool is kept per event loop; call aclose() when the loop is done.
+    """
+
+    def __init__(self) -> None:
+        load_dotenv()
+        board_id = os.environ.get("MIRO_BOARD_ID")
+        self.miro_api_token = os.environ.get("MIRO_API_TOKEN")
+        self.board_url = f"https://api.miro.com/v2/boards/{board_id}"
+        self.timeout_seconds = float(os.environ.get("MIRO_TIMEOUT_SECONDS", DEFAULT_TIMEOUT_SECONDS))
+        self.hedge_reads = os.environ.get("MIRO_HEDGE_READS", "0").lower() in ("1", "true", "yes")
+        self.max_concurrency = int(os.environ.get("MIRO_MAX_CONCURRENCY", "4"))
+        self._clients: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    def _get_client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None:
+            client = httpx.AsyncClient(headers={"Accept": "application/json",
+                                                "Authorization": f"Bearer {self.miro_api_token}"})
+            self._clients[loop] = client
+        return client
+
+    async def aclose(self):
+        client = self._clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
+    async def request(self, method: str, url: str, body: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        if method != "GET":
+            return await self._send(method, url, body)
+
+        started = time.perf_counter()
+        delay = MiroApiClient._read_latency.hedge_delay() if self.hedge_reads else None
+        if delay is None:
+            result = await self._send(method, url)
+        else:
+            # Reads are idempotent, so a duplicate is safe
+            send = lambda: self._send(method, url)
+            result = await astaggered_race([(0, send), (delay, send)])
+        MiroApiClient._read_latency.record(time.perf_counter() - started)
+        return result
+
+    async def _send(self, method: str, url: str, body: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        try:
+            response = await self._get_client().request(method, url, json=body,
+                                                        timeout=remaining_time(self.timeout_seconds))
+        except httpx.HTTPError as e:
+            raise MiroApiError(f"Network error: {e}") from e
+
+        if response.is_error:
+            raise MiroApiError(f"HTTP {response.status_code} {response.reason_phrase}: {response.text}")
+        return response.json() if response.content else {}
+
+    async def load_board(self, previous=None):
+        from src.backend.models.miro_board import MiroBoard
+        # Follow the cursor so the snapshot contains every item on the board
+        items = []
+        cursor = None
+        while True:
+            data = await self.request("GET", self._items_page_url(cursor))
+            raw_items, cursor = self._parse_items_page(data)
+            items.extend(raw_items)
+            if not cursor:
+                break
+
+        # Parsing, token counting and indexing are CPU work; keep them off the event loop
+        return await asyncio.to_thread(MiroBoard.create, items, previous)
+
+    async def create_sticky_note(self, content: str, x: int, y: int, shape: str = "square") -> Dict[str, Any]:
+        payload: Dict[str, Any] = {"data": {"content": content, "shape": shape}, "position": {"x": x, "y": y}}
+        return await self.request("POST", self._sticky_notes_url(), payload)
+
+    async def create_parented_sticky_note(self, parent_id: str, content: str, x: int, y: int):
+        note = await self.create_sticky_note(content, 10000, 10000)
+        url = f"{self._sticky_notes_url()}/{note.get('id')}"
+        payload: Dict[str, Any] = {"parent": {"id": parent_id}, "position": {"x": x, "y": y}}
+        return await self.request("PATCH", url, payload)
+
+    async def create_parented_sticky_notes(self, parent_id: str,
+                                           notes: List[tuple[str, int, int]]) -> List[Dict[str, Any]]:
+        """Create many parented sticky notes concurrently. notes holds (content, x, y) tuples;
+        the results come back in the same order."""
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def create(content, x, y):
+            async with semaphore:
+                return await self.create_parented_sticky_note(parent_id, content, x, y)
+
+        return await asyncio.gather(*(create(content, x, y) for content, x, y in notes))
+
+    async def create_parented_shape(
+        self,
+        parent_id: str,
+        content: str,
+        x: int,
+        y: int,
+        width: int = 1800,
+        height: int = 1800,
+        shape: str = "rectangle",
+        fill_color: str = "#FFFFFF",
+        text_align: str = "left",
+        font_size: int = 12,
+        border_color: str = "#E0E0E0",
+        border_width: int = 1,
+    ) -> Dict[str, Any]:
+        """Create a shape and parent it to a frame. See MiroApiClient.create_parented_shape."""
+        payload = MiroApiClient._shape_payload(content, shape, width, height, 10000, 10000, fill_color,
+                                               text_align, font_size, border_color, border_width)
+        shape_data = await self.request("POST", f"{self.board_url}/shapes", payload)
+
+        # Parent it to the frame and set the correct position
+        url = f"{self.board_url}/shapes/{shape_data.get('id')}"
+        payload = {"parent": {"id": parent_id}, "position": {"x": x + width / 2, "y": y + height / 2}}
+        return await self.request("PATCH", url, payload)
+
+    async def update_shape_content(self, shape_id: str, content: str):
+        return await self.request("PATCH", f"{self.board_url}/shapes/{shape_id}", {"data": {"content": content}})
+
+    async def delete_item(self, item_id: str):
+        """Delete an item from the board by its ID."""
+        result = await self.request("DELETE", f"{self._items_url()}/{item_id}")
+
+        # Keep the tags in step with the board; SQLite writes block, so not on the event loop
+        await asyncio.to_thread(TagMap().remove_items, [item_id])
+        return result
+
+    # URL building and page parsing are shared with the sync client
+    _items_page_url = MiroApiClient._items_page_url
+    _parse_items_page = staticmethod(MiroApiClient._parse_items_page)
+
+    def _items_url(self) -> str:
+        return f"{self.board_url}/items"
+
+    def _sticky_notes_url(self) -> str:
+        return f"{self.board_url}/sticky_notes"
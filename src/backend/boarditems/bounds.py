@@ -15,11 +15,27 @@ class Bounds:
         self.width = width
         self.height = height
 
+    @classmethod
+    def from_center(cls, x: float, y: float, width: float, height: float) -> "Bounds":
+        """Build bounds from a center point, which is how Miro reports item positions."""
+        return cls(x - width / 2, y - height / 2, width, height)
+
     def fix_x(self):
         return self.x + (self.width / 2)
 
     def fix_y(self):
         return self.y + (self.height / 2)
 
+    def right(self):
+        return self.x + self.width
+
+    def bottom(self):
+        return self.y + self.height
+
+    def intersects(self, other: "Bounds") -> bool:
+        """True if the two boxes overlap. Touching edges do not count as overlap."""
+        return (self.x < other.right() and other.x < self.right() and
+                self.y < other.bottom() and other.y < self.bottom())
+
     def position(self) -> dict:
         return {"x": self.fix_x(), "y": self.fix_y()}
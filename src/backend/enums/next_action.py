@@ -9,4 +9,5 @@ class NextAction(Enum):
     PREDICT_SEGMENTS = auto()
     PREDICT_CHANNELS = auto()
     REFRESH_PLAN = auto()
+    REFRESH_ALL = auto()
     NO_ACTION = auto()
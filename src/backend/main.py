@@ -1,3 +1,4 @@
+import asyncio
 import os
 from typing import Optional
 from dotenv import load_dotenv
@@ -10,7 +11,11 @@ def main() -> None:
     # Access token is validated inside MiroApiClient on first use
     poller = BoardPoller()
     try:
-        poller.run_forever()
+        # POLLER_ASYNC=1 runs the agents on an event loop instead of blocking on every call
+        if os.environ.get("POLLER_ASYNC", "0").lower() in ("1", "true", "yes"):
+            asyncio.run(poller.arun_forever())
+        else:
+            poller.run_forever()
     except KeyboardInterrupt:
         print("[main] Stopped by user")
 
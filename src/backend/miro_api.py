@@ -1,12 +1,16 @@
 import json
 import os
+import time
 import urllib.request
 import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
 from http.client import HTTPException
 from typing import Any, Dict, List, Optional
 
 from dotenv import load_dotenv
 
+from src.backend.utils.deadline import remaining_time, staggered_race, submit_in_context
+from src.backend.utils.latency import LatencyTracker
 from src.backend.utils.tag_map import TagMap
 
 
@@ -25,6 +29,10 @@ ALLOWED_STICKY_FILL_COLORS = {
 }
 # Allowed text alignment values for sticky notes
 ALLOWED_STICKY_TEXT_ALIGN = {"left", "center", "right"}
+# Largest page size the items endpoint accepts
+ITEMS_PAGE_SIZE = 50
+# Seconds a single request may take, before the poll cycle's deadline is applied
+DEFAULT_TIMEOUT_SECONDS = 30
 
 
 
@@ -32,13 +40,21 @@ class MiroApiClient:
     """Lightweight client for Miro REST API v2 using stdlib only.
 
     Requires MIRO_API_TOKEN (or MIRO_ACCESS_TOKEN/MIRO_TOKEN) in environment (Bearer token).
+
+    Every request is bounded by MIRO_TIMEOUT_SECONDS and by the current deadline (see
+    utils.deadline). With MIRO_HEDGE_READS=1, a GET that is still running after the p95 of
+    recent GET latencies is sent a second time and the first answer wins.
     """
+    _read_latency = LatencyTracker()
+    _hedge_executor = None
 
     def __init__(self) -> None:
         load_dotenv()
         board_id = os.environ.get("MIRO_BOARD_ID")
         self.miro_api_token = os.environ.get("MIRO_API_TOKEN")
         self.board_url = f"https://api.miro.com/v2/boards/{board_id}"
+        self.timeout_seconds = float(os.environ.get("MIRO_TIMEOUT_SECONDS", DEFAULT_TIMEOUT_SECONDS))
+        self.hedge_reads = os.environ.get("MIRO_HEDGE_READS", "0").lower() in ("1", "true", "yes")
 
     def change_sticky_note_color(self, id: str, fill_color: str):
         if not fill_color:
@@ -56,6 +72,15 @@ class MiroApiClient:
         payload: Dict[str, Any] = {"parent": {"id": parent_id}, "position": {"x": x, "y": y}}
         return self.request("PATCH", url, payload)
 
+    def create_parented_sticky_notes(self, parent_id: str, notes: List[tuple[str, int, int]],
+                                     max_workers: int = 4) -> List[Dict[str, Any]]:
+        """Create many parented sticky notes concurrently. notes holds (content, x, y) tuples;
+        the results come back in the same order."""
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="miro-bulk") as executor:
+            futures = [submit_in_context(executor, self.create_parented_sticky_note, parent_id, content, x, y)
+                       for content, x, y in notes]
+            return [future.result() for future in futures]
+
     def create_sticky_note(
         self,
         content: str,
@@ -217,7 +242,14 @@ class MiroApiClient:
             )
         """
         url = f"{self.board_url}/shapes"
-        payload: Dict[str, Any] = {
+        payload = self._shape_payload(content, shape, width, height, x, y, fill_color, text_align,
+                                      font_size, border_color, border_width)
+        return self.request("POST", url, payload)
+
+    @staticmethod
+    def _shape_payload(content: str, shape: str, width: int, height: int, x: int, y: int, fill_color: str,
+                       text_align: str, font_size: int, border_color: str, border_width: int) -> Dict[str, Any]:
+        return {
             "data": {
                 "content": content,
                 "shape": shape,
@@ -236,8 +268,6 @@ class MiroApiClient:
             "position": {"x": x, "y": y},
         }
 
-        return self.request("POST", url, payload)
-
     def create_frame(
         self,
         title: str = "",
@@ -297,6 +327,27 @@ class MiroApiClient:
         return result
 
     def request(self, method: str, url: str, body: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        if method != "GET":
+            return self._send(method, url, body)
+
+        started = time.perf_counter()
+        delay = self._read_latency.hedge_delay() if self.hedge_reads else None
+        if delay is None:
+            result = self._send(method, url)
+        else:
+            # Reads are idempotent, so a duplicate is safe
+            send = lambda: self._send(method, url)
+            result = staggered_race([(0, send), (delay, send)], self._get_hedge_executor())
+        self._read_latency.record(time.perf_counter() - started)
+        return result
+
+    @classmethod
+    def _get_hedge_executor(cls) -> ThreadPoolExecutor:
+        if cls._hedge_executor is None:
+            cls._hedge_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="miro-hedge")
+        return cls._hedge_executor
+
+    def _send(self, method: str, url: str, body: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         data = None
         if body is not None:
             data = json.dumps(body).encode("utf-8")
@@ -306,7 +357,7 @@ class MiroApiClient:
         if data is not None:
             req.add_header("Content-Type", "application/json")
         try:
-            with urllib.request.urlopen(req, timeout=30) as resp:
+            with urllib.request.urlopen(req, timeout=remaining_time(self.timeout_seconds)) as resp:
                 charset = resp.headers.get_content_charset() or "utf-8"
                 text = resp.read().decode(charset)
                 return json.loads(text) if text else {}
@@ -327,22 +378,40 @@ class MiroApiClient:
             allowed = ", ".join(sorted(ALLOWED_STICKY_FILL_COLORS))
             raise ValueError(f"Invalid fill_color '{fill_color}'. Allowed: {allowed}")
 
-    def load_board(self):
+    def load_board(self, previous=None):
 
         from src.backend.models.miro_board import MiroBoard
-        # Use shared client to perform request
-        data = self.request("GET", f"{self._items_url()}?limit=40")
-
-        if data is None:
-            # If we cannot verify, do not create
-            # Optional: print detail for debugging
-            try:
-                print('Miro items fetch failed:')
-            except Exception:
-                pass
-            return False
-
+        # Follow the cursor so the snapshot contains every item on the board
         items = []
+        cursor = None
+        while True:
+            data = self.request("GET", self._items_page_url(cursor))
+
+            if data is None:
+                # If we cannot verify, do not create
+                # Optional: print detail for debugging
+                try:
+                    print('Miro items fetch failed:')
+                except Exception:
+                    pass
+                return False
+
+            raw_items, cursor = self._parse_items_page(data)
+            items.extend(raw_items)
+            if not cursor:
+                break
+
+        return MiroBoard.create(items, previous)
+
+    def _items_page_url(self, cursor: Optional[str]) -> str:
+        url = f"{self._items_url()}?limit={ITEMS_PAGE_SIZE}"
+        if cursor:
+            url += f"&cursor={urllib.parse.quote(cursor)}"
+        return url
+
+    @staticmethod
+    def _parse_items_page(data) -> tuple[list, Optional[str]]:
+        """Returns (raw items, cursor of the next page or None)."""
         if not isinstance(data, dict):
             raise HTTPException("data is not a Dictionary")
 
@@ -350,17 +419,26 @@ class MiroApiClient:
         if not isinstance(raw_items, list):
             raise HTTPException("raw items should be a list")
 
-        return MiroBoard.create(raw_items)
+        return raw_items, data.get('cursor')
 
     def update_text_item(self, text_item_id: str, content: str):
         url = f"{self.board_url}/texts/{text_item_id}"
         payload = {"data": {"content": content}}
         return self.request("PATCH", url, payload)
 
+    def update_shape_content(self, shape_id: str, content: str):
+        url = f"{self.board_url}/shapes/{shape_id}"
+        payload = {"data": {"content": content}}
+        return self.request("PATCH", url, payload)
+
     def delete_item(self, item_id: str):
         """Delete an item from the board by its ID."""
         url = f"{self._items_url()}/{item_id}"
-        return self.request("DELETE", url)
+        result = self.request("DELETE", url)
+
+        # Keep the tags in step with the board
+        TagMap().remove_items([item_id])
+        return result
 
     def create_parented_shape(
         self,
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from src.backend.enums.item_type import ItemType
+
+if TYPE_CHECKING:
+    from src.backend.models.miro_board import MiroBoard
+
+
+@dataclass
+class BoardGeometry:
+    """
+    Columnar (structure-of-arrays) view of the geometry of a MiroBoard.
+
+    Positions are Miro's: the center of the item, relative to the parent's top-left corner
+    for children and to the canvas center for root items. Row i of every array describes
+    the item ids[i]; parent holds the row of the parent item, or -1 for root items.
+    """
+    ids: list[str]
+    rows: dict[str, int]
+    x: np.ndarray
+    y: np.ndarray
+    width: np.ndarray
+    height: np.ndarray
+    parent: np.ndarray
+    is_frame: np.ndarray
+
+    @classmethod
+    def from_board(cls, board: MiroBoard) -> "BoardGeometry":
+        items = list(board.items.values())
+        count = len(items)
+        ids = [item.id for item in items]
+        rows = {item_id: row for row, item_id in enumerate(ids)}
+
+        x = np.fromiter((item.position.x for item in items), dtype=np.float64, count=count)
+        y = np.fromiter((item.position.y for item in items), dtype=np.float64, count=count)
+        width = np.fromiter((item.geometry.width for item in items), dtype=np.float64, count=count)
+        height = np.fromiter((item.geometry.height for item in items), dtype=np.float64, count=count)
+        parent = np.fromiter((rows.get(item.parent_id, -1) for item in items), dtype=np.int64, count=count)
+        is_frame = np.fromiter((item.type == ItemType.FRAME for item in items), dtype=bool, count=count)
+
+        return cls(ids=ids, rows=rows, x=x, y=y, width=width, height=height,
+                   parent=parent, is_frame=is_frame)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def absolute_positions(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Resolve every item's center to canvas coordinates.
+
+        A child's absolute center is its parent's top-left corner plus its own relative
+        position, so each item contributes a local offset and the absolute position is the
+        sum of offsets up the parent chain. The sums are computed with pointer jumping:
+        every pass doubles the distance each row has looked up its chain, so the whole board
+        resolves in O(log depth) vectorized passes.
+        """
+        has_parent = self.parent >= 0
+        parent_rows = np.where(has_parent, self.parent, 0)
+
+        offset_x = self.x.copy()
+        offset_y = self.y.copy()
+        offset_x[has_parent] -= self.width[parent_rows[has_parent]] / 2
+        offset_y[has_parent] -= self.height[parent_rows[has_parent]] / 2
+
+        ancestor = self.parent.copy()
+        while True:
+            pending = ancestor >= 0
+            if not pending.any():
+                break
+            targets = ancestor[pending]
+            offset_x[pending] += offset_x[targets]
+            offset_y[pending] += offset_y[targets]
+            ancestor[pending] = ancestor[targets]
+
+        return offset_x, offset_y
+
+    def absolute_bounds(self) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Return (left, top, right, bottom) of every item in canvas coordinates."""
+        center_x, center_y = self.absolute_positions()
+        half_width = self.width / 2
+        half_height = self.height / 2
+        return center_x - half_width, center_y - half_height, center_x + half_width, center_y + half_height
+
+    def frame_bounds(self) -> dict[str, tuple[float, float, float, float]]:
+        """
+        Bounding box (left, top, right, bottom) of the direct children of every frame,
+        in canvas coordinates. Frames without children are left out.
+        """
+        left, top, right, bottom = self.absolute_bounds()
+        children = self.parent >= 0
+        parents = self.parent[children]
+
+        count = len(self)
+        min_x = np.full(count, np.inf)
+        min_y = np.full(count, np.inf)
+        max_x = np.full(count, -np.inf)
+        max_y = np.full(count, -np.inf)
+        np.minimum.at(min_x, parents, left[children])
+        np.minimum.at(min_y, parents, top[children])
+        np.maximum.at(max_x, parents, right[children])
+        np.maximum.at(max_y, parents, bottom[children])
+
+        frames = np.flatnonzero(self.is_frame & np.isfinite(min_x))
+        return {self.ids[row]: (float(min_x[row]), float(min_y[row]), float(max_x[row]), float(max_y[row]))
+                for row in frames}
+
+    def find_overlaps(self, parent_id: str | None = None) -> list[tuple[str, str]]:
+        """
+        Return pairs of items whose bounding boxes overlap.
+
+        With parent_id, only the direct children of that item are compared; otherwise all
+        items are. Uses sort-and-sweep on the x axis so only boxes that overlap horizontally
+        are ever compared on y.
+        """
+        left, top, right, bottom = self.absolute_bounds()
+        if parent_id is None:
+            rows = np.arange(len(self))
+        else:
+            rows = np.flatnonzero(self.parent == self.rows[parent_id])
+
+        rows = rows[np.argsort(left[rows], kind="stable")]
+        sorted_left = left[rows]
+
+        # For each box, every later box starting before its right edge overlaps it on x
+        ends = np.searchsorted(sorted_left, right[rows], side="left")
+        starts = np.arange(len(rows)) + 1
+        counts = np.maximum(ends - starts, 0)
+
+        first = np.repeat(np.arange(len(rows)), counts)
+        second = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+        first, second = rows[first], rows[second]
+
+        overlap = (top[first] < bottom[second]) & (top[second] < bottom[first])
+        return [(self.ids[a], self.ids[b]) for a, b in zip(first[overlap], second[overlap])]
@@ -0,0 +1,58 @@
+from types import MappingProxyType
+from typing import Any, Mapping
+
+from src.backend.models.miro_actor import MiroActor
+
+
+class ItemInterner:
+    """
+    Deduplicates values that repeat across the items of one board while it is parsed.
+
+    Equal strings are collapsed to a single object, actors and style dicts with the same
+    contents are shared between items, and links are split into a shared prefix plus the
+    item id. The shared objects are read-only by convention (styles are wrapped in a
+    read-only mapping), so never mutate them in place.
+    """
+
+    def __init__(self):
+        self._strings: dict[str, str] = {}
+        self._actors: dict[tuple, MiroActor] = {}
+        self._styles: dict[tuple, Mapping[str, Any]] = {}
+
+    def string(self, value: str | None) -> str | None:
+        if not isinstance(value, str):
+            return value
+        return self._strings.setdefault(value, value)
+
+    def actor(self, raw_data: dict) -> MiroActor:
+        key = (raw_data.get("id"), raw_data.get("type"))
+        actor = self._actors.get(key)
+        if actor is None:
+            actor = MiroActor(raw_data)
+            actor.id = self.string(actor.id)
+            actor.type = self.string(actor.type)
+            self._actors[key] = actor
+        return actor
+
+    def style(self, raw_style: dict) -> Mapping[str, Any]:
+        try:
+            key = tuple(sorted(raw_style.items()))
+            hash(key)
+        except TypeError:
+            # Nested values cannot be keyed; keep the item's own (read-only) copy
+            return MappingProxyType(dict(raw_style))
+
+        style = self._styles.get(key)
+        if style is None:
+            style = MappingProxyType({self.string(k): self.string(v) for k, v in raw_style.items()})
+            self._styles[key] = style
+        return style
+
+    def link(self, url: str, item_id: str) -> tuple[str, str]:
+        """
+        Split a link into (prefix, suffix). When the link ends with the item id, which is how
+        Miro builds them, the suffix is the already-interned id and only the prefix is stored.
+        """
+        if item_id and url.endswith(item_id):
+            return self.string(url[:-len(item_id)]), item_id
+        return self.string(url), ""
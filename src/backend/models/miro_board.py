@@ -1,23 +1,27 @@
-import json
+import asyncio
 from dataclasses import dataclass, field
 
 from src.backend.enums.item_type import ItemType
 from src.backend.miro_api import MiroApiClient
+from src.backend.models.board_geometry import BoardGeometry
+from src.backend.models.item_interner import ItemInterner
 from src.backend.models.miro_item import MiroItem
 from src.backend.utils.tag_map import TagMap
+from src.backend.utils.text_index import TextIndex
 
 
 @dataclass
 class MiroBoard:
     items: dict[str, MiroItem] = field(default_factory=dict)
     root_items: list[MiroItem] = field(default_factory=list)
+    text_index: TextIndex = field(default_factory=TextIndex)
 
-    def clear_user_responses(self):
-        """Clear the content of all shapes on the board."""
+    def clear_user_responses(self, chat_frames: list[MiroItem] | None = None):
+        """Clear the reply shapes of the given chat frames, or of every chat frame."""
         api = MiroApiClient()
 
         # Clear content for each chat shape
-        for shape in self.get_chat_shapes():
+        for shape in self.get_chat_shapes(chat_frames):
             if not shape.data.content:
                 continue
 
@@ -33,9 +37,24 @@ class MiroBoard:
                 print(f"Cleared content for shape {shape_id}")
             except Exception as e:
                 print(f"Error clearing shape {shape_id}: {e}")
-                
+
+    async def aclear_user_responses(self, api, chat_frames: list[MiroItem] | None = None):
+        """Async version of clear_user_responses, clearing the shapes concurrently. api is an AsyncMiroApiClient."""
+        async def clear(shape_id):
+            try:
+                await api.update_shape_content(shape_id, "")
+                print(f"Cleared content for shape {shape_id}")
+            except Exception as e:
+                print(f"Error clearing shape {shape_id}: {e}")
+
+        await asyncio.gather(*(clear(shape.id) for shape in self.get_chat_shapes(chat_frames) if shape.data.content))
+
     def has_changes_made_note(self):
-        return any(item.contains_text("changes made") for item in self.items.values())
+        return self.text_index.contains_phrase("changes made")
+
+    def find_items_with_text(self, text: str) -> list[MiroItem]:
+        """Items whose plain text contains the text as a phrase (case-insensitive)."""
+        return [self.items[item_id] for item_id in self.text_index.search_phrase(text)]
 
     def is_empty(self):
         return len(self.items) == 0
@@ -59,6 +78,22 @@ class MiroBoard:
         if frame:
             api.create_parented_sticky_note(frame.id, content, x, y)
 
+    def add_sticky_notes(self, frame: MiroItem, contents: list[str]):
+        """Reserve a free slot in the frame for every content, then create the stickies concurrently."""
+        if not contents:
+            return []
+        positions = frame.get_next_available_sticky_positions(len(contents))
+        notes = [(content, point.x, point.y) for content, point in zip(contents, positions)]
+        return MiroApiClient().create_parented_sticky_notes(frame.id, notes)
+
+    async def aadd_sticky_notes(self, api, frame: MiroItem, contents: list[str]):
+        """Async version of add_sticky_notes. api is an AsyncMiroApiClient."""
+        if not contents:
+            return []
+        positions = frame.get_next_available_sticky_positions(len(contents))
+        notes = [(content, point.x, point.y) for content, point in zip(contents, positions)]
+        return await api.create_parented_sticky_notes(frame.id, notes)
+
     def set_agent_prompt(self, chat_frame_tag: str, prompt: str):
         api = MiroApiClient()
         frame = self.get_frame_by_tag(chat_frame_tag)
@@ -93,20 +128,39 @@ class MiroBoard:
                     parent.children.append(item.id)
 
         # Populate the tags
-        tags = TagMap().get_map()
-        for tag, item_ids in tags.items():
-            for item_id in item_ids:
-                item = self.get(item_id)
-                if item:
-                    item.tags.add(tag)
+        tags_by_item = TagMap().get_item_tags_map()
+        for item in self.items.values():
+            item.tags = set(tags_by_item.get(item.id, ()))
+
+    def prune_stale_tags(self, snapshot_started: float) -> list[str]:
+        """
+        Drop the tag mappings of items that no longer exist. The board must be a complete
+        snapshot whose loading began at snapshot_started (a time.time() value).
+        """
+        pruned = TagMap().prune(self.items.keys(), snapshot_started)
+        if pruned:
+            print(f"[miro_board] Pruned tags of {len(pruned)} deleted items")
+        return pruned
 
     def get(self, item_id: str) -> MiroItem | None:
         return self.items.get(item_id)
 
+    def to_geometry(self) -> BoardGeometry:
+        """Columnar numpy view of the item positions and sizes, for geometry work on large boards."""
+        return BoardGeometry.from_board(self)
+
     @classmethod
-    def create(cls, raw_items) -> "MiroBoard":
-        board = cls()
-        item_list = [MiroItem(item, board) for item in raw_items]
+    def create(cls, raw_items, previous: "MiroBoard | None" = None) -> "MiroBoard":
+        """
+        Build a board from raw Miro items.
+        If a previous board is given, the new board starts from a copy-on-write fork of its
+        text index, so only the items whose content changed are re-indexed and the previous
+        board keeps answering searches for its own snapshot.
+        """
+        board = cls(text_index=previous.text_index.fork()) if previous else cls()
+        # One interner per board, so repeated strings, actors and styles are stored once
+        interner = ItemInterner()
+        item_list = [MiroItem(item, board, interner) for item in raw_items]
         items = {item.id: item for item in item_list}
 
         board.set_items(items)
@@ -120,22 +174,29 @@ class MiroBoard:
 
         return map
 
-    def chat_to_text(self, chat: dict) -> str:
-        result = ''
-        children = chat['children']
-        result = f"{children[0]['data']['content']}\nUser: {children[2]['data']['content']}"
-        return result
+    def get_chat_reply_shape(self, chat_frame: MiroItem) -> MiroItem | None:
+        """The shape the user types their reply into."""
+        for child in chat_frame.get_children():
+            if child and child.type == ItemType.SHAPE:
+                return child
+        return None
+
+    def get_chat_reply(self, chat_frame: MiroItem) -> str:
+        """Plain text of the user's reply in a chat frame, or an empty string."""
+        shape = self.get_chat_reply_shape(chat_frame)
+        return shape.get_plain_text() if shape else ""
+
+    def chat_to_text(self, chat: MiroItem) -> str:
+        children = chat.get_children()
+        return f"{children[0].get_plain_text()}\nUser: {children[2].get_plain_text()}"
 
     def is_set_up(self) -> bool:
         return len(self.root_items) > 1
 
-    def to_json_for_llm(self) -> str:
-        map = {}
-        chats: dict = self.chats_to_dict()
-        for k,v in chats.items():
-            map[k] = self.chat_to_text(v)
-
-        return json.dumps(map, ensure_ascii=False, indent=2)
+    def get_chat_entries(self, chat_frames: list[MiroItem] | None = None) -> list[str]:
+        """One plain-text entry per chat frame, prefixed with its tags, for a PromptSection."""
+        return [f"[{chat.tags_to_str()}] {self.chat_to_text(chat)}"
+                for chat in (chat_frames if chat_frames is not None else self.get_chat_frames())]
 
     def get_chat_frames(self) -> list[MiroItem]:
         frames = []
@@ -145,6 +206,26 @@ class MiroBoard:
 
         return frames
 
+    def get_answered_chat_frames(self) -> list[MiroItem]:
+        """Chat frames with a reply waiting. Replies are cleared once handled, so these are the changed chats."""
+        return [chat for chat in self.get_chat_frames() if self.get_chat_reply(chat)]
+
+    def get_changed_chat_frames(self, previous: "MiroBoard | None") -> list[MiroItem]:
+        """Chat frames that are new since the previous board or whose prompt or reply changed."""
+        if previous is None:
+            return self.get_chat_frames()
+
+        changed = []
+        for chat in self.get_chat_frames():
+            old = previous.items.get(chat.id)
+            if old is None or previous.chat_to_text(old) != self.chat_to_text(chat):
+                changed.append(chat)
+        return changed
+
+    def get_frame_tags(self) -> list[str]:
+        """Sorted tags of every frame, a compact outline of what is on the board."""
+        return sorted({tag for frame in self.get_frames() for tag in frame.tags})
+
     def get_chat_agent_prompt_id(self, chat_frame: MiroItem) -> str | None:
         return chat_frame.get_children()[0].id
 
@@ -159,6 +240,7 @@ class MiroBoard:
     def set_items(self, items):
         self.items = items
         self.populate_relationships()
+        self.text_index.sync({item_id: item.get_content() for item_id, item in items.items()})
 
     def __eq__(self, other):
         """Compare boards based on their items."""
@@ -188,10 +270,10 @@ class MiroBoard:
     def get_summary_frame(self):
         return self.get_frame_by_tag('Summary')
 
-    def get_chat_shapes(self):
-        """Get all shapes that are children of chat frames."""
+    def get_chat_shapes(self, chat_frames: list[MiroItem] | None = None):
+        """Get all shapes that are children of the given chat frames, or of every chat frame."""
         shapes = []
-        for frame in self.get_chat_frames():
+        for frame in chat_frames if chat_frames is not None else self.get_chat_frames():
             for child in frame.get_children():
                 if child.type == ItemType.SHAPE:
                     shapes.append(child)
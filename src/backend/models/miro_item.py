@@ -4,33 +4,41 @@ import json
 from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
-import random
-from typing import TYPE_CHECKING
+import threading
+from typing import TYPE_CHECKING, Any, Mapping
 
 from prompt_toolkit.data_structures import Point
 
+from src.backend.boarditems.bounds import Bounds
 from src.backend.enums.item_type import ItemType
 from src.backend.models.item_data import ItemData
 from src.backend.models.item_geometry import ItemGeometry
 from src.backend.models.item_id_and_link import ItemIdAndLink, ItemIdType
+from src.backend.models.item_interner import ItemInterner
 from src.backend.models.item_links import ItemLinks
 from src.backend.models.item_position import ItemPosition
 from src.backend.models.miro_actor import MiroActor
 from src.backend.utils.miro_utils import to_datetime
+from src.backend.utils.text_normalizer import PlainText, to_plain_text, tokenize
+from src.backend.utils.spatial_index import SpatialIndex, SlotAllocator, STICKY_WIDTH, STICKY_HEIGHT
 
 if TYPE_CHECKING:
     from src.backend.models.miro_board import MiroBoard
 
+# Stickies are placed below the chat frame that sits at the top of each section frame
+STICKY_AREA_TOP = 450
+STICKY_AREA_MARGIN = 50
+# Guards the lazy allocator build, since concurrent tool calls place stickies in parallel
+_allocator_lock = threading.Lock()
+
 
 @dataclass
 class MiroItem:
     id: str
-    link: str
     parent_id: str
-    parent_link: str
     type: ItemType
     data: ItemData
-    style: dict
+    style: Mapping[str, Any]
     geometry: ItemGeometry
     position: ItemPosition
     created_at: datetime | None
@@ -41,41 +49,74 @@ class MiroItem:
     tags: set[str]
     board: MiroBoard
 
-    def __init__(self, raw_item: dict, board: MiroBoard):
-        self.parse_raw_item(raw_item)
+    def __init__(self, raw_item: dict, board: MiroBoard, interner: ItemInterner | None = None):
+        self.parse_raw_item(raw_item, interner or ItemInterner())
         self.board = board
+        self._slot_allocator = None
+        self._plain_text: PlainText | None = None
+        self._plain_text_source: str | None = None
 
     def contains_text(self, text):
-        content = self.get_content()
-        if not content or not text:
+        """True if the item's plain text contains the text as a phrase (case-insensitive)."""
+        if not self.get_content() or not text:
             return False
 
-        return text.lower() in content.lower()
+        if self.board is None:
+            # Detached items have no index; match the same whole-token phrase directly
+            phrase = " ".join(tokenize(text))
+            return bool(phrase) and f" {phrase} " in f" {' '.join(tokenize(self.get_plain_text()))} "
+        return self.board.text_index.contains_phrase(text, self.id)
 
     def get_content(self):
         return self.data.content
 
-    def parse_raw_item(self, raw_item):
+    def get_plain_text(self) -> str:
+        """The content without markup; this is what should be sent to the LLM."""
+        return self._get_normalized_content().text
+
+    def get_token_count(self) -> int:
+        return self._get_normalized_content().token_count
+
+    def _get_normalized_content(self) -> PlainText:
+        content = self.get_content()
+        if self._plain_text is None or self._plain_text_source is not content:
+            self._plain_text = to_plain_text(content)
+            self._plain_text_source = content
+        return self._plain_text
+
+    def parse_raw_item(self, raw_item, interner: ItemInterner):
 
         id_and_link = ItemIdAndLink(raw_item, ItemIdType.SELF)
-        self.id = id_and_link.id
-        self.link = id_and_link.link
+        self.id = interner.string(id_and_link.id)
+        self._link_prefix, self._link_suffix = interner.link(id_and_link.link, self.id)
 
         id_and_link = ItemIdAndLink(raw_item, ItemIdType.PARENT)
-        self.parent_id = id_and_link.id
-        self.parent_link = id_and_link.link
+        self.parent_id = interner.string(id_and_link.id)
+        self._parent_link_prefix, self._parent_link_suffix = interner.link(id_and_link.link, self.parent_id)
 
         self.type = ItemType.from_string(raw_item.get('type') or '')
         self.data = ItemData(raw_item.get('data') or {})
-        self.style = raw_item.get('style') or {}
+        self.data.format = interner.string(self.data.format)
+        self.data.type = interner.string(self.data.type)
+        self.style = interner.style(raw_item.get('style') or {})
         self.geometry = ItemGeometry(raw_item.get('geometry') or {})
         self.position = ItemPosition(raw_item.get('position') or {})
+        self.position.origin = interner.string(self.position.origin)
+        self.position.relative_to = interner.string(self.position.relative_to)
         self.created_at = to_datetime(raw_item.get('createdAt') or '')
-        self.created_by = MiroActor(raw_item.get('createdBy') or {})
+        self.created_by = interner.actor(raw_item.get('createdBy') or {})
         self.modified_at = to_datetime(raw_item.get('modifiedAt') or '')
-        self.modified_by = MiroActor(raw_item.get('modifiedBy') or {})
+        self.modified_by = interner.actor(raw_item.get('modifiedBy') or {})
         self.tags = set()
 
+    @property
+    def link(self) -> str:
+        return self._link_prefix + self._link_suffix
+
+    @property
+    def parent_link(self) -> str:
+        return self._parent_link_prefix + self._parent_link_suffix
+
     def tags_to_str(self):
         if not self.tags:
             return ""
@@ -116,17 +157,73 @@ class MiroItem:
     def is_chat(self):
         return any("chat" in tag.lower() for tag in self.tags)
 
+    def get_bounds(self) -> Bounds:
+        """Bounding box of the item. For children this is relative to the parent's top-left corner."""
+        width = self.geometry.width
+        height = self.geometry.height
+        if self.type == ItemType.STICKY_NOTE:
+            # Miro sometimes omits the geometry of stickies; fall back to the default size
+            width = width or STICKY_WIDTH
+            height = height or STICKY_HEIGHT
+        return Bounds.from_center(self.position.x, self.position.y, width, height)
+
+    def build_spatial_index(self) -> SpatialIndex:
+        """Index the bounding boxes of this item's children, in frame-relative coordinates."""
+        index = SpatialIndex()
+        for child in self.get_children():
+            if child:
+                index.insert(child.id, child.get_bounds())
+        return index
+
+    def get_slot_allocator(self) -> SlotAllocator:
+        """
+        The allocator is built once per item from the current children and then remembers
+        every slot it hands out, so consecutive placements never overlap each other.
+        """
+        if self._slot_allocator is not None:
+            return self._slot_allocator
+
+        with _allocator_lock:
+            if self._slot_allocator is not None:
+                return self._slot_allocator
+            width = self.geometry.width or 1000
+            height = self.geometry.height or 2000
+            area = Bounds(STICKY_AREA_MARGIN, STICKY_AREA_TOP,
+                          width - 2 * STICKY_AREA_MARGIN, height - STICKY_AREA_TOP - STICKY_AREA_MARGIN)
+            self._slot_allocator = SlotAllocator(self.build_spatial_index(), area)
+            return self._slot_allocator
+
     # Look through the positions of the child stickies and find the next available position
     def get_next_available_sticky_position(self) -> Point:
-        x = random.randint(200, 1000)
-        y = random.randint(700,1500)
-        return Point(x, y)
+        positions = self.get_next_available_sticky_positions(1)
+        return positions[0]
+
+    def get_next_available_sticky_positions(self, count: int) -> list[Point]:
+        """
+        Reserve positions for `count` new stickies in a single pass over the free slots.
+        When the frame is full, the sticky area grows downward below its bottom edge.
+        """
+        allocator = self.get_slot_allocator()
+        slots = allocator.take(count)
+        if len(slots) < count:
+            print(f"[miro_item] No free sticky slot left in {self.id}, "
+                  f"placing {count - len(slots)} sticky note(s) below the frame")
+        while len(slots) < count:
+            missing = count - len(slots)
+            allocator.grow(-(-missing // allocator.columns))
+            slots += allocator.take(missing)
+
+        return [Point(int(slot.fix_x()), int(slot.fix_y())) for slot in slots]
 
     def dump_sticky_notes(self) -> str:
         notes = self.get_sticky_notes()
-        notes_map = {note.id: note.get_content() for note in notes}
+        notes_map = {note.id: note.get_plain_text() for note in notes}
         result = json.dumps(notes_map)
         return result
 
+    def get_sticky_note_texts(self) -> list[str]:
+        """Plain text of every non-empty child sticky note, in board order."""
+        return [text for text in (note.get_plain_text() for note in self.get_sticky_notes()) if text]
+
     def get_sticky_notes(self):
         return [item for item in self.get_children() if item.type == ItemType.STICKY_NOTE]
@@ -0,0 +1,7 @@
+from pydantic import BaseModel
+
+from src.backend.models.plan.channel import Channel
+
+
+class ChannelList(BaseModel):
+    channels: list[Channel]
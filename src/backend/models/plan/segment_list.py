@@ -0,0 +1,7 @@
+from pydantic import BaseModel
+
+from src.backend.models.plan.segment import Segment
+
+
+class SegmentList(BaseModel):
+    segments: list[Segment]
@@ -0,0 +1,7 @@
+from pydantic import BaseModel
+
+from src.backend.models.plan.suggestion import Suggestion
+
+
+class SuggestionList(BaseModel):
+    suggestions: list[Suggestion]
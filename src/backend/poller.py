@@ -1,3 +1,4 @@
+import asyncio
 import os
 import time
 from http.client import HTTPException
@@ -10,6 +11,7 @@ from .manager.board_manager import BoardManager
 from .miro_api import MiroApiClient
 from .models.miro_board import MiroBoard
 from src.backend.enums.next_action import NextAction
+from src.backend.utils.deadline import deadline_scope
 
 
 class BoardPoller:
@@ -17,6 +19,8 @@ class BoardPoller:
         load_dotenv()
         self.board_id = os.environ.get("MIRO_BOARD_ID")
         self.interval_seconds = int(os.environ.get("INTERVAL_SECONDS", "5"))
+        # Every Miro and LLM call of one cycle has to finish within this many seconds
+        self.cycle_deadline_seconds = float(os.environ.get("CYCLE_DEADLINE_SECONDS", "300"))
         self.miro_api_token = os.environ.get("MIRO_API_TOKEN")
         # Initialize API client
         self.api = MiroApiClient()
@@ -27,11 +31,41 @@ class BoardPoller:
 
     def poll_once(self) -> bool:
         """Perform a single poll cycle. Returns True if a change was detected and handled."""
+        with deadline_scope(self.cycle_deadline_seconds):
+            return self._poll_cycle()
+
+    def _poll_cycle(self) -> bool:
+        snapshot_started = time.time()
+        new_board = self.api.load_board(self.current_board)
+        new_board.prune_stale_tags(snapshot_started)
         state: AgentState = \
-            self.plan_builder_agent.invoke(self.current_board, self.api.load_board())
-        action: NextAction = state.get("next_action")
+            self.plan_builder_agent.invoke(self.current_board, new_board)
+        actions: list[NextAction] = state.get("next_actions") or []
         self.current_board = state.get("current_board")
-        return action != NextAction.NO_ACTION
+        self.plan_builder_agent.speculator.observe(self.current_board)
+        return any(action != NextAction.NO_ACTION for action in actions)
+
+    async def apoll_once(self) -> bool:
+        """Async version of poll_once, for running many boards' pollers on one event loop."""
+        with deadline_scope(self.cycle_deadline_seconds):
+            snapshot_started = time.time()
+            new_board = await self.plan_builder_agent.async_api.load_board(self.current_board)
+            await asyncio.to_thread(new_board.prune_stale_tags, snapshot_started)
+            state: AgentState = await self.plan_builder_agent.ainvoke(self.current_board, new_board)
+            actions: list[NextAction] = state.get("next_actions") or []
+            self.current_board = state.get("current_board")
+            self.plan_builder_agent.speculator.observe(self.current_board)
+            return any(action != NextAction.NO_ACTION for action in actions)
+
+    async def arun_forever(self) -> None:
+        print(f"[poller] Starting async poller for board {self.board_id} every {self.interval_seconds}s")
+        while True:
+            try:
+                changed = await self.apoll_once()
+                print(f"[poller] cycle done: changed={changed}")
+            except Exception as e:  # noqa: BLE001
+                print(f"[poller] unexpected error: {e}")
+            await asyncio.sleep(self.interval_seconds)
 
     def run_forever(self) -> None:
         print(f"[poller] Starting poller for board {self.board_id} every {self.interval_seconds}s")
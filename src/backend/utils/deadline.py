@@ -0,0 +1,154 @@
+import asyncio
+import contextvars
+import time
+from concurrent.futures import FIRST_COMPLETED, Executor, wait
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Awaitable, Callable, TypeVar
+
+T = TypeVar("T")
+
+_current_deadline = contextvars.ContextVar("deadline", default=None)
+
+
+class DeadlineExceeded(TimeoutError):
+    pass
+
+
+@dataclass(frozen=True)
+class Deadline:
+    expires_at: float  # time.monotonic() value
+
+    @classmethod
+    def after(cls, seconds: float) -> "Deadline":
+        return cls(time.monotonic() + seconds)
+
+    def remaining(self) -> float:
+        return self.expires_at - time.monotonic()
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+
+@contextmanager
+def deadline_scope(seconds: float | None):
+    """
+    Bound everything called inside the block (in this context) by a deadline.
+    A nested scope can only shorten the deadline, never extend it.
+    """
+    if seconds is None:
+        yield current_deadline()
+        return
+
+    deadline = Deadline.after(seconds)
+    outer = current_deadline()
+    if outer is not None and outer.expires_at < deadline.expires_at:
+        deadline = outer
+
+    token = _current_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current_deadline.reset(token)
+
+
+def current_deadline() -> Deadline | None:
+    return _current_deadline.get()
+
+
+def remaining_time(default: float | None = None) -> float | None:
+    """
+    Seconds left for a call: the smaller of its own timeout (default) and what is left of
+    the current deadline. Raises DeadlineExceeded if the deadline has already passed.
+    """
+    deadline = current_deadline()
+    if deadline is None:
+        return default
+
+    remaining = deadline.remaining()
+    if remaining <= 0:
+        raise DeadlineExceeded("Deadline exceeded")
+    return remaining if default is None else min(default, remaining)
+
+
+def submit_in_context(executor: Executor, fn: Callable[..., T], *args):
+    """Submit to an executor with the caller's context, so the deadline follows the call."""
+    return executor.submit(contextvars.copy_context().run, fn, *args)
+
+
+def staggered_race(attempts: list[tuple[float, Callable[[], T]]], executor: Executor) -> T:
+    """
+    Run attempts that each start after their delay (seconds), unless an earlier attempt
+    has already succeeded, and return the first successful result. When every running
+    attempt has failed, the next one starts right away instead of waiting for its delay.
+
+    This is the building block for request hedging and slow-model fallbacks. Waiting is
+    bounded by the current deadline; losing attempts are left to finish in the background.
+    """
+    schedule = sorted(attempts, key=lambda attempt: attempt[0])
+    started = time.monotonic()
+    pending = set()
+    error = None
+
+    while schedule or pending:
+        remaining_time()  # raises once the deadline has passed
+
+        # Launch every attempt that is due, or the next one if nothing is running
+        while schedule and (not pending or time.monotonic() - started >= schedule[0][0]):
+            _, fn = schedule.pop(0)
+            pending.add(submit_in_context(executor, fn))
+
+        # Wait until something finishes or the next attempt is due, within the deadline
+        timeout = max(schedule[0][0] - (time.monotonic() - started), 0) if schedule else None
+        done, pending = wait(pending, timeout=remaining_time(timeout), return_when=FIRST_COMPLETED)
+
+        for future in done:
+            if future.exception() is None:
+                return future.result()
+            error = future.exception()
+
+        if not done and not schedule:
+            # Nothing left to launch and we stopped waiting early: the deadline passed
+            raise DeadlineExceeded("Deadline exceeded")
+
+    raise error
+
+
+async def astaggered_race(attempts: list[tuple[float, Callable[[], Awaitable[T]]]]) -> T:
+    """
+    Async version of staggered_race. Each attempt is a coroutine factory; the attempts that
+    lose the race are cancelled rather than left running.
+    """
+    schedule = sorted(attempts, key=lambda attempt: attempt[0])
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    pending = set()
+    error = None
+
+    try:
+        while schedule or pending:
+            remaining_time()  # raises once the deadline has passed
+
+            # Launch every attempt that is due, or the next one if nothing is running
+            while schedule and (not pending or loop.time() - started >= schedule[0][0]):
+                _, factory = schedule.pop(0)
+                pending.add(asyncio.ensure_future(factory()))
+
+            # Wait until something finishes or the next attempt is due, within the deadline
+            timeout = max(schedule[0][0] - (loop.time() - started), 0) if schedule else None
+            done, pending = await asyncio.wait(pending, timeout=remaining_time(timeout),
+                                               return_when=asyncio.FIRST_COMPLETED)
+
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                error = task.exception()
+
+            if not done and not schedule:
+                # Nothing left to launch and we stopped waiting early: the deadline passed
+                raise DeadlineExceeded("Deadline exceeded")
+
+        raise error
+    finally:
+        for task in pending:
+            task.cancel()
@@ -0,0 +1,40 @@
+import math
+import threading
+from collections import deque
+
+
+class LatencyTracker:
+    """Rolling window of call latencies (in seconds) with percentile lookups."""
+
+    def __init__(self, window: int = 200):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total = 0.0
+
+    def record(self, seconds: float):
+        with self._lock:
+            self._samples.append(seconds)
+            self.count += 1
+            self.total += seconds
+
+    def percentile(self, p: float) -> float | None:
+        """Nearest-rank percentile (0-100) over the window, or None before any sample."""
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        rank = max(math.ceil(p / 100 * len(samples)) - 1, 0)
+        return samples[rank]
+
+    def mean(self) -> float | None:
+        return self.total / self.count if self.count else None
+
+    def hedge_delay(self, p: float = 95, min_samples: int = 20) -> float | None:
+        """
+        How long to wait before sending a duplicate request: the p-th percentile latency,
+        or None until there are enough samples for it to mean anything.
+        """
+        if self.count < min_samples:
+            return None
+        return self.percentile(p)
@@ -0,0 +1,150 @@
+import heapq
+import math
+import threading
+
+from src.backend.boarditems.bounds import Bounds
+
+# Default Miro sticky note footprint (square shape) plus some breathing room
+STICKY_WIDTH = 200
+STICKY_HEIGHT = 230
+STICKY_GAP = 40
+
+
+class SpatialIndex:
+    """
+    Uniform grid index over item bounding boxes.
+
+    Coordinates are whatever space the caller inserts in; for frame children that is the
+    frame-relative space Miro uses (origin at the parent's top-left corner).
+    Each box is registered in every grid cell it touches, so a region query only has
+    to look at the cells the region covers instead of every item.
+    """
+
+    def __init__(self, cell_size: float = 250):
+        self.cell_size = cell_size
+        self._cells: dict[tuple[int, int], set[str]] = {}
+        self._bounds: dict[str, Bounds] = {}
+
+    def __len__(self):
+        return len(self._bounds)
+
+    def __contains__(self, item_id: str):
+        return item_id in self._bounds
+
+    def insert(self, item_id: str, bounds: Bounds):
+        """Add (or move) an item's bounding box."""
+        if item_id in self._bounds:
+            self.remove(item_id)
+
+        self._bounds[item_id] = bounds
+        for cell in self._cells_for(bounds):
+            self._cells.setdefault(cell, set()).add(item_id)
+
+    def remove(self, item_id: str):
+        bounds = self._bounds.pop(item_id, None)
+        if bounds is None:
+            return
+
+        for cell in self._cells_for(bounds):
+            ids = self._cells.get(cell)
+            if ids is not None:
+                ids.discard(item_id)
+                if not ids:
+                    del self._cells[cell]
+
+    def get_bounds(self, item_id: str) -> Bounds | None:
+        return self._bounds.get(item_id)
+
+    def query(self, region: Bounds) -> set[str]:
+        """Return the ids of all items whose bounding box overlaps the region."""
+        candidates = set()
+        for cell in self._cells_for(region):
+            candidates |= self._cells.get(cell, set())
+
+        return {item_id for item_id in candidates if self._bounds[item_id].intersects(region)}
+
+    def is_free(self, region: Bounds) -> bool:
+        return not self.query(region)
+
+    def _cells_for(self, bounds: Bounds):
+        size = self.cell_size
+        first_col = math.floor(bounds.x / size)
+        last_col = math.floor(bounds.right() / size)
+        first_row = math.floor(bounds.y / size)
+        last_row = math.floor(bounds.bottom() / size)
+        for col in range(first_col, last_col + 1):
+            for row in range(first_row, last_row + 1):
+                yield col, row
+
+
+class SlotAllocator:
+    """
+    Hands out non-overlapping slots for new items inside a placement area.
+
+    The area is cut into a grid of slots. Occupancy is worked out once, from the index,
+    when the allocator is built; after that the free slots live in a heap, so each
+    allocation is O(log n) and a batch of stickies is placed in a single pass.
+    Allocated slots are written back into the index so region queries see them too.
+    """
+
+    def __init__(self, index: SpatialIndex, area: Bounds,
+                 slot_width: float = STICKY_WIDTH, slot_height: float = STICKY_HEIGHT,
+                 gap: float = STICKY_GAP):
+        self.index = index
+        self.area = area
+        self.slot_width = slot_width
+        self.slot_height = slot_height
+        self.gap = gap
+        # A frame narrower than one slot still gets a single column at its left edge
+        self.columns = max(int((area.width + gap) // (slot_width + gap)), 1)
+        self.rows = max(int((area.height + gap) // (slot_height + gap)), 0)
+        self._lock = threading.Lock()
+        self._reserved = 0
+
+        # Row-major slot numbers, so the heap hands out slots left-to-right, top-to-bottom
+        self._free = [slot for slot in range(self.columns * self.rows)
+                      if index.is_free(self._slot_bounds(slot))]
+        heapq.heapify(self._free)
+
+    def free_count(self) -> int:
+        return len(self._free)
+
+    def next_slot(self) -> Bounds | None:
+        """Reserve the next free slot, or return None when the area is full."""
+        with self._lock:
+            if not self._free:
+                return None
+
+            slot = heapq.heappop(self._free)
+            bounds = self._slot_bounds(slot)
+            self._reserved += 1
+            self.index.insert(f"__reserved_{self._reserved}", bounds)
+            return bounds
+
+    def take(self, count: int) -> list[Bounds]:
+        """Reserve up to `count` slots at once. Fewer are returned if the area fills up."""
+        slots = []
+        for _ in range(count):
+            bounds = self.next_slot()
+            if bounds is None:
+                break
+            slots.append(bounds)
+
+        return slots
+
+    def grow(self, rows: int):
+        """Extend the area downward by `rows` rows of slots; the new free ones join the heap."""
+        with self._lock:
+            first = self.columns * self.rows
+            self.rows += rows
+            self.area = Bounds(self.area.x, self.area.y, self.area.width,
+                               self.area.height + rows * (self.slot_height + self.gap))
+            for slot in range(first, self.columns * self.rows):
+                if self.index.is_free(self._slot_bounds(slot)):
+                    heapq.heappush(self._free, slot)
+
+    def _slot_bounds(self, slot: int) -> Bounds:
+        row, col = divmod(slot, self.columns)
+        x = self.area.x + col * (self.slot_width + self.gap)
+        y = self.area.y + row * (self.slot_height + self.gap)
+        return Bounds(x, y, self.slot_width, self.slot_height)
@@ -1,79 +1,252 @@
 import os
 import sqlite3
+import threading
+import time
+from contextlib import contextmanager
 from pathlib import Path
+from types import MappingProxyType
+from typing import Mapping
+
+# Bumped whenever _migrate learns a new step; stored in PRAGMA user_version
+SCHEMA_VERSION = 1
+
+# Statements are kept as constants so sqlite3's per-connection statement cache reuses them
+_INSERT_MAPPING = "INSERT OR IGNORE INTO tag_mappings (board_id, tag, item_id, created_at) VALUES (?, ?, ?, ?)"
+_DELETE_ITEM = "DELETE FROM tag_mappings WHERE board_id = ? AND item_id = ?"
+_SELECT_BOARD = "SELECT tag, item_id FROM tag_mappings WHERE board_id = ?"
+_SELECT_STALE = """
+    SELECT DISTINCT item_id FROM tag_mappings
+    WHERE board_id = ? AND created_at < ? AND item_id NOT IN (SELECT item_id FROM temp.live_items)
+"""
+_DELETE_STALE = "DELETE FROM tag_mappings WHERE board_id = ? AND item_id = ? AND created_at < ?"
 
 
 class TagMap:
     """
-    This is a singleton class that maps tags to item ids.
-    Data is persisted in a SQLite database.
+    This class maps tags to item ids, with one shared instance per board.
+    Data is persisted in a SQLite database, scoped by board id.
+
+    Each thread keeps one long-lived connection in WAL mode, and multi-row writes run
+    in a single transaction.
+
+    Reads are served from an in-memory forward (tag -> item ids) and reverse
+    (item id -> tags) map. Our own writes update the maps directly; writes from other
+    connections are picked up by checking PRAGMA data_version, which only changes when
+    another connection commits, before each read.
     """
-    _instance = None
+    _instances: dict[str, "TagMap"] = {}
+    _instances_lock = threading.Lock()
     _db_path = Path(os.getenv("DB_PATH", str(Path(__file__).parent.parent.parent.parent / "tag_mappings.db")))
 
-    def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super(TagMap, cls).__new__(cls)
-            cls._instance._init_db()
-        return cls._instance
+    def __new__(cls, board_id: str | None = None):
+        """board_id defaults to the MIRO_BOARD_ID environment variable."""
+        if board_id is None:
+            board_id = os.getenv("MIRO_BOARD_ID") or ""
+
+        with cls._instances_lock:
+            instance = cls._instances.get(board_id)
+            if instance is None:
+                instance = super(TagMap, cls).__new__(cls)
+                instance.board_id = board_id
+                instance._local = threading.local()
+                instance._cache_lock = threading.RLock()
+                instance._forward = {}
+                instance._reverse = {}
+                instance._init_db()
+                cls._instances[board_id] = instance
+        return instance
 
     def _init_db(self):
-        """Initialize the SQLite database and create the table if it doesn't exist."""
-        conn = sqlite3.connect(self._db_path)
-        cursor = conn.cursor()
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS tag_mappings (
+        """Initialize the SQLite database and bring the schema up to date."""
+        conn = self._get_connection()
+        with conn:
+            self._migrate(conn)
+
+    def _migrate(self, conn: sqlite3.Connection):
+        # Take the write lock first so two processes cannot migrate at the same time
+        conn.execute("BEGIN IMMEDIATE")
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version >= SCHEMA_VERSION:
+            return
+
+        # Version 0 had no board column; its rows are adopted by the board we are running for
+        legacy = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'tag_mappings'"
+        ).fetchone()
+        if legacy:
+            conn.execute("ALTER TABLE tag_mappings RENAME TO tag_mappings_v0")
+
+        conn.execute("""
+            CREATE TABLE tag_mappings (
+                board_id TEXT NOT NULL DEFAULT '',
                 tag TEXT NOT NULL,
                 item_id TEXT NOT NULL,
-                PRIMARY KEY (tag, item_id)
+                created_at REAL NOT NULL DEFAULT 0,
+                PRIMARY KEY (board_id, tag, item_id)
             )
         """)
-        conn.commit()
-        conn.close()
+        conn.execute("CREATE INDEX idx_tag_mappings_item ON tag_mappings (board_id, item_id)")
+
+        if legacy:
+            conn.execute(
+                "INSERT OR IGNORE INTO tag_mappings (board_id, tag, item_id) "
+                "SELECT ?, tag, item_id FROM tag_mappings_v0",
+                (self.board_id,)
+            )
+            conn.execute("DROP TABLE tag_mappings_v0")
+
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
 
     def _get_connection(self):
-        """Get a connection to the SQLite database."""
-        return sqlite3.connect(self._db_path)
+        """Get this thread's connection to the SQLite database, opening it on first use."""
+        conn = getattr(self._local, "connection", None)
+        if conn is None:
+            conn = sqlite3.connect(self._db_path, timeout=10, cached_statements=32)
+            # WAL lets readers and the writer work concurrently; with WAL, NORMAL is still
+            # crash-safe and only syncs on checkpoints instead of on every commit
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = conn
+        return conn
+
+    def close(self):
+        """Close the calling thread's connection. A new one is opened on next use."""
+        conn = getattr(self._local, "connection", None)
+        if conn is not None:
+            conn.close()
+            self._local.connection = None
+            # data_version is only comparable within one connection
+            self._local.data_version = None
+
+    @contextmanager
+    def batch(self):
+        """
+        Collect every tag added by the calling thread inside the block and write them
+        all in one transaction when the block exits. The tags are written even when the
+        block raises, since they belong to items that were already created.
+        """
+        if getattr(self._local, "pending", None) is not None:
+            # Nested batch: the outer one does the write
+            yield self
+            return
+
+        self._local.pending = []
+        try:
+            yield self
+        finally:
+            pending = self._local.pending
+            self._local.pending = None
+            self._write_mappings(pending)
 
     def add_tag(self, tag: str, item_id: str):
         """Add a tag-to-item_id mapping to the database."""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        cursor.execute(
-            "INSERT OR IGNORE INTO tag_mappings (tag, item_id) VALUES (?, ?)",
-            (tag, item_id)
-        )
-        conn.commit()
-        conn.close()
+        self._write_mappings([(tag, item_id)])
 
     def get_items_for_tag(self, tag: str) -> list[str]:
         """Get all item IDs associated with a specific tag."""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        cursor.execute(
-            "SELECT item_id FROM tag_mappings WHERE tag = ?",
-            (tag,)
-        )
-        results = [row[0] for row in cursor.fetchall()]
-        conn.close()
-        return results
+        self._revalidate()
+        with self._cache_lock:
+            return list(self._forward.get(tag, ()))
+
+    def get_tags_for_item(self, item_id: str) -> frozenset[str]:
+        """Get all tags of a specific item."""
+        self._revalidate()
+        return self._reverse.get(item_id, frozenset())
 
     def get_map(self) -> dict[str, list[str]]:
         """Get all tag-to-item_id mappings as a dictionary."""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT tag, item_id FROM tag_mappings")
+        self._revalidate()
+        with self._cache_lock:
+            return {tag: list(item_ids) for tag, item_ids in self._forward.items()}
 
-        tags_dict = {}
-        for tag, item_id in cursor.fetchall():
-            if tag not in tags_dict:
-                tags_dict[tag] = []
-            tags_dict[tag].append(item_id)
-
-        conn.close()
-        return tags_dict
+    def get_item_tags_map(self) -> Mapping[str, frozenset[str]]:
+        """
+        Read-only item_id -> tags view, revalidated once. Use this when resolving the tags
+        of many items so each lookup is a plain dict access.
+        """
+        self._revalidate()
+        return MappingProxyType(self._reverse)
 
     def add_tags_to_item(self, item_id: str, tags: list[str]):
         """Add multiple tags to a single item."""
-        for tag in tags:
-            self.add_tag(tag, item_id)
+        self._write_mappings([(tag, item_id) for tag in tags])
+
+    def add_tags_to_items(self, tags_by_item: dict[str, list[str]]):
+        """Add tags to many items in one transaction."""
+        self._write_mappings([(tag, item_id) for item_id, tags in tags_by_item.items() for tag in tags])
+
+    def remove_items(self, item_ids: list[str]):
+        """Remove every mapping of the given items in one transaction."""
+        conn = self._get_connection()
+        with conn:
+            conn.executemany(_DELETE_ITEM, [(self.board_id, item_id) for item_id in item_ids])
+        self._forget_items(item_ids)
+
+    def prune(self, live_item_ids, snapshot_started: float) -> list[str]:
+        """
+        Garbage-collect the mappings of items that are missing from a complete board snapshot.
+
+        Only mappings written before the snapshot was requested are candidates, so items
+        created while the snapshot was being loaded are never pruned. Returns the pruned ids.
+        """
+        conn = self._get_connection()
+        with conn:
+            conn.execute("CREATE TEMP TABLE IF NOT EXISTS live_items (item_id TEXT PRIMARY KEY)")
+            conn.execute("DELETE FROM temp.live_items")
+            conn.executemany("INSERT OR IGNORE INTO temp.live_items (item_id) VALUES (?)",
+                             [(item_id,) for item_id in live_item_ids])
+            stale = [row[0] for row in conn.execute(_SELECT_STALE, (self.board_id, snapshot_started))]
+            conn.executemany(_DELETE_STALE, [(self.board_id, item_id, snapshot_started) for item_id in stale])
+            conn.execute("DELETE FROM temp.live_items")
+
+        if stale:
+            # A newer mapping of a pruned item may have survived, so reload rather than patch
+            self._local.data_version = None
+        return stale
+
+    def _forget_items(self, item_ids):
+        with self._cache_lock:
+            for item_id in item_ids:
+                for tag in self._reverse.pop(item_id, ()):
+                    item_ids_for_tag = self._forward.get(tag)
+                    if item_ids_for_tag is not None:
+                        item_ids_for_tag.discard(item_id)
+                        if not item_ids_for_tag:
+                            del self._forward[tag]
+
+    def _write_mappings(self, mappings: list[tuple[str, str]]):
+        if not mappings:
+            return
+
+        pending = getattr(self._local, "pending", None)
+        if pending is not None:
+            pending.extend(mappings)
+            return
+
+        now = time.time()
+        conn = self._get_connection()
+        with conn:
+            conn.executemany(_INSERT_MAPPING, [(self.board_id, tag, item_id, now) for tag, item_id in mappings])
+
+        with self._cache_lock:
+            for tag, item_id in mappings:
+                self._cache_mapping(tag, item_id)
+
+    def _cache_mapping(self, tag: str, item_id: str):
+        self._forward.setdefault(tag, set()).add(item_id)
+        self._reverse[item_id] = self._reverse.get(item_id, frozenset()) | {tag}
+
+    def _revalidate(self):
+        """Reload the in-memory maps if another connection has committed since this thread last looked."""
+        conn = self._get_connection()
+        version = conn.execute("PRAGMA data_version").fetchone()[0]
+        if getattr(self._local, "data_version", None) == version:
+            return
+
+        with self._cache_lock:
+            rows = conn.execute(_SELECT_BOARD, (self.board_id,)).fetchall()
+            self._forward = {}
+            self._reverse = {}
+            for tag, item_id in rows:
+                self._cache_mapping(tag, item_id)
+        self._local.data_version = version
@@ -0,0 +1,136 @@
+from src.backend.utils.text_normalizer import to_plain_text, tokenize
+
+
+class TextIndex:
+    """
+    Positional inverted index over the plain text of board items.
+
+    Maps each token to the items containing it and the token positions within each item,
+    which is enough to answer single-token and exact-phrase queries without scanning item
+    content. Items are re-tokenized only when their content actually changes.
+
+    fork() hands out a copy-on-write copy: both indexes share their data until one of them
+    changes, and a change only copies the containers it touches.
+    """
+
+    def __init__(self):
+        self._postings: dict[str, dict[str, list[int]]] = {}
+        self._contents: dict[str, str] = {}
+        self._tokens: dict[str, list[str]] = {}
+        # After a fork: the top-level dicts are still shared, and the tokens whose item maps
+        # this index has already copied. None means nothing is shared.
+        self._shared = False
+        self._owned_tokens: set[str] | None = None
+
+    def __len__(self):
+        return len(self._contents)
+
+    def fork(self) -> "TextIndex":
+        """A copy of this index that can be updated without changing this one, and vice versa."""
+        other = TextIndex.__new__(TextIndex)
+        other._postings, other._contents, other._tokens = self._postings, self._contents, self._tokens
+        for index in (self, other):
+            index._shared = True
+            index._owned_tokens = set()
+        return other
+
+    def update(self, item_id: str, content: str | None):
+        """Index (or re-index) an item's HTML content. Unchanged content is a no-op."""
+        content = content or ""
+        if item_id in self._contents and self._contents[item_id] == content:
+            return
+
+        self.remove(item_id)
+        self._unshare()
+        tokens = tokenize(to_plain_text(content).text)
+        self._contents[item_id] = content
+        self._tokens[item_id] = tokens
+        for position, token in enumerate(tokens):
+            self._writable_items(token).setdefault(item_id, []).append(position)
+
+    def remove(self, item_id: str):
+        if item_id not in self._contents:
+            return
+
+        self._unshare()
+        del self._contents[item_id]
+        for token in set(self._tokens.pop(item_id)):
+            if token not in self._postings:
+                continue
+            items = self._writable_items(token)
+            items.pop(item_id, None)
+            if not items:
+                del self._postings[token]
+
+    def _unshare(self):
+        if self._shared:
+            self._postings = dict(self._postings)
+            self._contents = dict(self._contents)
+            self._tokens = dict(self._tokens)
+            self._shared = False
+
+    def _writable_items(self, token: str) -> dict[str, list[int]]:
+        """The token's item -> positions map, copied first if a fork may still share it.
+        Position lists are never changed in place, so they can stay shared."""
+        items = self._postings.get(token)
+        if items is None:
+            items = self._postings[token] = {}
+        elif self._owned_tokens is not None and token not in self._owned_tokens:
+            items = self._postings[token] = dict(items)
+        if self._owned_tokens is not None:
+            self._owned_tokens.add(token)
+        return items
+
+    def sync(self, contents: dict[str, str | None]):
+        """Bring the index in line with a full item_id -> content snapshot."""
+        for item_id in [item_id for item_id in self._contents if item_id not in contents]:
+            self.remove(item_id)
+
+        for item_id, content in contents.items():
+            self.update(item_id, content)
+
+    def lookup(self, token: str) -> set[str]:
+        """Return the ids of the items containing the token."""
+        tokens = tokenize(token)
+        if len(tokens) != 1:
+            return self.search_phrase(token)
+        return set(self._postings.get(tokens[0], {}))
+
+    def search_phrase(self, phrase: str, item_ids: set[str] | None = None) -> set[str]:
+        """
+        Return the ids of the items containing the phrase as consecutive tokens.
+        Matching is case-insensitive and ignores markup and punctuation.
+        """
+        tokens = tokenize(phrase)
+        if not tokens:
+            return set()
+
+        postings = [self._postings.get(token) for token in tokens]
+        if not all(postings):
+            return set()
+
+        # Intersect starting from the rarest token to keep the candidate set small
+        candidates = set(min(postings, key=len))
+        if item_ids is not None:
+            candidates &= item_ids
+        for items in postings:
+            candidates &= items.keys()
+            if not candidates:
+                return set()
+
+        if len(tokens) == 1:
+            return candidates
+
+        return {item_id for item_id in candidates if self._has_sequence(item_id, postings)}
+
+    def contains_phrase(self, phrase: str, item_id: str | None = None) -> bool:
+        return bool(self.search_phrase(phrase, None if item_id is None else {item_id}))
+
+    @staticmethod
+    def _has_sequence(item_id: str, postings: list[dict[str, list[int]]]) -> bool:
+        starts = set(postings[0][item_id])
+        for offset, items in enumerate(postings[1:], start=1):
+            starts &= {position - offset for position in items[item_id]}
+            if not starts:
+                return False
+        return True
@@ -0,0 +1,122 @@
+import hashlib
+import html
+import math
+import re
+import threading
+from dataclasses import dataclass
+
+# Tags that start a new line of text when rendered; every other tag is dropped in place
+_BLOCK_TAG = re.compile(r"<\s*/?\s*(?:p|br|div|li|ul|ol|h[1-6]|tr|table|blockquote)\b[^>]*>", re.IGNORECASE)
+_ANY_TAG = re.compile(r"<[^>]*>")
+_SPACES = re.compile(r"[ \t\r\f\v ]+")
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+# Upper bound on cached normalizations; the oldest entries are dropped first
+PLAIN_TEXT_CACHE_SIZE = 20_000
+TOKENIZER_ENCODING = "cl100k_base"
+
+
+@dataclass(frozen=True)
+class PlainText:
+    """Normalized, markup-free version of an item's content."""
+    text: str
+    token_count: int
+
+
+_plain_text_cache: dict[bytes, PlainText] = {}
+_cache_lock = threading.Lock()
+_encoding = None
+_encoding_loaded = False
+
+
+def strip_html(content: str) -> str:
+    """
+    Convert Miro's HTML content into plain text.
+
+    Block tags become line breaks, inline tags are removed, entities are unescaped and
+    runs of whitespace are collapsed. Empty lines are dropped.
+    """
+    if not content:
+        return ""
+
+    text = _BLOCK_TAG.sub("\n", content)
+    text = _ANY_TAG.sub("", text)
+    text = html.unescape(text)
+
+    lines = (_SPACES.sub(" ", line).strip() for line in text.split("\n"))
+    return "\n".join(line for line in lines if line)
+
+
+def tokenize(text: str) -> list[str]:
+    """Split plain text into lowercase word tokens."""
+    if not text:
+        return []
+    return _TOKEN.findall(text.lower())
+
+
+def content_hash(content: str) -> bytes:
+    return hashlib.blake2b(content.encode("utf-8"), digest_size=16).digest()
+
+
+def to_plain_text(content: str | None) -> PlainText:
+    """
+    Strip the markup from item content and count its LLM tokens.
+    Results are cached by content hash and shared by every caller in the process.
+    """
+    if not content:
+        return PlainText("", 0)
+
+    key = content_hash(content)
+    cached = _plain_text_cache.get(key)
+    if cached is not None:
+        return cached
+
+    text = strip_html(content)
+    plain_text = PlainText(text, count_tokens(text))
+    with _cache_lock:
+        if len(_plain_text_cache) >= PLAIN_TEXT_CACHE_SIZE:
+            del _plain_text_cache[next(iter(_plain_text_cache))]
+        _plain_text_cache[key] = plain_text
+    return plain_text
+
+
+def count_tokens(text: str) -> int:
+    """
+    Count LLM tokens with tiktoken when its encoding is available locally,
+    otherwise estimate them at roughly four characters per token.
+    """
+    if not text:
+        return 0
+
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return math.ceil(len(text) / 4)
+
+
+def truncate_to_tokens(text: str, limit: int, marker: str = "…") -> str:
+    """
+    Cut text down to at most `limit` tokens (as counted by count_tokens), ending it with
+    the marker when anything was cut. The cut is deterministic for a given text and limit.
+    """
+    if count_tokens(text) <= limit:
+        return text
+
+    keep = max(limit - count_tokens(marker), 0)
+    encoding = _get_encoding()
+    if encoding is not None:
+        return encoding.decode(encoding.encode(text, disallowed_special=())[:keep]).rstrip() + marker
+    return text[:keep * 4].rstrip() + marker
+
+
+def _get_encoding():
+    global _encoding, _encoding_loaded
+    if not _encoding_loaded:
+        try:
+            import tiktoken
+            _encoding = tiktoken.get_encoding(TOKENIZER_ENCODING)
+        except Exception as e:  # noqa: BLE001 - missing package or encoding file
+            print(f"[text_normalizer] tiktoken unavailable, estimating token counts: {e}")
+            _encoding = None
+        _encoding_loaded = True
+    return _encoding
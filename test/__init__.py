@@ -0,0 +1,7 @@
+import os
+import tempfile
+
+# Keep the tests away from the databases in the repository
+_test_dir = tempfile.mkdtemp(prefix="miro-marketing-test-")
+os.environ.setdefault("DB_PATH", os.path.join(_test_dir, "tag_mappings.db"))
+os.environ.setdefault("LLM_CACHE_PATH", os.path.join(_test_dir, "llm_cache.db"))
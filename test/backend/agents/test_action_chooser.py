@@ -0,0 +1,70 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+from langchain_core.messages import AIMessage
+
+from src.backend.agents.action_chooser import ActionChooser
+from src.backend.enums.next_action import NextAction
+from src.backend.models.miro_board import MiroBoard
+from test.backend.agents.test_fast_path_classifier import make_board
+
+
+class TestActionChooser(TestCase):
+    def choose(self, board: MiroBoard, llm=None):
+        chooser = ActionChooser()
+        with patch.object(chooser, 'ask_llm_for_next_action', side_effect=llm) as ask, \
+                patch.object(MiroBoard, 'clear_user_responses') as clear:
+            result = chooser.choose_next_action({'current_board': MiroBoard.create([]), 'new_board': board})
+        cleared = [chat.id for chat in clear.call_args.args[0]]
+        return result, cleared, ask
+
+    def test_one_action_per_answered_chat(self):
+        """Test that replies in several chat frames each produce an action in the same cycle."""
+        board = make_board({'Segments Chat': 'yes', 'Channels Chat': '', 'Summary Chat': 'Sure'})
+        result, cleared, ask = self.choose(board)
+
+        self.assertEqual(result['next_actions'], [NextAction.PREDICT_SEGMENTS, NextAction.REFRESH_PLAN])
+        self.assertEqual(result['next_action'], NextAction.PREDICT_SEGMENTS)
+        self.assertEqual(cleared, ['chat0', 'chat2'])
+        ask.assert_not_called()
+
+    def test_only_handled_replies_are_cleared(self):
+        """Test that a reply the LLM failed to classify stays on the board for the next cycle."""
+        def llm(board, chats):
+            raise TimeoutError('slow')
+
+        board = make_board({'Segments Chat': 'yes', 'Summary Chat': 'refresh it but keep it short'})
+        result, cleared, ask = self.choose(board, llm)
+
+        self.assertEqual(result['next_actions'], [NextAction.PREDICT_SEGMENTS])
+        self.assertEqual(cleared, ['chat0'])
+        ask.assert_called_once_with(board, [board.get('chat1')])
+        self.assertEqual(board.get_chat_reply(board.get('chat1')), 'refresh it but keep it short')
+
+    def test_llm_sees_only_changed_chats(self):
+        """Test that without replies only the chat frames that changed since the last board go to the LLM."""
+        current = make_board({'Segments Chat': '', 'Summary Chat': ''})
+        new = make_board({'Segments Chat': '', 'Summary Chat': '', 'Channels Chat': ''})
+        chooser = ActionChooser()
+        with patch.object(chooser.cache, 'enabled', False), \
+                patch.object(chooser.router, 'invoke',
+                             return_value=('gpt-test', AIMessage(content='NO_ACTION'))) as invoke:
+            result = chooser.choose_next_action({'current_board': current, 'new_board': new})
+
+        prompt = invoke.call_args.args[1][1].content
+        self.assertEqual(result['next_actions'], [])
+        self.assertIn('- [Channels Chat] ', prompt)
+        self.assertNotIn('[Segments Chat]', prompt)
+        self.assertIn('Frames on the board: Channels Chat, Segments Chat, Summary Chat', prompt)
+
+    def test_fallback_answers_are_not_cached(self):
+        """Test that only answers from the node's primary model are stored under its cache key."""
+        chooser = ActionChooser()
+        primary = chooser.router.config_for(chooser.name).model
+        board = make_board({'Segments Chat': ''})
+        for model, cached in (('fallback-model', False), (primary, True)):
+            with patch.object(chooser.cache, 'get', return_value=None), \
+                    patch.object(chooser.cache, 'put') as put, \
+                    patch.object(chooser.router, 'invoke', return_value=(model, AIMessage(content='NO_ACTION'))):
+                chooser.ask_llm_for_next_action(board, board.get_chat_frames())
+            self.assertEqual(put.called, cached)
@@ -0,0 +1,51 @@
+from unittest import TestCase
+
+from src.backend.agents.fast_path_classifier import FastPathClassifier
+from src.backend.enums.next_action import NextAction
+from src.backend.models.miro_board import MiroBoard
+
+
+def make_board(replies: dict[str, str]) -> MiroBoard:
+    """A board with one chat frame per tag; the value is the user's reply."""
+    raw_items = []
+    for i, tag in enumerate(replies):
+        frame_id = f"chat{i}"
+        raw_items.append({'id': frame_id, 'type': 'frame', 'data': {'title': tag}})
+        raw_items.append({'id': f"{frame_id}_agent", 'type': 'text', 'parent': {'id': frame_id},
+                          'data': {'content': '<p><strong>Agent: </strong></p>Shall I?'}})
+        raw_items.append({'id': f"{frame_id}_label", 'type': 'text', 'parent': {'id': frame_id},
+                          'data': {'content': '<p><strong>User:</strong></p>'}})
+        raw_items.append({'id': f"{frame_id}_reply", 'type': 'shape', 'parent': {'id': frame_id},
+                          'data': {'content': replies[tag]}})
+
+    board = MiroBoard.create(raw_items)
+    for i, tag in enumerate(replies):
+        board.get(f"chat{i}").tags.add(tag)
+    return board
+
+
+def classify(classifier: FastPathClassifier, replies: dict[str, str]) -> NextAction | None:
+    """Classify the reply in the first chat frame of a board built from `replies`."""
+    board = make_board(replies)
+    return classifier.classify_chat(board, board.get('chat0'))
+
+
+class TestFastPathClassifier(TestCase):
+    def test_affirmative_reply_maps_to_offered_action(self):
+        """Test that a plain yes in a chat frame maps to the action that frame offers."""
+        classifier = FastPathClassifier()
+
+        self.assertEqual(classify(classifier, {'Segments Chat': '<p>Yes, please!</p>', 'Summary Chat': ''}),
+                         NextAction.PREDICT_SEGMENTS)
+        self.assertEqual(classify(classifier, {'Initial Chat': 'ok'}), NextAction.SET_UP_BOARD)
+        self.assertEqual(classify(classifier, {'Summary Chat': 'No thanks'}), NextAction.NO_ACTION)
+        self.assertEqual(classifier.hits, 3)
+
+    def test_unclear_replies_fall_back(self):
+        """Test that free text and unknown frames go to the LLM."""
+        classifier = FastPathClassifier()
+
+        self.assertIsNone(classify(classifier, {'Segments Chat': 'yes but focus on students'}))
+        self.assertIsNone(classify(classifier, {'Product Chat': 'yes'}))
+        self.assertEqual((classifier.hits, classifier.misses), (0, 2))
+        self.assertEqual(classifier.hit_rate(), 0.0)
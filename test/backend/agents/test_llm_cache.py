@@ -0,0 +1,49 @@
+import os
+import tempfile
+from unittest import TestCase
+
+from src.backend.agents.llm_cache import LlmCache
+
+
+class TestLlmCache(TestCase):
+    def setUp(self):
+        self._saved = (LlmCache._instance, LlmCache._db_path)
+        self._dir = tempfile.TemporaryDirectory()
+        LlmCache._instance = None
+        LlmCache._db_path = os.path.join(self._dir.name, "cache.db")
+        self.cache = LlmCache()
+        self.cache.enabled = True
+
+    def tearDown(self):
+        self.cache._get_connection().close()
+        LlmCache._instance, LlmCache._db_path = self._saved
+        self._dir.cleanup()
+
+    def test_hit_and_miss(self):
+        """Test that stored values are returned for equivalent inputs and counted."""
+        key = LlmCache.make_key("gpt-test", "v1", "board  state\n")
+        self.assertIsNone(self.cache.get(key))
+
+        self.cache.put(key, "SET_UP_BOARD")
+
+        self.assertEqual(self.cache.get(LlmCache.make_key("gpt-test", "v1", "board state")), "SET_UP_BOARD")
+        self.assertIsNone(self.cache.get(LlmCache.make_key("gpt-test", "v2", "board state")))
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 2))
+
+    def test_expiry(self):
+        """Test that expired entries are not returned."""
+        self.cache.ttl_seconds = -1
+        self.cache.put("key", "value")
+        self.assertIsNone(self.cache.get("key"))
+
+    def test_size_bound(self):
+        """Test that the least recently used entries are evicted past the size limit."""
+        self.cache.max_entries = 2
+        self.cache.put("a", "1")
+        self.cache.put("b", "2")
+        self.cache.get("a")
+        self.cache.put("c", "3")
+
+        self.assertEqual(self.cache.get("a"), "1")
+        self.assertIsNone(self.cache.get("b"))
+        self.assertEqual(self.cache.get("c"), "3")
@@ -0,0 +1,19 @@
+import os
+from unittest import TestCase
+from unittest.mock import patch
+
+from src.backend.agents.llm_registry import get_llm, get_structured_llm
+from src.backend.models.plan.plan import Plan
+
+
+@patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"})
+class TestLlmRegistry(TestCase):
+    def test_clients_are_shared_per_parameters(self):
+        """Test that the same model and parameters always return the same client."""
+        self.assertIs(get_llm("gpt-test", temperature=0), get_llm("gpt-test", temperature=0))
+        self.assertIsNot(get_llm("gpt-test", temperature=0), get_llm("gpt-test", temperature=0.7))
+        self.assertIsNot(get_llm("gpt-test", timeout=5), get_llm("gpt-test", timeout=10))
+
+    def test_structured_wrappers_are_shared(self):
+        """Test that structured output wrappers are built once per schema and model."""
+        self.assertIs(get_structured_llm(Plan, "gpt-test"), get_structured_llm(Plan, "gpt-test"))
@@ -0,0 +1,134 @@
+import asyncio
+import os
+import time
+from unittest import TestCase
+from unittest.mock import patch
+
+from langchain_core.messages import AIMessage, AIMessageChunk
+
+from src.backend.agents.model_router import ModelRouter, NodeModelConfig
+from src.backend.utils.deadline import deadline_scope
+
+
+class FakeModel:
+    def __init__(self, name: str, delay: float = 0):
+        self.name = name
+        self.delay = delay
+
+    def invoke(self, messages):
+        time.sleep(self.delay)
+        return AIMessage(content=self.name, usage_metadata={'input_tokens': 10, 'output_tokens': 2, 'total_tokens': 12})
+
+    async def ainvoke(self, messages):
+        await asyncio.sleep(self.delay)
+        return AIMessage(content=self.name, usage_metadata={'input_tokens': 10, 'output_tokens': 2, 'total_tokens': 12})
+
+    def stream(self, messages, **kwargs):
+        yield AIMessageChunk(content=self.name[:1])
+        yield AIMessageChunk(content=self.name[1:],
+                             usage_metadata={'input_tokens': 10, 'output_tokens': 2, 'total_tokens': 12})
+
+
+class TestModelRouter(TestCase):
+    def setUp(self):
+        self._saved = ModelRouter._instance
+        ModelRouter._instance = None
+        self.router = ModelRouter()
+
+    def tearDown(self):
+        ModelRouter._instance = self._saved
+
+    def route(self, config: NodeModelConfig, models: dict):
+        self.router._configs['NODE'] = config
+        with patch.object(self.router, 'get_runnable', side_effect=lambda node, model, tools, schema: models[model]):
+            return self.router.invoke('NODE', [])
+
+    def test_primary_within_budget(self):
+        """Test that the node's own model answers and its stats are recorded."""
+        config = NodeModelConfig(model='big', latency_budget=1, fallback_model='small')
+        response = self.route(config, {'big': FakeModel('big'), 'small': FakeModel('small')})
+
+        stats = self.router.stats_for('NODE')
+        self.assertEqual(response.content, 'big')
+        self.assertEqual((stats.calls, stats.fallbacks, stats.input_tokens, stats.output_tokens), (1, 0, 10, 2))
+
+    def test_fallback_when_over_budget(self):
+        """Test that the fallback model answers when the primary exceeds the latency budget."""
+        config = NodeModelConfig(model='big', latency_budget=0.05, fallback_model='small')
+        response = self.route(config, {'big': FakeModel('big', delay=0.5), 'small': FakeModel('small')})
+
+        self.assertEqual(response.content, 'small')
+        self.assertEqual(self.router.stats_for('NODE').fallbacks, 1)
+
+    def test_return_model_reports_the_answering_model(self):
+        """Test that return_model names the fallback model when it answered."""
+        self.router._configs['NODE'] = NodeModelConfig(model='big', latency_budget=0.05, fallback_model='small')
+        models = {'big': FakeModel('big', delay=0.5), 'small': FakeModel('small')}
+        with patch.object(self.router, 'get_runnable', side_effect=lambda node, model, tools, schema: models[model]):
+            model, response = self.router.invoke('NODE', [], return_model=True)
+
+        self.assertEqual((model, response.content), ('small', 'small'))
+
+    def test_async_fallback_when_over_budget(self):
+        """Test that ainvoke races the fallback model on the event loop as invoke does on threads."""
+        self.router._configs['NODE'] = NodeModelConfig(model='big', latency_budget=0.05, fallback_model='small')
+        models = {'big': FakeModel('big', delay=0.5), 'small': FakeModel('small')}
+        with patch.object(self.router, 'get_runnable', side_effect=lambda node, model, tools, schema: models[model]):
+            response = asyncio.run(self.router.ainvoke('NODE', []))
+
+        self.assertEqual(response.content, 'small')
+        self.assertEqual(self.router.stats_for('NODE').fallbacks, 1)
+
+    def test_stream_records_stats(self):
+        """Test that a streamed call yields every chunk and records usage once it ends."""
+        self.router._configs['NODE'] = NodeModelConfig(model='big')
+        with patch.object(self.router, 'get_runnable', return_value=FakeModel('big')):
+            chunks = list(self.router.stream('NODE', []))
+
+        stats = self.router.stats_for('NODE')
+        self.assertEqual(''.join(chunk.content for chunk in chunks), 'big')
+        self.assertEqual((stats.calls, stats.input_tokens, stats.output_tokens), (1, 10, 2))
+
+    @patch.dict(os.environ, {'OPENAI_MODEL_PREDICT_SEGMENTS': 'segment-model', 'LLM_TIMEOUT_PREDICT_SEGMENTS': '12'})
+    def test_env_overrides_per_node(self):
+        """Test that per-node environment variables override the node defaults."""
+        config = self.router.config_for('PREDICT_SEGMENTS')
+
+        self.assertEqual(config.model, 'segment-model')
+        self.assertEqual(config.timeout, 12.0)
+        self.assertEqual(config.temperature, 0.7)
+
+    def test_hedge_after_p95(self):
+        """Test that a hedged node sends a duplicate once the primary is slower than its p95."""
+        stats = self.router.stats_for('NODE')
+        for _ in range(20):
+            stats.latency.record(0.01)
+
+        calls = []
+
+        class FlakyModel(FakeModel):
+            def invoke(self, messages):
+                calls.append(time.monotonic())
+                # Only the first request is slow
+                self.delay = 0.5 if len(calls) == 1 else 0
+                return super().invoke(messages)
+
+        config = NodeModelConfig(model='big', fallback_model=None, hedge=True)
+        started = time.monotonic()
+        response = self.route(config, {'big': FlakyModel('big')})
+
+        self.assertEqual(response.content, 'big')
+        self.assertEqual(len(calls), 2)
+        self.assertLess(time.monotonic() - started, 0.4)
+
+    @patch.dict(os.environ, {'OPENAI_API_KEY': 'test-key'})
+    def test_request_timeout_is_capped_by_deadline(self):
+        """Test that a request inside a deadline_scope times out no later than the deadline."""
+        config = NodeModelConfig(model='gpt-test', timeout=120)
+        with patch.object(self.router, 'config_for', return_value=config):
+            unscoped = self.router.get_runnable('NODE')
+            with deadline_scope(5):
+                scoped = self.router.get_runnable('NODE')
+
+        self.assertNotIn('timeout', unscoped.model_kwargs)
+        self.assertLessEqual(scoped.model_kwargs['timeout'], 5)
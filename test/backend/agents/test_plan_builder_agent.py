@@ -0,0 +1,131 @@
+import asyncio
+import time
+from unittest import TestCase
+from unittest.mock import patch
+
+from src.backend.agents.plan_builder_agent import PlanBuilderAgent
+from src.backend.enums.next_action import NextAction
+from src.backend.models.miro_board import MiroBoard
+from src.backend.models.plan.channel import Channel
+from src.backend.models.plan.segment import Segment
+from src.backend.utils.deadline import deadline_scope, remaining_time
+
+
+class TestPlanBuilderAgent(TestCase):
+    def setUp(self):
+        self.agent = PlanBuilderAgent()
+        self.board = MiroBoard.create([])
+        self.joined = None
+        self.channels_saw = None
+        self.channel_calls = 0
+
+    def run_action(self, *next_actions: NextAction):
+        def predict_segments(state):
+            time.sleep(0.2)
+            return {'segments': [Segment(name='Students', description='Cheap')]}
+
+        def predict_channels(state):
+            self.channels_saw = state.get('segments')
+            self.channel_calls += 1
+            time.sleep(0.2)
+            return {'channels': [Channel(name='TikTok', description='Short videos')]}
+
+        def refresh_plan(state):
+            self.joined = (state.get('segments'), state.get('channels'))
+            return {}
+
+        with patch.object(self.agent.action_chooser, 'choose_next_action', return_value={'next_actions': list(next_actions)}), \
+                patch.object(self.agent.segment_predictor, 'predict_segments', side_effect=predict_segments), \
+                patch.object(self.agent.channel_predictor, 'predict_channels', side_effect=predict_channels), \
+                patch.object(self.agent.plan_refresher, 'refresh_plan', side_effect=refresh_plan):
+            started = time.monotonic()
+            state = self.agent.invoke(self.board, self.board)
+            return state, time.monotonic() - started
+
+    def test_refresh_all_chains_and_joins(self):
+        """Test that channels are predicted from the new segments and refresh_plan sees both results."""
+        self.run_action(NextAction.REFRESH_ALL)
+
+        self.assertEqual([s.name for s in self.channels_saw], ['Students'])
+        self.assertEqual([s.name for s in self.joined[0]], ['Students'])
+        self.assertEqual([c.name for c in self.joined[1]], ['TikTok'])
+
+    def test_refresh_all_predicts_channels_once(self):
+        """Test that a channels request from another chat is folded into the refresh instead of running twice."""
+        self.run_action(NextAction.PREDICT_CHANNELS, NextAction.REFRESH_ALL)
+
+        self.assertEqual(self.channel_calls, 1)
+        self.assertEqual([s.name for s in self.channels_saw], ['Students'])
+
+    def test_single_branch_does_not_refresh_plan(self):
+        """Test that predicting segments on its own ends without running the join."""
+        state, _ = self.run_action(NextAction.PREDICT_SEGMENTS)
+
+        self.assertIsNone(self.joined)
+        self.assertEqual([s.name for s in state['segments']], ['Students'])
+
+    def test_actions_from_several_chats_run_in_one_cycle(self):
+        """Test that every chosen action runs in the same cycle and the plan refresh waits for the predictions."""
+        state, elapsed = self.run_action(NextAction.PREDICT_SEGMENTS, NextAction.PREDICT_CHANNELS,
+                                         NextAction.REFRESH_PLAN)
+
+        self.assertLess(elapsed, 0.35)
+        self.assertEqual(([s.name for s in self.joined[0]], [c.name for c in self.joined[1]]),
+                         (['Students'], ['TikTok']))
+
+    def test_ainvoke_runs_async_nodes(self):
+        """Test that the async path fans out with the async node versions."""
+        async def apredict_segments(state, api):
+            await asyncio.sleep(0.2)
+            return {'segments': [Segment(name='Students', description='Cheap')]}
+
+        async def apredict_channels(state, api):
+            await asyncio.sleep(0.2)
+            return {'channels': [Channel(name='TikTok', description='Short videos')]}
+
+        async def arefresh_plan(state, api):
+            self.joined = (state.get('segments'), state.get('channels'))
+            return {}
+
+        async def achoose_next_action(state, api):
+            return {'next_actions': [NextAction.PREDICT_SEGMENTS, NextAction.PREDICT_CHANNELS,
+                                     NextAction.REFRESH_PLAN]}
+
+        with patch.object(self.agent.action_chooser, 'achoose_next_action', side_effect=achoose_next_action), \
+                patch.object(self.agent.segment_predictor, 'apredict_segments', side_effect=apredict_segments), \
+                patch.object(self.agent.channel_predictor, 'apredict_channels', side_effect=apredict_channels), \
+                patch.object(self.agent.plan_refresher, 'arefresh_plan', side_effect=arefresh_plan):
+            started = time.monotonic()
+            asyncio.run(self.agent.ainvoke(self.board, self.board))
+            elapsed = time.monotonic() - started
+
+        self.assertLess(elapsed, 0.35)
+        self.assertEqual(([s.name for s in self.joined[0]], [c.name for c in self.joined[1]]),
+                         (['Students'], ['TikTok']))
+
+    def test_deadline_reaches_node_code(self):
+        """Test that a deadline_scope around invoke is visible to the nodes, including fanned-out branches."""
+        seen = {}
+
+        def choose_next_action(state):
+            seen['choose'] = remaining_time()
+            return {'next_actions': [NextAction.PREDICT_SEGMENTS, NextAction.PREDICT_CHANNELS]}
+
+        def predict_segments(state):
+            seen['segments'] = remaining_time()
+            return {}
+
+        def predict_channels(state):
+            seen['channels'] = remaining_time()
+            return {}
+
+        with patch.object(self.agent.action_chooser, 'choose_next_action', side_effect=choose_next_action), \
+                patch.object(self.agent.segment_predictor, 'predict_segments', side_effect=predict_segments), \
+                patch.object(self.agent.channel_predictor, 'predict_channels', side_effect=predict_channels), \
+                deadline_scope(30):
+            self.agent.invoke(self.board, self.board)
+
+        self.assertEqual(set(seen), {'choose', 'segments', 'channels'})
+        for remaining in seen.values():
+            self.assertIsNotNone(remaining)
+            self.assertLessEqual(remaining, 30)
@@ -0,0 +1,104 @@
+import os
+import tempfile
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+
+from src.backend.agents.llm_cache import LlmCache
+from src.backend.agents.plan_refresher import PlanRefresher
+from src.backend.models.miro_board import MiroBoard
+from src.backend.models.plan.channel import Channel
+from src.backend.models.plan.channel_list import ChannelList
+from src.backend.models.plan.product import Product
+from src.backend.models.plan.segment import Segment
+from src.backend.models.plan.segment_list import SegmentList
+from src.backend.models.plan.suggestion import Suggestion
+from src.backend.models.plan.suggestion_list import SuggestionList
+
+SECTION_RESULTS = {
+    Product: Product(name="Widget", description="A widget", problem="None", unique_value_proposition="Cheap",
+                     goals=["Sell"]),
+    SegmentList: SegmentList(segments=[Segment(name="Makers", description="Build things")]),
+    ChannelList: ChannelList(channels=[Channel(name="Blogs", description="Write posts")]),
+    SuggestionList: SuggestionList(suggestions=[Suggestion(name="Focus", description="Pick one", priority="high")]),
+}
+
+
+def make_plan_board(channel_note: str, summary_items=()) -> MiroBoard:
+    raw_items = [{'id': 'Summary', 'type': 'frame', 'data': {'title': 'Summary'}}]
+    raw_items.extend({'id': item_id, 'type': item_type, 'parent': {'id': 'Summary'}, 'data': {'content': 'old'}}
+                     for item_id, item_type in summary_items)
+    for tag, note in (("Product", "Name: Widget"), ("Segments", "Makers"), ("Channels", channel_note)):
+        raw_items.append({'id': tag, 'type': 'frame', 'data': {'title': tag}})
+        raw_items.append({'id': f"{tag}_note", 'type': 'sticky_note', 'parent': {'id': tag},
+                          'data': {'content': f"<p>{note}</p>"}})
+
+    board = MiroBoard.create(raw_items)
+    for tag in ("Product", "Segments", "Channels", "Summary"):
+        board.get(tag).tags.add(tag)
+    return board
+
+
+class TestPlanRefresher(TestCase):
+    def setUp(self):
+        self._saved = (LlmCache._instance, LlmCache._db_path)
+        self._dir = tempfile.TemporaryDirectory()
+        LlmCache._instance = None
+        LlmCache._db_path = os.path.join(self._dir.name, "cache.db")
+        LlmCache().enabled = True
+        self.refresher = PlanRefresher()
+
+    def tearDown(self):
+        LlmCache()._get_connection().close()
+        LlmCache._instance, LlmCache._db_path = self._saved
+        self._dir.cleanup()
+
+    def generate(self, node, messages, schema, return_model):
+        return self.refresher.router.config_for(node).model, SECTION_RESULTS[schema]
+
+    def refresh(self, board: MiroBoard):
+        with patch.object(self.refresher.router, 'invoke',
+                          side_effect=self.generate) as invoke, \
+                patch.object(self.refresher, '_display_plan_in_summary_frame'):
+            plan = self.refresher.refresh_plan({'new_board': board})['plan']
+        return plan, sorted(call.kwargs['schema'].__name__ for call in invoke.call_args_list)
+
+    def test_only_stale_sections_are_regenerated(self):
+        """Test that after a channel edit only the channels and the suggestions are asked for again."""
+        plan, generated = self.refresh(make_plan_board("Blogs"))
+        self.assertEqual(generated, ['ChannelList', 'Product', 'SegmentList', 'SuggestionList'])
+        self.assertEqual(plan.product.name, "Widget")
+
+        plan, generated = self.refresh(make_plan_board("Blogs"))
+        self.assertEqual(generated, [])
+        self.assertEqual(plan.segments[0].name, "Makers")
+
+        plan, generated = self.refresh(make_plan_board("Podcasts"))
+        self.assertEqual(generated, ['ChannelList', 'SuggestionList'])
+
+        # Sections answered by the fallback model are used but not cached
+        with patch.object(self, 'generate', side_effect=lambda node, messages, schema, return_model:
+                          ('fallback-model', SECTION_RESULTS[schema])):
+            self.refresh(make_plan_board("Radio"))
+        plan, generated = self.refresh(make_plan_board("Radio"))
+        self.assertEqual(generated, ['ChannelList', 'SuggestionList'])
+        self.assertEqual(plan.product, SECTION_RESULTS[Product])
+        self.assertEqual(plan.suggestions[0].priority, "high")
+
+    def test_summary_is_updated_in_place(self):
+        """Test that the summary shape is patched once, strays are deleted and unchanged output is skipped."""
+        board = make_plan_board("Blogs", summary_items=[('shape1', 'shape'), ('note1', 'sticky_note')])
+        api = MagicMock()
+        with patch('src.backend.agents.plan_refresher.MiroApiClient', return_value=api), \
+                patch.object(self.refresher.router, 'invoke',
+                             side_effect=self.generate):
+            self.refresher.refresh_plan({'new_board': board})
+            api.update_shape_content.assert_called_once()
+            self.assertEqual(api.update_shape_content.call_args.args[0], 'shape1')
+            api.delete_item.assert_called_once_with('note1')
+
+            api.reset_mock()
+            self.refresher.refresh_plan({'new_board': make_plan_board("Blogs", summary_items=[('shape1', 'shape')])})
+
+        api.update_shape_content.assert_not_called()
+        api.create_parented_shape.assert_not_called()
+        api.delete_item.assert_not_called()
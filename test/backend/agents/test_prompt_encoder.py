@@ -0,0 +1,37 @@
+from unittest import TestCase
+
+from src.backend.agents.prompt_encoder import PromptEncoder, PromptSection
+from src.backend.utils.text_normalizer import count_tokens
+
+
+class TestPromptEncoder(TestCase):
+    def test_entries_become_compact_lines(self):
+        """Test that every entry is one markup-free line and empty sections are marked."""
+        encoded = PromptEncoder(None).encode([
+            PromptSection("product", ["Name: Widget\nPrice:  10"]),
+            PromptSection("segments", []),
+        ])
+
+        self.assertEqual(encoded, {"product": "- Name: Widget / Price:  10", "segments": "(none)"})
+
+    def test_budget_fills_sections_in_priority_order(self):
+        """Test that the most important section is kept and the overflow is dropped deterministically."""
+        sections = [
+            PromptSection("channels", ["Channel " + "c" * 40] * 3, priority=2),
+            PromptSection("product", ["Product " + "p" * 40] * 3, priority=0),
+        ]
+        budget = 3 * count_tokens("- Product " + "p" * 40) + 1
+        encoder = PromptEncoder(budget)
+
+        encoded = encoder.encode(sections)
+
+        self.assertEqual(encoded["product"].count("- Product"), 3)
+        self.assertEqual(encoded["channels"], "- (3 more omitted)")
+        self.assertEqual(encoder.encode(sections), encoded)
+
+    def test_long_entries_are_capped(self):
+        """Test that a single huge sticky cannot take the whole budget."""
+        line = PromptEncoder(None, entry_limit=20).encode_line("word " * 500)
+
+        self.assertLessEqual(count_tokens(line), 22)
+        self.assertTrue(line.endswith("…"))
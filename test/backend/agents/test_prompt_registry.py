@@ -0,0 +1,26 @@
+from unittest import TestCase
+
+from src.backend.agents.prompt_registry import PromptRegistry, PROMPTS_DIR
+
+
+class TestPromptRegistry(TestCase):
+    def test_all_prompts_are_loaded(self):
+        """Test that every prompt file is loaded once and its fields are parsed."""
+        registry = PromptRegistry()
+
+        names = {path.stem for path in PROMPTS_DIR.glob("*.txt")}
+        for name in names:
+            self.assertEqual(registry.get(name).name, name)
+        self.assertEqual(registry.get("choose_next_action_user").fields, {"board_tags", "board_state"})
+        self.assertIs(PromptRegistry(), registry)
+
+    def test_render(self):
+        """Test that rendering fills fields and reports missing ones."""
+        registry = PromptRegistry()
+
+        rendered = registry.render("segment_predictor_user", product_info="A widget")
+        self.assertIn("A widget", rendered)
+        with self.assertRaises(KeyError):
+            registry.render("segment_predictor_user")
+        with self.assertRaises(KeyError):
+            registry.get("does_not_exist")
@@ -0,0 +1,67 @@
+import os
+from unittest import TestCase
+from unittest.mock import patch
+
+from langchain_core.messages import HumanMessage
+
+from src.backend.agents.segment_predictor import SegmentPredictor
+from src.backend.models.miro_board import MiroBoard
+from src.backend.models.plan.segment import Segment
+from src.backend.models.plan.segment_list import SegmentList
+
+
+class TestSegmentPredictor(TestCase):
+    def make_board(self) -> MiroBoard:
+        board = MiroBoard.create([
+            {'id': 'product', 'type': 'frame', 'data': {'title': 'Product'}},
+            {'id': 'segments', 'type': 'frame', 'data': {'title': 'Segments'},
+             'geometry': {'width': 1000, 'height': 2000}},
+        ])
+        board.get('product').tags.add('Product')
+        board.get('segments').tags.add('Segments')
+        return board
+
+    @patch.dict(os.environ, {'SEGMENT_PREDICTOR_MODE': 'structured'})
+    def test_structured_mode_creates_stickies_in_one_pass(self):
+        """Test that structured mode makes one LLM call and places every segment in distinct slots."""
+        predictor = SegmentPredictor()
+        segments = SegmentList(segments=[Segment(name=f'Segment {i}', description='Why') for i in range(3)])
+
+        with patch.object(predictor.router, 'invoke', return_value=segments) as invoke, \
+                patch('src.backend.models.miro_board.MiroApiClient') as client:
+            predictor.predict_segments({'new_board': self.make_board()})
+
+        self.assertEqual(invoke.call_count, 1)
+        self.assertIs(invoke.call_args.kwargs['schema'], SegmentList)
+        parent_id, notes = client.return_value.create_parented_sticky_notes.call_args.args
+        self.assertEqual(parent_id, 'segments')
+        self.assertEqual([content for content, _, _ in notes],
+                         [f'<p><strong>Segment {i}</strong></p><p>Why</p>' for i in range(3)])
+        self.assertEqual(len({(x, y) for _, x, y in notes}), 3)
+
+    def test_precomputed_segments_are_used_for_the_same_product(self):
+        """Test that precomputed segments skip the LLM, and that they are dropped once the product changes."""
+        predictor = SegmentPredictor()
+        board = self.make_board()
+        segments = SegmentList(segments=[Segment(name='Makers', description='Why')])
+        with patch.object(predictor.router, 'invoke', return_value=segments):
+            predictor.precompute(board)
+
+        with patch.object(predictor.router, 'stream') as stream, \
+                patch('src.backend.models.miro_board.MiroApiClient') as client:
+            result = predictor.predict_segments({'new_board': board})
+
+        stream.assert_not_called()
+        self.assertEqual(result['segments'], segments.segments)
+        client.return_value.create_parented_sticky_notes.assert_called_once()
+
+        with patch.object(predictor.router, 'invoke', return_value=segments):
+            predictor.precompute(board)
+        self.assertIsNone(predictor._take_precomputed(HumanMessage(content='A changed product')))
+        self.assertEqual(predictor._precomputed, {})
+
+    @patch.dict(os.environ, {'SEGMENT_PREDICTOR_MODE': 'batch'})
+    def test_invalid_mode(self):
+        """Test that an unknown mode is rejected up front."""
+        with self.assertRaises(ValueError):
+            SegmentPredictor()
@@ -0,0 +1,63 @@
+import os
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+
+from src.backend.agents.speculator import Speculator
+from src.backend.models.miro_board import MiroBoard
+
+
+def make_board(product_note: str) -> MiroBoard:
+    board = MiroBoard.create([
+        {'id': 'product', 'type': 'frame', 'data': {'title': 'Product'}},
+        {'id': 'segments', 'type': 'frame', 'data': {'title': 'Segments'}},
+        {'id': 'note', 'type': 'sticky_note', 'parent': {'id': 'product'}, 'data': {'content': product_note}},
+    ])
+    board.get('product').tags.add('Product')
+    board.get('segments').tags.add('Segments')
+    return board
+
+
+class TestSpeculator(TestCase):
+    def make_speculator(self) -> Speculator:
+        predictor = MagicMock()
+        predictor.input_key.side_effect = lambda board: board.get('note').get_content()
+        predictor.precompute.return_value = ['segment']
+        with patch.dict(os.environ, {'SPECULATIVE_PRECOMPUTE': '1', 'SPECULATIVE_STABLE_SECONDS': '10'}):
+            return Speculator(predictor, MagicMock())
+
+    def test_precomputes_once_after_product_settles(self):
+        """Test that an edited product is precomputed once it has been stable, and only once."""
+        speculator = self.make_speculator()
+
+        self.assertIsNone(speculator.observe(make_board('Widget'), now=0))
+        self.assertIsNone(speculator.observe(make_board('Widget'), now=30))  # never edited
+        self.assertIsNone(speculator.observe(make_board('Gadget'), now=31))
+        self.assertIsNone(speculator.observe(make_board('Gadget'), now=35))
+
+        board = make_board('Gadget')
+        speculator.observe(board, now=41).result()
+        self.assertIsNone(speculator.observe(make_board('Gadget'), now=60))
+
+        speculator.segment_predictor.precompute.assert_called_once_with(board)
+        speculator.plan_refresher.precompute.assert_called_once_with({'new_board': board, 'segments': ['segment']})
+
+    def test_failed_precomputation_is_retried(self):
+        """Test that a product whose precomputation failed is speculated again on the next observation."""
+        speculator = self.make_speculator()
+        speculator.segment_predictor.precompute.side_effect = [TimeoutError('slow'), ['segment']]
+
+        speculator.observe(make_board('Widget'), now=0)
+        speculator.observe(make_board('Gadget'), now=1)
+        speculator.observe(make_board('Gadget'), now=20).result()
+        speculator.observe(make_board('Gadget'), now=25).result()
+
+        self.assertEqual(speculator.segment_predictor.precompute.call_count, 2)
+        speculator.plan_refresher.precompute.assert_called_once()
+
+    def test_disabled_by_default(self):
+        """Test that nothing is speculated unless SPECULATIVE_PRECOMPUTE is set."""
+        with patch.dict(os.environ, {}, clear=True):
+            speculator = Speculator(MagicMock(), MagicMock())
+
+        self.assertIsNone(speculator.observe(make_board('Gadget'), now=100))
+        speculator.segment_predictor.input_key.assert_not_called()
@@ -0,0 +1,144 @@
+import asyncio
+import threading
+import time
+from unittest import TestCase
+from unittest.mock import patch
+
+from langchain_core.messages import AIMessageChunk
+from langchain_core.tools import tool
+
+from src.backend.agents.tool_executor import ToolExecutor
+
+
+class TestToolExecutor(TestCase):
+    def setUp(self):
+        self.lock = threading.Lock()
+        self.running = 0
+        self.peak = 0
+
+        @tool
+        def slow_echo(text: str, delay: float) -> str:
+            """Echo the text after a delay."""
+            with self.lock:
+                self.running += 1
+                self.peak = max(self.peak, self.running)
+            time.sleep(delay)
+            with self.lock:
+                self.running -= 1
+            return text
+
+        @tool
+        def explode(text: str) -> str:
+            """Always fails."""
+            raise ValueError(text)
+
+        self.tools = [slow_echo, explode]
+
+    def test_results_keep_call_order(self):
+        """Test that ToolMessages follow the order of the tool calls, not the order they finish in."""
+        calls = [{'name': 'slow_echo', 'args': {'text': str(i), 'delay': 0.05 * (4 - i)}, 'id': f'call_{i}'}
+                 for i in range(5)]
+        messages = ToolExecutor('TEST', max_workers=5).run(calls, self.tools)
+
+        self.assertEqual([m.content for m in messages], ['0', '1', '2', '3', '4'])
+        self.assertEqual([m.tool_call_id for m in messages], [f'call_{i}' for i in range(5)])
+
+    def test_parallelism_is_bounded(self):
+        """Test that no more than max_workers tool calls run at once."""
+        calls = [{'name': 'slow_echo', 'args': {'text': 'x', 'delay': 0.05}, 'id': f'call_{i}'} for i in range(6)]
+        started = time.monotonic()
+        ToolExecutor('TEST', max_workers=2).run(calls, self.tools)
+
+        self.assertEqual(self.peak, 2)
+        self.assertLess(time.monotonic() - started, 0.3)
+
+    def test_errors_become_tool_messages(self):
+        """Test that failing and unknown tools are answered with error messages."""
+        calls = [{'name': 'explode', 'args': {'text': 'boom'}, 'id': 'a'},
+                 {'name': 'missing', 'args': {}, 'id': 'b'}]
+        messages = ToolExecutor('TEST').run(calls, self.tools)
+
+        self.assertEqual([m.status for m in messages], ['error', 'error'])
+        self.assertIn('boom', messages[0].content)
+
+    def test_stream_dispatches_before_response_ends(self):
+        """Test that a streamed tool call starts once its arguments are complete, before the stream ends."""
+        started = {}
+        stream_done = []
+
+        @tool
+        def record(text: str) -> str:
+            """Record when the call started."""
+            started[text] = bool(stream_done)
+            return text
+
+        def chunks():
+            for index, text in enumerate(['first', 'second']):
+                yield AIMessageChunk(content='', tool_call_chunks=[
+                    {'name': 'record', 'args': '{"text": ', 'id': f'call_{index}', 'index': index}])
+                yield AIMessageChunk(content='', tool_call_chunks=[
+                    {'name': None, 'args': f'"{text}"}}', 'id': None, 'index': index}])
+                time.sleep(0.1)
+            stream_done.append(True)
+
+        response, messages = ToolExecutor('TEST').run_stream(chunks(), [record])
+
+        self.assertEqual(started, {'first': False, 'second': False})
+        self.assertEqual([call['id'] for call in response.tool_calls], ['call_0', 'call_1'])
+        self.assertEqual([m.content for m in messages], ['first', 'second'])
+
+    def test_async_stream_runs_each_call_once_through_arun(self):
+        """Test that arun_stream hands the calls it started early to arun, which runs only the rest."""
+        calls = []
+
+        @tool
+        async def record(text: str) -> str:
+            """Record the call."""
+            calls.append(text)
+            return text
+
+        async def chunks():
+            yield AIMessageChunk(content='', tool_call_chunks=[
+                {'name': 'record', 'args': '{"text": "first"}', 'id': 'call_0', 'index': 0}])
+            yield AIMessageChunk(content='', tool_call_chunks=[
+                {'name': 'record', 'args': '{"text": ', 'id': 'call_1', 'index': 1}])
+            yield AIMessageChunk(content='', tool_call_chunks=[
+                {'name': None, 'args': '"second"', 'id': None, 'index': 1}])
+
+        executor = ToolExecutor('TEST')
+        with patch.object(executor, 'arun', wraps=executor.arun) as arun:
+            response, messages = asyncio.run(executor.arun_stream(chunks(), [record]))
+
+        self.assertEqual(list(arun.call_args.args[2]), ['call_0'])
+        self.assertEqual(calls, ['first', 'second'])
+        self.assertEqual([m.content for m in messages], ['first', 'second'])
+
+    def test_stream_ignores_late_chunks_and_answers_invalid_calls(self):
+        """Test that a trailing delta for a finished call is not run as a call, and bad arguments get an error."""
+        calls = []
+
+        @tool
+        def record(text: str) -> str:
+            """Record the call."""
+            calls.append(text)
+            return text
+
+        chunks = [
+            AIMessageChunk(content='', tool_call_chunks=[
+                {'name': 'record', 'args': '{"text": "first"}', 'id': 'call_0', 'index': 0}]),
+            AIMessageChunk(content='', tool_call_chunks=[{'name': None, 'args': '', 'id': None, 'index': 0}]),
+            AIMessageChunk(content='', tool_call_chunks=[
+                {'name': 'record', 'args': 'not json', 'id': 'call_1', 'index': 1}]),
+            AIMessageChunk(content='', tool_call_chunks=[
+                {'name': 'record', 'args': '{"text": "third"}', 'id': 'call_2', 'index': 2}]),
+        ]
+
+        executor = ToolExecutor('TEST')
+        with patch.object(executor, '_run_one', wraps=executor._run_one) as run_one:
+            response, messages = executor.run_stream(iter(chunks), [record])
+
+        self.assertEqual([call.args[0]['id'] for call in run_one.call_args_list], ['call_0', 'call_2'])
+        self.assertEqual(calls, ['first', 'third'])
+        self.assertEqual([m.tool_call_id for m in messages], ['call_0', 'call_1', 'call_2'])
+        self.assertEqual(messages[1].status, 'error')
+        self.assertEqual([call['id'] for call in response.invalid_tool_calls], ['call_1'])
@@ -229,3 +229,48 @@ class TestMiroBoard(TestCase):
         self.assertEqual(empty1, empty2)
 
 
+    def test_geometry_absolute_positions(self):
+        """Test that the columnar view resolves nested relative positions to canvas coordinates."""
+        raw_items = [
+            {
+                'id': 'frame1',
+                'type': 'frame',
+                'position': {'x': 500.0, 'y': 1000.0},
+                'geometry': {'width': 1000, 'height': 2000},
+            },
+            {
+                'id': 'frame2',
+                'type': 'frame',
+                'parent': {'id': 'frame1'},
+                'position': {'x': 300.0, 'y': 300.0},
+                'geometry': {'width': 200, 'height': 200},
+            },
+            {
+                'id': 'sticky1',
+                'type': 'sticky_note',
+                'parent': {'id': 'frame2'},
+                'position': {'x': 50.0, 'y': 60.0},
+                'geometry': {'width': 20, 'height': 20},
+            },
+            {
+                'id': 'sticky2',
+                'type': 'sticky_note',
+                'parent': {'id': 'frame2'},
+                'position': {'x': 55.0, 'y': 65.0},
+                'geometry': {'width': 20, 'height': 20},
+            }
+        ]
+        geometry = MiroBoard.create(raw_items).to_geometry()
+
+        x, y = geometry.absolute_positions()
+        rows = geometry.rows
+        self.assertEqual((x[rows['frame1']], y[rows['frame1']]), (500.0, 1000.0))
+        # frame1 top-left is (0, 0), so frame2's center is (300, 300) and its top-left (200, 200)
+        self.assertEqual((x[rows['frame2']], y[rows['frame2']]), (300.0, 300.0))
+        self.assertEqual((x[rows['sticky1']], y[rows['sticky1']]), (250.0, 260.0))
+
+        bounds = geometry.frame_bounds()
+        self.assertEqual(bounds['frame2'], (240.0, 250.0, 265.0, 275.0))
+        self.assertEqual(bounds['frame1'], (200.0, 200.0, 400.0, 400.0))
+
+        self.assertEqual(geometry.find_overlaps('frame2'), [('sticky1', 'sticky2')])
@@ -217,3 +217,28 @@ class TestMiroItem(TestCase):
         descendants = sticky2.get_descendant_ids()
         self.assertEqual(descendants, set())
 
+    def test_parsed_items_share_repeated_values(self):
+        """Test that items parsed for one board share actors, styles and link prefixes."""
+        actor = {'id': 'user1', 'type': 'user'}
+        raw_items = [
+            {
+                'id': item_id,
+                'type': 'sticky_note',
+                'style': {'fillColor': 'light_yellow'},
+                'links': {'self': f'https://api.miro.com/v2/boards/b1/sticky_notes/{item_id}'},
+                'createdBy': dict(actor),
+                'modifiedBy': dict(actor),
+            }
+            for item_id in ['sticky1', 'sticky2']
+        ]
+
+        board = MiroBoard.create(raw_items)
+        item1 = board.get('sticky1')
+        item2 = board.get('sticky2')
+
+        self.assertEqual(item1.link, 'https://api.miro.com/v2/boards/b1/sticky_notes/sticky1')
+        self.assertEqual(item2.link, 'https://api.miro.com/v2/boards/b1/sticky_notes/sticky2')
+        self.assertIs(item1._link_prefix, item2._link_prefix)
+        self.assertIs(item1.created_by, item2.modified_by)
+        self.assertIs(item1.style, item2.style)
+        self.assertEqual(item1.style['fillColor'], 'light_yellow')
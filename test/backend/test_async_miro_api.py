@@ -0,0 +1,39 @@
+import asyncio
+from unittest import TestCase
+
+import httpx
+
+from src.backend.async_miro_api import AsyncMiroApiClient
+from src.backend.miro_api import MiroApiError
+
+
+class TestAsyncMiroApiClient(TestCase):
+    def run_with(self, handler, call):
+        api = AsyncMiroApiClient()
+
+        async def run():
+            api._clients[asyncio.get_running_loop()] = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            try:
+                return await call(api)
+            finally:
+                await api.aclose()
+
+        return asyncio.run(run())
+
+    def test_load_board_follows_cursor(self):
+        """Test that every page of items ends up in the board."""
+        def handler(request):
+            if 'cursor=next' in str(request.url):
+                return httpx.Response(200, json={'data': [{'id': '2', 'type': 'text'}]})
+            return httpx.Response(200, json={'data': [{'id': '1', 'type': 'text'}], 'cursor': 'next'})
+
+        board = self.run_with(handler, lambda api: api.load_board())
+        self.assertEqual(sorted(board.items), ['1', '2'])
+
+    def test_http_errors_raise_miro_api_error(self):
+        """Test that error responses surface as MiroApiError, like the sync client."""
+        def handler(request):
+            return httpx.Response(404, text='missing')
+
+        with self.assertRaises(MiroApiError):
+            self.run_with(handler, lambda api: api.delete_item('1'))
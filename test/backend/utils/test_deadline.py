@@ -0,0 +1,87 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+
+from src.backend.utils.deadline import DeadlineExceeded, astaggered_race, current_deadline, deadline_scope, \
+    remaining_time, staggered_race
+
+
+class TestDeadline(TestCase):
+    def setUp(self):
+        self.executor = ThreadPoolExecutor(max_workers=4)
+
+    def tearDown(self):
+        self.executor.shutdown(wait=False)
+
+    def test_remaining_time_is_capped_by_deadline(self):
+        """Test that a call's own timeout is shortened by the deadline and nested scopes cannot extend it."""
+        self.assertEqual(remaining_time(30), 30)
+        with deadline_scope(5):
+            self.assertLessEqual(remaining_time(30), 5)
+            with deadline_scope(60):
+                self.assertLessEqual(remaining_time(30), 5)
+        self.assertIsNone(current_deadline())
+
+    def test_expired_deadline_raises(self):
+        """Test that calls fail fast once the deadline has passed."""
+        with deadline_scope(0.01):
+            time.sleep(0.02)
+            with self.assertRaises(DeadlineExceeded):
+                remaining_time(30)
+
+    def test_hedge_wins_over_slow_attempt(self):
+        """Test that a later, faster attempt answers before a slow first one."""
+        def slow():
+            time.sleep(0.5)
+            return 'slow'
+
+        result = staggered_race([(0, slow), (0.05, lambda: 'hedge')], self.executor)
+        self.assertEqual(result, 'hedge')
+
+    def test_failure_starts_next_attempt_immediately(self):
+        """Test that a failed attempt hands over to the next one without waiting for its delay."""
+        def fail():
+            raise ValueError('boom')
+
+        started = time.monotonic()
+        result = staggered_race([(0, fail), (5, lambda: 'next')], self.executor)
+        self.assertEqual(result, 'next')
+        self.assertLess(time.monotonic() - started, 1)
+
+    def test_race_is_bounded_by_deadline(self):
+        """Test that waiting on attempts stops at the deadline, which also reaches worker threads."""
+        seen = []
+
+        def slow():
+            seen.append(current_deadline())
+            time.sleep(0.5)
+            return 'slow'
+
+        with deadline_scope(0.05) as deadline:
+            with self.assertRaises(DeadlineExceeded):
+                staggered_race([(0, slow)], self.executor)
+        self.assertEqual(seen, [deadline])
+
+    def test_async_race_cancels_losers(self):
+        """Test that the async race returns the hedge and cancels the slow attempt."""
+        cancelled = []
+
+        async def slow():
+            try:
+                await asyncio.sleep(1)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+            return 'slow'
+
+        async def fast():
+            return 'hedge'
+
+        async def race():
+            result = await astaggered_race([(0, slow), (0.05, fast)])
+            await asyncio.sleep(0)
+            return result
+
+        self.assertEqual(asyncio.run(race()), 'hedge')
+        self.assertEqual(cancelled, [True])
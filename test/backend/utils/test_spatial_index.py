@@ -0,0 +1,105 @@
+from unittest import TestCase
+
+from src.backend.boarditems.bounds import Bounds
+from src.backend.models.miro_board import MiroBoard
+from src.backend.utils.spatial_index import SpatialIndex, SlotAllocator
+
+
+class TestSpatialIndex(TestCase):
+    def test_query_region(self):
+        """Test that a region query returns only the items overlapping the region."""
+        index = SpatialIndex(cell_size=100)
+        index.insert('a', Bounds(0, 0, 50, 50))
+        index.insert('b', Bounds(400, 400, 50, 50))
+        index.insert('c', Bounds(40, 40, 300, 300))
+
+        self.assertEqual(index.query(Bounds(10, 10, 20, 20)), {'a'})
+        self.assertEqual(index.query(Bounds(30, 30, 20, 20)), {'a', 'c'})
+        self.assertEqual(index.query(Bounds(420, 420, 10, 10)), {'b'})
+        self.assertTrue(index.is_free(Bounds(600, 600, 10, 10)))
+
+    def test_remove_and_move(self):
+        """Test that removing or re-inserting an item updates the grid cells."""
+        index = SpatialIndex(cell_size=100)
+        index.insert('a', Bounds(0, 0, 50, 50))
+        index.insert('a', Bounds(500, 500, 50, 50))
+
+        self.assertEqual(index.query(Bounds(0, 0, 60, 60)), set())
+        self.assertEqual(index.query(Bounds(500, 500, 10, 10)), {'a'})
+
+        index.remove('a')
+        self.assertEqual(len(index), 0)
+        self.assertEqual(index.query(Bounds(500, 500, 10, 10)), set())
+
+    def test_allocator_skips_occupied_slots(self):
+        """Test that slots are handed out in order, skipping occupied ones, without overlap."""
+        index = SpatialIndex()
+        index.insert('existing', Bounds(0, 0, 100, 100))
+        allocator = SlotAllocator(index, Bounds(0, 0, 300, 100), slot_width=100, slot_height=100, gap=0)
+
+        slots = allocator.take(5)
+
+        self.assertEqual([(slot.x, slot.y) for slot in slots], [(100, 0), (200, 0)])
+        self.assertIsNone(allocator.next_slot())
+
+    def test_allocator_grows_downward(self):
+        """Test that growing a full area adds free rows below it, skipping occupied slots."""
+        index = SpatialIndex()
+        index.insert('below', Bounds(0, 100, 100, 100))
+        allocator = SlotAllocator(index, Bounds(0, 0, 200, 100), slot_width=100, slot_height=100, gap=0)
+        allocator.take(2)
+
+        allocator.grow(1)
+
+        self.assertEqual([(slot.x, slot.y) for slot in allocator.take(5)], [(100, 100)])
+
+    def test_frame_sticky_positions_do_not_overlap(self):
+        """Test that stickies placed in a frame avoid the existing children and each other."""
+        raw_items = [
+            {
+                'id': 'frame1',
+                'type': 'frame',
+                'data': {'title': 'Segments'},
+                'geometry': {'width': 1000, 'height': 2000},
+            },
+            {
+                'id': 'sticky1',
+                'type': 'sticky_note',
+                'data': {'content': 'Existing'},
+                'parent': {'id': 'frame1'},
+                'position': {'x': 150.0, 'y': 565.0, 'relativeTo': 'parent_top_left'},
+                'geometry': {'width': 200, 'height': 230},
+            }
+        ]
+        board = MiroBoard.create(raw_items)
+        frame = board.get('frame1')
+
+        positions = frame.get_next_available_sticky_positions(6)
+        boxes = [Bounds.from_center(p.x, p.y, 200, 230) for p in positions]
+        boxes.append(board.get('sticky1').get_bounds())
+
+        for i, first in enumerate(boxes):
+            for second in boxes[i + 1:]:
+                self.assertFalse(first.intersects(second))
+
+    def test_full_frame_places_stickies_below_it(self):
+        """Test that a full frame still gets non-overlapping positions, in rows below its bottom edge."""
+        raw_items = [
+            {
+                'id': 'frame1',
+                'type': 'frame',
+                'data': {'title': 'Segments'},
+                'geometry': {'width': 1000, 'height': 800},
+            }
+        ]
+        frame = MiroBoard.create(raw_items).get('frame1')
+        capacity = frame.get_slot_allocator().free_count()
+
+        positions = frame.get_next_available_sticky_positions(capacity + 3)
+        boxes = [Bounds.from_center(p.x, p.y, 200, 230) for p in positions]
+
+        self.assertEqual(len(positions), capacity + 3)
+        self.assertTrue(all(p.y > 800 for p in positions[capacity:]))
+        for i, first in enumerate(boxes):
+            for second in boxes[i + 1:]:
+                self.assertFalse(first.intersects(second))
@@ -0,0 +1,116 @@
+import os
+import tempfile
+from unittest import TestCase
+
+from src.backend.utils.tag_map import TagMap
+
+
+class TestTagMap(TestCase):
+    def setUp(self):
+        # Point a fresh singleton at a throwaway database
+        self._saved = (TagMap._instances, TagMap._db_path)
+        self._dir = tempfile.TemporaryDirectory()
+        TagMap._instances = {}
+        TagMap._db_path = os.path.join(self._dir.name, "tags.db")
+        self.tag_map = TagMap('board1')
+
+    def tearDown(self):
+        for tag_map in TagMap._instances.values():
+            tag_map.close()
+        TagMap._instances, TagMap._db_path = self._saved
+        self._dir.cleanup()
+
+    def test_connection_is_reused_in_wal_mode(self):
+        """Test that the thread keeps a single WAL-mode connection across calls."""
+        conn = self.tag_map._get_connection()
+        self.tag_map.add_tag('Product', 'frame1')
+        self.tag_map.get_map()
+
+        self.assertIs(self.tag_map._get_connection(), conn)
+        self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], 'wal')
+
+    def test_bulk_add_and_remove(self):
+        """Test that bulk writes add and remove mappings for many items."""
+        self.tag_map.add_tags_to_items({'frame1': ['Product', 'Dummy'], 'frame2': ['Segments']})
+        self.assertEqual(sorted(self.tag_map.get_items_for_tag('Product')), ['frame1'])
+        self.assertEqual(self.tag_map.get_items_for_tag('Segments'), ['frame2'])
+
+        self.tag_map.remove_items(['frame1'])
+        self.assertEqual(self.tag_map.get_map(), {'Segments': ['frame2']})
+
+    def test_batch_writes_on_exit(self):
+        """Test that tags added inside a batch are written together when it exits."""
+        with self.tag_map.batch():
+            self.tag_map.add_tags_to_item('frame1', ['Product'])
+            self.tag_map.add_tag('Segments', 'frame2')
+            self.assertEqual(self.tag_map.get_map(), {})
+
+        self.assertEqual(self.tag_map.get_map(), {'Product': ['frame1'], 'Segments': ['frame2']})
+
+    def test_batch_keeps_tags_when_block_raises(self):
+        """Test that tags added before an error inside a batch are still written."""
+        with self.assertRaises(RuntimeError):
+            with self.tag_map.batch():
+                self.tag_map.add_tag('Product', 'frame1')
+                raise RuntimeError("push_to_miro failed")
+
+        self.assertEqual(self.tag_map.get_map(), {'Product': ['frame1']})
+
+    def test_cache_sees_writes_from_other_connections(self):
+        """Test that the in-memory maps pick up commits made through another connection."""
+        import sqlite3
+
+        self.tag_map.add_tag('Product', 'frame1')
+        self.assertEqual(self.tag_map.get_tags_for_item('frame1'), {'Product'})
+
+        other = sqlite3.connect(TagMap._db_path)
+        with other:
+            other.execute("INSERT INTO tag_mappings (board_id, tag, item_id) VALUES ('board1', 'Summary', 'frame1')")
+        other.close()
+
+        self.assertEqual(self.tag_map.get_tags_for_item('frame1'), {'Product', 'Summary'})
+        self.assertEqual(self.tag_map.get_item_tags_map()['frame1'], {'Product', 'Summary'})
+        self.assertEqual(self.tag_map.get_items_for_tag('Summary'), ['frame1'])
+
+    def test_boards_are_isolated(self):
+        """Test that mappings written for one board are not visible from another."""
+        self.tag_map.add_tag('Product', 'frame1')
+        other_board = TagMap('board2')
+        other_board.add_tag('Product', 'frame9')
+
+        self.assertEqual(self.tag_map.get_items_for_tag('Product'), ['frame1'])
+        self.assertEqual(other_board.get_items_for_tag('Product'), ['frame9'])
+        self.assertIs(TagMap('board2'), other_board)
+
+    def test_prune_missing_items(self):
+        """Test that only mappings older than the snapshot and missing from it are pruned."""
+        import time
+
+        self.tag_map.add_tags_to_items({'frame1': ['Product'], 'deleted': ['Summary']})
+        time.sleep(0.01)
+        snapshot_started = time.time()
+        self.tag_map.add_tag('Segments', 'created_during_snapshot')
+
+        pruned = self.tag_map.prune(['frame1'], snapshot_started)
+
+        self.assertEqual(pruned, ['deleted'])
+        self.assertEqual(self.tag_map.get_map(), {'Product': ['frame1'], 'Segments': ['created_during_snapshot']})
+
+    def test_migrates_legacy_schema(self):
+        """Test that a database without the board column is migrated and adopted by the board."""
+        import sqlite3
+
+        legacy_path = os.path.join(self._dir.name, "legacy.db")
+        conn = sqlite3.connect(legacy_path)
+        with conn:
+            conn.execute("CREATE TABLE tag_mappings (tag TEXT NOT NULL, item_id TEXT NOT NULL, PRIMARY KEY (tag, item_id))")
+            conn.execute("INSERT INTO tag_mappings VALUES ('Product', 'frame1')")
+        conn.close()
+
+        TagMap._instances = {}
+        TagMap._db_path = legacy_path
+        tag_map = TagMap('board1')
+
+        self.assertEqual(tag_map.get_map(), {'Product': ['frame1']})
+        columns = [row[1] for row in tag_map._get_connection().execute("PRAGMA table_info(tag_mappings)")]
+        self.assertIn('board_id', columns)
@@ -0,0 +1,82 @@
+from unittest import TestCase
+
+from src.backend.models.miro_board import MiroBoard
+from src.backend.utils.text_index import TextIndex
+
+
+class TestTextIndex(TestCase):
+    def test_token_and_phrase_lookup(self):
+        """Test that tokens and phrases are found regardless of markup and case."""
+        index = TextIndex()
+        index.update('a', '<p><strong>Changes</strong> made</p>')
+        index.update('b', '<p>Made changes</p>')
+
+        self.assertEqual(index.lookup('changes'), {'a', 'b'})
+        self.assertEqual(index.search_phrase('changes made'), {'a'})
+        self.assertEqual(index.search_phrase('CHANGES MADE'), {'a'})
+        self.assertEqual(index.search_phrase('made changes'), {'b'})
+        self.assertEqual(index.search_phrase('changes were made'), set())
+
+    def test_incremental_update(self):
+        """Test that updating or removing an item replaces its postings."""
+        index = TextIndex()
+        index.update('a', 'old text')
+        index.update('a', 'new text')
+
+        self.assertEqual(index.lookup('old'), set())
+        self.assertEqual(index.lookup('new'), {'a'})
+
+        index.sync({'b': 'other'})
+        self.assertEqual(index.lookup('new'), set())
+        self.assertEqual(index.lookup('other'), {'b'})
+        self.assertEqual(len(index), 1)
+
+    def test_board_text_queries(self):
+        """Test that board text queries use the index, and that the previous board keeps its own answers."""
+        raw_items = [
+            {
+                'id': 'sticky1',
+                'type': 'sticky_note',
+                'data': {'content': '<p>No changes made yet</p>'},
+            }
+        ]
+        board = MiroBoard.create(raw_items)
+        self.assertTrue(board.has_changes_made_note())
+        self.assertTrue(board.get('sticky1').contains_text('Changes Made'))
+
+        raw_items[0]['data']['content'] = '<p>Nothing here</p>'
+        new_board = MiroBoard.create(raw_items, board)
+        self.assertFalse(new_board.has_changes_made_note())
+        self.assertEqual(new_board.find_items_with_text('nothing'), [new_board.get('sticky1')])
+
+        # The previous board still searches its own snapshot
+        self.assertTrue(board.has_changes_made_note())
+        self.assertEqual(board.find_items_with_text('nothing'), [])
+        self.assertEqual(board.find_items_with_text('yet'), [board.get('sticky1')])
+
+    def test_fork_is_copy_on_write(self):
+        """Test that changes to a fork and to its source do not leak into each other."""
+        index = TextIndex()
+        index.update('a', 'shared text')
+        index.update('b', 'shared words')
+        fork = index.fork()
+
+        fork.update('a', 'fresh text')
+        fork.remove('b')
+        index.update('c', 'more shared')
+
+        self.assertEqual(index.lookup('shared'), {'a', 'b', 'c'})
+        self.assertEqual(index.lookup('fresh'), set())
+        self.assertEqual(fork.lookup('shared'), set())
+        self.assertEqual(fork.lookup('fresh'), {'a'})
+        self.assertEqual(len(index), 3)
+        self.assertEqual(len(fork), 1)
+
+    def test_detached_item_contains_text(self):
+        """Test that an item without a board still matches whole-token phrases."""
+        item = MiroBoard.create([{'id': 'sticky1', 'type': 'sticky_note',
+                                  'data': {'content': '<p>No changes made</p>'}}]).get('sticky1')
+        item.board = None
+
+        self.assertTrue(item.contains_text('Changes Made'))
+        self.assertFalse(item.contains_text('change'))
@@ -0,0 +1,37 @@
+from unittest import TestCase
+
+from src.backend.models.miro_board import MiroBoard
+from src.backend.utils.text_normalizer import strip_html, to_plain_text
+
+
+class TestTextNormalizer(TestCase):
+    def test_strip_html(self):
+        """Test that block tags become line breaks and inline tags and entities are cleaned up."""
+        content = '<p><strong>Agent: </strong></p><p>Would you like   a <em>plan</em>?</p><br/><p>Tom &amp; Jerry</p>'
+        self.assertEqual(strip_html(content), 'Agent:\nWould you like a plan?\nTom & Jerry')
+        self.assertEqual(strip_html(None), '')
+
+    def test_plain_text_is_cached_by_content(self):
+        """Test that the same content is only normalized once and carries a token count."""
+        first = to_plain_text('<p>Product Name: Widget</p>')
+        second = to_plain_text('<p>Product Name: ' + 'Widget</p>')
+
+        self.assertIs(first, second)
+        self.assertEqual(first.text, 'Product Name: Widget')
+        self.assertGreater(first.token_count, 0)
+
+    def test_llm_dumps_use_plain_text(self):
+        """Test that sticky note dumps and chat text are sent without markup."""
+        raw_items = [
+            {'id': 'frame1', 'type': 'frame', 'data': {'title': 'Product'}},
+            {
+                'id': 'sticky1',
+                'type': 'sticky_note',
+                'data': {'content': '<p><strong>Product Name:</strong> Widget</p>'},
+                'parent': {'id': 'frame1'},
+            },
+        ]
+        board = MiroBoard.create(raw_items)
+
+        self.assertEqual(board.get('frame1').dump_sticky_notes(), '{"sticky1": "Product Name: Widget"}')
+        self.assertEqual(board.get('sticky1').get_token_count(), to_plain_text('Product Name: Widget').token_count)